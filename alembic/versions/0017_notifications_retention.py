@@ -0,0 +1,45 @@
+"""Composite (user_id, created_at DESC) index on notifications and archive table.
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_id_created_at "
+        "ON notifications (user_id, created_at DESC)"
+    )
+    # The composite index's leading column covers every lookup the old one served
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_id")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS notifications_archive (
+            id                UUID PRIMARY KEY,
+            user_id           UUID NOT NULL,
+            notification_type notificationtype NOT NULL,
+            title             VARCHAR(150) NOT NULL,
+            body              VARCHAR(500) NOT NULL,
+            is_read           BOOLEAN NOT NULL DEFAULT FALSE,
+            data              JSON,
+            created_at        TIMESTAMPTZ NOT NULL,
+            archived_at       TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_notifications_archive_user_id ON notifications_archive (user_id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_archive_archived_at ON notifications_archive (archived_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS notifications_archive")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_notifications_user_id ON notifications (user_id)")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_id_created_at")
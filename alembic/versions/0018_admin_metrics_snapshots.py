@@ -0,0 +1,27 @@
+"""Add admin_metrics_snapshots table.
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0018"
+down_revision = "0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS admin_metrics_snapshots (
+            period      VARCHAR(16) PRIMARY KEY,
+            payload     JSON NOT NULL,
+            computed_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS admin_metrics_snapshots")
@@ -0,0 +1,54 @@
+"""Add daily_booking_stats / daily_revenue_stats rollups and backfill them.
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0019"
+down_revision = "0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS daily_booking_stats (
+            day           DATE PRIMARY KEY,
+            booking_count INTEGER NOT NULL DEFAULT 0,
+            updated_at    TIMESTAMPTZ NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS daily_revenue_stats (
+            day           DATE PRIMARY KEY,
+            payment_count INTEGER NOT NULL DEFAULT 0,
+            revenue       NUMERIC(12, 2) NOT NULL DEFAULT 0,
+            platform_fees NUMERIC(12, 2) NOT NULL DEFAULT 0,
+            updated_at    TIMESTAMPTZ NOT NULL
+        )
+    """)
+    # One-off backfill of history; beat keeps today and yesterday current afterwards
+    op.execute("""
+        INSERT INTO daily_booking_stats (day, booking_count, updated_at)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, COUNT(*), now()
+        FROM bookings
+        GROUP BY 1
+        ON CONFLICT (day) DO NOTHING
+    """)
+    op.execute("""
+        INSERT INTO daily_revenue_stats (day, payment_count, revenue, platform_fees, updated_at)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, COUNT(*), COALESCE(SUM(amount), 0),
+               COALESCE(SUM(platform_fee), 0), now()
+        FROM payments
+        WHERE status = 'SUCCEEDED'
+        GROUP BY 1
+        ON CONFLICT (day) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS daily_revenue_stats")
+    op.execute("DROP TABLE IF EXISTS daily_booking_stats")
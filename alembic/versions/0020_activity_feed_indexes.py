@@ -0,0 +1,25 @@
+"""Index created_at on users, bookings and payments for the admin activity feed.
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0020"
+down_revision = "0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_created_at ON users (created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_bookings_created_at ON bookings (created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_payments_created_at ON payments (created_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_payments_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_bookings_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_users_created_at")
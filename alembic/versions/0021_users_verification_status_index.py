@@ -0,0 +1,24 @@
+"""Index users.identity_verification_status for the admin pending-verification count.
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0021"
+down_revision = "0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_identity_verification_status "
+        "ON users (identity_verification_status)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_identity_verification_status")
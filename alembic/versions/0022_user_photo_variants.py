@@ -0,0 +1,23 @@
+"""Add resized photo variant URLs to users.
+
+Revision ID: 0022
+Revises: 0021
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0022"
+down_revision = "0021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_photo_variants JSON")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS vehicle_photo_variants JSON")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS vehicle_photo_variants")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS profile_photo_variants")
@@ -0,0 +1,35 @@
+"""Add stored_objects table for content-hash upload deduplication.
+
+Revision ID: 0023
+Revises: 0022
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0023"
+down_revision = "0022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS stored_objects (
+            id                 UUID PRIMARY KEY,
+            owner_id           UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            folder             VARCHAR(50) NOT NULL,
+            sha256             VARCHAR(64) NOT NULL,
+            url                VARCHAR(500) NOT NULL,
+            content_type       VARCHAR(100) NOT NULL,
+            size_bytes         INTEGER NOT NULL,
+            ocr_licence_number TEXT,
+            ocr_checked_at     TIMESTAMPTZ,
+            created_at         TIMESTAMPTZ NOT NULL,
+            CONSTRAINT uq_stored_objects_owner_folder_sha256 UNIQUE (owner_id, folder, sha256)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS stored_objects")
@@ -0,0 +1,30 @@
+"""Add background licence OCR status to users.
+
+Revision ID: 0024
+Revises: 0023
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0024"
+down_revision = "0023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            CREATE TYPE licenceocrstatus AS ENUM ('PENDING', 'MATCHED', 'MISMATCHED', 'UNREADABLE');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$;
+    """)
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS licence_ocr_status licenceocrstatus")
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS licence_ocr_checked_at TIMESTAMPTZ")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS licence_ocr_checked_at")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS licence_ocr_status")
+    op.execute("DROP TYPE IF EXISTS licenceocrstatus")
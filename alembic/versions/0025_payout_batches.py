@@ -0,0 +1,47 @@
+"""Add payout_batches and link payments to the batch that paid them out.
+
+Revision ID: 0025
+Revises: 0024
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0025"
+down_revision = "0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            CREATE TYPE payoutbatchstatus AS ENUM ('PENDING', 'PAID', 'FAILED');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$;
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS payout_batches (
+            id                 UUID PRIMARY KEY,
+            driver_id          UUID NOT NULL REFERENCES users(id),
+            transfer_group     VARCHAR(100) NOT NULL UNIQUE,
+            status             payoutbatchstatus NOT NULL DEFAULT 'PENDING',
+            amount             NUMERIC(10, 2) NOT NULL DEFAULT 0,
+            payment_count      INTEGER NOT NULL DEFAULT 0,
+            stripe_transfer_id VARCHAR(255),
+            error              VARCHAR(500),
+            created_at         TIMESTAMPTZ NOT NULL,
+            completed_at       TIMESTAMPTZ
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_payout_batches_driver_id ON payout_batches (driver_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_payout_batches_created_at ON payout_batches (created_at)")
+    op.execute("ALTER TABLE payments ADD COLUMN IF NOT EXISTS payout_batch_id UUID REFERENCES payout_batches(id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_payments_payout_batch_id ON payments (payout_batch_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_payments_payout_batch_id")
+    op.execute("ALTER TABLE payments DROP COLUMN IF EXISTS payout_batch_id")
+    op.execute("DROP TABLE IF EXISTS payout_batches")
+    op.execute("DROP TYPE IF EXISTS payoutbatchstatus")
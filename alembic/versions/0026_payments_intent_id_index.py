@@ -0,0 +1,23 @@
+"""Index payments by Stripe PaymentIntent id for the reconciliation job.
+
+Revision ID: 0026
+Revises: 0025
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0026"
+down_revision = "0025"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_payments_stripe_payment_intent_id ON payments (stripe_payment_intent_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_payments_stripe_payment_intent_id")
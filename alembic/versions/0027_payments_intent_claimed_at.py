@@ -0,0 +1,28 @@
+"""Track in-flight PaymentIntent recovery claims on payments.
+
+Revision ID: 0027
+Revises: 0026
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0027"
+down_revision = "0026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE payments ADD COLUMN IF NOT EXISTS intent_claimed_at TIMESTAMPTZ")
+    # Partial index: the recovery sweep only ever looks at payments without an intent
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_payments_pending_intent
+        ON payments (created_at)
+        WHERE stripe_payment_intent_id IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_payments_pending_intent")
+    op.execute("ALTER TABLE payments DROP COLUMN IF EXISTS intent_claimed_at")
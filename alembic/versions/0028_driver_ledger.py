@@ -0,0 +1,98 @@
+"""Add the append-only driver earnings ledger and per-driver balances.
+
+Revision ID: 0028
+Revises: 0027
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0028"
+down_revision = "0027"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$ BEGIN
+            CREATE TYPE ledgerentrytype AS ENUM ('EARNING', 'REFUND', 'TRANSFER');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$;
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS driver_ledger (
+            id              UUID PRIMARY KEY,
+            driver_id       UUID NOT NULL REFERENCES users(id),
+            entry_type      ledgerentrytype NOT NULL,
+            amount          NUMERIC(10, 2) NOT NULL,
+            balance         NUMERIC(12, 2) NOT NULL,
+            payment_id      UUID REFERENCES payments(id),
+            payout_batch_id UUID REFERENCES payout_batches(id),
+            created_at      TIMESTAMPTZ NOT NULL,
+            CONSTRAINT uq_driver_ledger_payment UNIQUE (entry_type, payment_id),
+            CONSTRAINT uq_driver_ledger_payout_batch UNIQUE (entry_type, payout_batch_id)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_driver_ledger_driver_created ON driver_ledger (driver_id, created_at)")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS driver_balances (
+            driver_id         UUID PRIMARY KEY REFERENCES users(id),
+            balance           NUMERIC(12, 2) NOT NULL DEFAULT 0,
+            total_earned      NUMERIC(12, 2) NOT NULL DEFAULT 0,
+            total_refunded    NUMERIC(12, 2) NOT NULL DEFAULT 0,
+            total_transferred NUMERIC(12, 2) NOT NULL DEFAULT 0,
+            updated_at        TIMESTAMPTZ NOT NULL
+        )
+    """)
+
+    # Backfill from existing payments and payout batches. Transfers made before
+    # payout batching are recorded per payment (stripe_transfer_id, no batch).
+    op.execute("""
+        WITH driver_payments AS (
+            SELECT t.driver_id, p.*
+            FROM payments p
+            JOIN bookings b ON b.id = p.booking_id
+            JOIN trips t ON t.id = b.trip_id
+        ),
+        history AS (
+            SELECT driver_id, 'EARNING' AS entry_type, payout_amount AS amount,
+                   id AS payment_id, NULL::uuid AS payout_batch_id, created_at
+            FROM driver_payments WHERE status IN ('SUCCEEDED', 'REFUNDED')
+            UNION ALL
+            SELECT driver_id, 'REFUND', -payout_amount, id, NULL, updated_at
+            FROM driver_payments WHERE status = 'REFUNDED'
+            UNION ALL
+            SELECT driver_id, 'TRANSFER', -payout_amount, id, NULL, updated_at
+            FROM driver_payments WHERE stripe_transfer_id IS NOT NULL AND payout_batch_id IS NULL
+            UNION ALL
+            SELECT driver_id, 'TRANSFER', -amount, NULL, id, completed_at
+            FROM payout_batches WHERE status = 'PAID'
+        )
+        INSERT INTO driver_ledger (id, driver_id, entry_type, amount, balance, payment_id, payout_batch_id, created_at)
+        SELECT gen_random_uuid(), driver_id, entry_type::ledgerentrytype, amount,
+               SUM(amount) OVER (
+                   PARTITION BY driver_id ORDER BY created_at, entry_type ROWS UNBOUNDED PRECEDING
+               ),
+               payment_id, payout_batch_id, created_at
+        FROM history
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("""
+        INSERT INTO driver_balances (driver_id, balance, total_earned, total_refunded, total_transferred, updated_at)
+        SELECT driver_id,
+               SUM(amount),
+               COALESCE(SUM(amount) FILTER (WHERE entry_type = 'EARNING'), 0),
+               COALESCE(-SUM(amount) FILTER (WHERE entry_type = 'REFUND'), 0),
+               COALESCE(-SUM(amount) FILTER (WHERE entry_type = 'TRANSFER'), 0),
+               now()
+        FROM driver_ledger
+        GROUP BY driver_id
+        ON CONFLICT (driver_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS driver_balances")
+    op.execute("DROP TABLE IF EXISTS driver_ledger")
+    op.execute("DROP TYPE IF EXISTS ledgerentrytype")
@@ -0,0 +1,32 @@
+"""Denormalize the payer onto payments and index it for keyset-paginated history.
+
+Revision ID: 0029
+Revises: 0028
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0029"
+down_revision = "0028"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE payments ADD COLUMN IF NOT EXISTS payer_id UUID REFERENCES users(id)")
+    op.execute("""
+        UPDATE payments p
+        SET payer_id = b.passenger_id
+        FROM bookings b
+        WHERE b.id = p.booking_id AND p.payer_id IS NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_payments_payer_created
+        ON payments (payer_id, created_at DESC, id DESC) INCLUDE (status)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_payments_payer_created")
+    op.execute("ALTER TABLE payments DROP COLUMN IF EXISTS payer_id")
@@ -0,0 +1,27 @@
+"""Partial index for the admin feed's pending-verification branch.
+
+Revision ID: 0030
+Revises: 0029
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0030"
+down_revision = "0029"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches the activity feed's verification_pending branch exactly, so its
+    # (updated_at, id) DESC keyset scan reads only submitted, pending users
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_users_pending_verification_updated
+        ON users (updated_at DESC, id DESC)
+        WHERE identity_verification_status = 'PENDING' AND updated_at <> created_at
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_pending_verification_updated")
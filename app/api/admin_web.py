@@ -5,6 +5,7 @@ import hashlib
 import secrets
 import time
 from pathlib import Path
+from urllib.parse import urlencode
 from uuid import UUID
 
 from fastapi import APIRouter, Cookie, Depends, Form, Request
@@ -12,6 +13,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from app.core.config import get_settings
+from app.core.constants import IdentityVerificationStatus, UserRole
 from app.core.database import SessionLocal
 from app.repositories.booking_repo import BookingRepository
 from app.repositories.payment_repo import PaymentRepository
@@ -21,6 +23,7 @@ from app.services.admin_service import AdminService
 from app.services.email_service import EmailService
 from app.services.storage_service import StorageService
 from app.services.user_service import UserService
+from app.utils.pagination import decode_cursor, next_cursor
 
 router = APIRouter()
 _templates = Jinja2Templates(directory=str(Path(__file__).resolve().parents[1] / "templates"))
@@ -30,6 +33,7 @@ _admin_service = AdminService(UserRepository(), TripRepository(), BookingReposit
 _storage = StorageService()
 
 _SESSION_TTL = 8 * 60 * 60  # 8 hours
+_USERS_PAGE_SIZE = 50
 
 
 # ── session helpers ────────────────────────────────────────────────────────────
@@ -66,8 +70,7 @@ def _require_session(admin_session: str | None = Cookie(default=None)):
 
 def _base_ctx(db, active: str) -> dict:
     """Shared context injected into every template (pending count for nav badge)."""
-    pending = _user_repo.list_pending_verifications(db)
-    return {"active": active, "pending_count": len(pending)}
+    return {"active": active, "pending_count": _user_repo.count_pending_verifications(db)}
 
 
 # ── login / logout ─────────────────────────────────────────────────────────────
@@ -113,7 +116,7 @@ def overview(request: Request, session=Depends(_require_session)):
     try:
         admin = _user_repo.get_by_email(db, get_settings().admin_email)
         metrics = _admin_service.get_metrics(db, admin) if admin else {}
-        recent_users = list(reversed(_user_repo.list_users(db, limit=10, offset=0)))
+        recent_users = _user_repo.list_users(db, limit=10, offset=0)
         ctx = _base_ctx(db, "overview")
     finally:
         db.close()
@@ -126,18 +129,48 @@ def overview(request: Request, session=Depends(_require_session)):
 # ── users list ─────────────────────────────────────────────────────────────────
 
 @router.get("/users", response_class=HTMLResponse)
-def users_list(request: Request, session=Depends(_require_session)):
+def users_list(
+    request: Request,
+    q: str | None = None,
+    role: str | None = None,
+    status: str | None = None,
+    sort: str = "newest",
+    cursor: str | None = None,
+    session=Depends(_require_session),
+):
     if not session:
         return RedirectResponse("/admin/login", status_code=303)
+    q = (q or "").strip() or None
+    role = role if role in UserRole.__members__ else None
+    status = status if status in IdentityVerificationStatus.__members__ else None
+    sort = sort if sort in ("newest", "oldest") else "newest"
+    try:
+        position = decode_cursor(cursor)
+    except ValueError:
+        position = None
     db = SessionLocal()
     try:
-        all_users = _user_repo.list_users(db, limit=500, offset=0)
+        users = _user_repo.list_users(
+            db, limit=_USERS_PAGE_SIZE, search=q, role=role,
+            verification_status=status, sort=sort, cursor=position,
+        )
+        total = _user_repo.count_matching(db, search=q, role=role, verification_status=status)
         ctx = _base_ctx(db, "users")
     finally:
         db.close()
+
+    filters = {k: v for k, v in {"q": q, "role": role, "status": status, "sort": sort}.items() if v}
+    following = next_cursor(users, _USERS_PAGE_SIZE)
     return _templates.TemplateResponse(
         request=request, name="admin/users.html",
-        context={**ctx, "users": all_users, "total": len(all_users)},
+        context={
+            **ctx,
+            "users": users,
+            "total": total,
+            "filters": filters,
+            "first_url": f"/admin/users?{urlencode(filters)}" if position else None,
+            "next_url": f"/admin/users?{urlencode({**filters, 'cursor': following})}" if following else None,
+        },
     )
 
 
@@ -158,14 +191,12 @@ def verification_queue(
     finally:
         db.close()
 
-    def _sign(url):
-        if not url:
-            return None
-        try:
-            return _storage.signed_url(url, expiry_minutes=15)
-        except Exception:
-            return url
-
+    signed = _storage.signed_urls(
+        (url for u in pending for url in (
+            u.driver_license_url, u.driver_license_back_url, u.selfie_url, u.id_document_url,
+        )),
+        expiry_minutes=15,
+    )
     signed_users = [
         {
             "id": u.id,
@@ -173,10 +204,11 @@ def verification_queue(
             "last_name": u.last_name,
             "email": u.email,
             "driver_license_number": u.driver_license_number,
-            "licence_front_url": _sign(u.driver_license_url),
-            "licence_back_url": _sign(u.driver_license_back_url),
-            "selfie_url": _sign(u.selfie_url),
-            "id_document_url": _sign(u.id_document_url),
+            "licence_ocr_status": u.licence_ocr_status.value if u.licence_ocr_status else None,
+            "licence_front_url": signed.get(u.driver_license_url),
+            "licence_back_url": signed.get(u.driver_license_back_url),
+            "selfie_url": signed.get(u.selfie_url),
+            "id_document_url": signed.get(u.id_document_url),
         }
         for u in pending
     ]
@@ -1,9 +1,11 @@
 """Admin routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import redis
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.core.constants import LicenceOcrStatus
 from app.core.dependencies import get_current_user, get_db
 from app.repositories.booking_repo import BookingRepository
 from app.repositories.device_repo import DeviceRepository
@@ -18,10 +20,11 @@ from app.schemas.payment import PaymentResponse
 from app.schemas.trip import TripResponse
 from app.schemas.user import UserPrivateResponse
 from app.services.booking_service import BookingService
+from app.services import stripe_client
 from app.services.admin_service import AdminService
 from app.services.email_service import EmailService
 from app.services.notification_service import NotificationService
-from app.services.payment_service import PaymentService
+from app.services.payment_service import PaymentService, payment_circuit_breaker
 from app.services.trip_service import TripService
 from app.services.user_service import UserService
 
@@ -75,10 +78,13 @@ def list_pending_verifications(
     current_user=Depends(get_current_user),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    licence_ocr_status: LicenceOcrStatus | None = Query(default=None, description="Filter by licence OCR result"),
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    users = user_repo.list_pending_verifications(db, limit=limit, offset=offset)
+    users = user_repo.list_pending_verifications(
+        db, limit=limit, offset=offset, licence_ocr_status=licence_ocr_status,
+    )
     return DataResponse(data=users)
 
 
@@ -96,83 +102,67 @@ def get_metrics(
 
 @router.get("/metrics/bookings-timeseries")
 def bookings_timeseries(
-    days: int = Query(default=7, ge=1, le=90),
+    days: int = Query(default=7, ge=1, le=3650),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    data = booking_repo.bookings_timeseries(db, days=days)
+    data = admin_service.bookings_timeseries(db, days=days)
     return DataResponse(data=data)
 
 
 @router.get("/metrics/revenue-timeseries")
 def revenue_timeseries(
-    days: int = Query(default=7, ge=1, le=90),
+    days: int = Query(default=7, ge=1, le=3650),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    data = payment_repo.revenue_timeseries(db, days=days)
+    data = admin_service.revenue_timeseries(db, days=days)
     return DataResponse(data=data)
 
 
+@router.get("/metrics/stripe-breaker")
+def stripe_breaker_metrics(current_user=Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    try:
+        snapshot = payment_circuit_breaker.snapshot()
+    except redis.RedisError as exc:
+        raise HTTPException(status_code=503, detail="Circuit breaker state unavailable") from exc
+    return DataResponse(data=snapshot)
+
+
+@router.get("/metrics/stripe-latency")
+def stripe_latency_metrics(current_user=Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    try:
+        histograms = stripe_client.latency_histograms()
+    except redis.RedisError as exc:
+        raise HTTPException(status_code=503, detail="Stripe latency metrics unavailable") from exc
+    return DataResponse(data=histograms)
+
+
 @router.get("/activity")
 def activity_feed(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    from app.models.user import User
-    from app.models.booking import Booking
-    from app.models.payment import Payment
-    from app.core.constants import BookingStatus, PaymentStatus, IdentityVerificationStatus
-    from sqlalchemy import select
-    from app.utils.datetime import now_utc
-
-    events = []
-
-    users = db.execute(select(User).order_by(User.created_at.desc()).limit(limit)).scalars().all()
-    for u in users:
-        events.append({
-            "type": "signup",
-            "message": f"{u.first_name or ''} {u.last_name or ''}".strip() or u.email,
-            "detail": f"New user registered ({u.email})",
-            "timestamp": u.created_at.isoformat(),
-        })
-        if u.identity_verification_status == IdentityVerificationStatus.PENDING and u.updated_at != u.created_at:
-            events.append({
-                "type": "verification_pending",
-                "message": f"{u.first_name or ''} {u.last_name or ''}".strip() or u.email,
-                "detail": "Submitted identity for verification",
-                "timestamp": u.updated_at.isoformat(),
-            })
-
-    bookings = db.execute(select(Booking).order_by(Booking.created_at.desc()).limit(limit)).scalars().all()
-    for b in bookings:
-        events.append({
-            "type": "booking",
-            "message": f"Booking {str(b.id)[:8]}",
-            "detail": f"Booking {b.status.lower()} — £{float(b.total_amount):.2f}",
-            "timestamp": b.created_at.isoformat(),
-        })
-
-    payments = db.execute(
-        select(Payment).where(Payment.status == PaymentStatus.SUCCEEDED).order_by(Payment.created_at.desc()).limit(limit)
-    ).scalars().all()
-    for p in payments:
-        events.append({
-            "type": "payment",
-            "message": f"Payment £{float(p.amount):.2f}",
-            "detail": f"Payment succeeded for booking {str(p.booking_id)[:8]}",
-            "timestamp": p.created_at.isoformat(),
-        })
-
-    events.sort(key=lambda e: e["timestamp"], reverse=True)
-    return DataResponse(data=events[:limit])
+    try:
+        events, following = admin_service.activity_feed(db, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if following:
+        response.headers["X-Next-Cursor"] = following
+    return DataResponse(data=events)
 
 
 @router.get("/payments", response_model=DataResponse[list[PaymentResponse]])
@@ -1,6 +1,6 @@
 """Booking routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -17,10 +17,12 @@ from app.schemas.base import DataResponse
 from app.schemas.booking import BookingCreate, BookingResponse, BookingStatusUpdate
 from app.services.booking_service import BookingService
 from app.services.email_service import EmailService
+from app.services.idempotency_service import IdempotentRequest
 from app.services.notification_service import NotificationService
 from app.services.payment_service import PaymentService
 
 router = APIRouter()
+create_rate_limit = rate_limit("bookings_create", limit=10, window_seconds=60)
 review_repo = ReviewRepository()
 payment_service = PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
 notification_service = NotificationService(DeviceRepository(), NotificationRepository(), UserRepository())
@@ -36,18 +38,38 @@ booking_service = BookingService(
 
 @router.post("", response_model=DataResponse[BookingResponse], status_code=201)
 def create_booking(
+    request: Request,
     payload: BookingCreate,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
-    _=Depends(rate_limit("bookings_create", limit=10, window_seconds=60)),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
 ):
+    try:
+        guard = IdempotentRequest("bookings_create", current_user.id, idempotency_key, payload.model_dump())
+        replay = guard.replay()
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if replay is not None:
+        return replay
+    try:
+        # Limited after the replay check so retries of a completed request are never throttled.
+        create_rate_limit(request)
+    except HTTPException:
+        guard.release()
+        raise
     try:
         booking = booking_service.create_booking(db, current_user, UUID(payload.trip_id), payload.seats)
         db.commit()
-        return DataResponse(data=booking)
+        response = DataResponse(data=BookingResponse.model_validate(booking))
+        guard.store(201, response.model_dump(mode="json"))
+        return response
     except ValueError as exc:
         db.rollback()
+        guard.release()
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception:
+        guard.release()
+        raise
 
 
 def _attach_has_reviewed(db: Session, bookings: list, reviewer_id) -> list[BookingResponse]:
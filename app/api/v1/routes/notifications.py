@@ -2,7 +2,7 @@
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 logger = logging.getLogger(__name__)
 from sqlalchemy.orm import Session
@@ -18,6 +18,7 @@ from app.schemas.device import DeviceRegistrationRequest, DeviceResponse
 from app.schemas.base import DataResponse
 from app.schemas.notification import NotificationResponse, SendNotificationRequest
 from app.services.notification_service import NotificationService
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
 notification_service = NotificationService(DeviceRepository(), NotificationRepository(), UserRepository())
@@ -54,12 +55,24 @@ def register_device(
 
 @router.get("", response_model=DataResponse[list[NotificationResponse]])
 def list_notifications(
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
 ):
-    return DataResponse(data=notification_service.list_notifications(db, current_user, limit=limit, offset=offset))
+    """Newest first. Follow the X-Next-Cursor response header for the next page."""
+    try:
+        notifications = notification_service.list_notifications(
+            db, current_user, limit=limit, offset=offset, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    following = next_cursor(notifications, limit)
+    if following:
+        response.headers["X-Next-Cursor"] = following
+    return DataResponse(data=notifications)
 
 
 @router.post("/send", response_model=DataResponse[dict])
@@ -2,7 +2,7 @@
 
 import logging
 
-from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, UploadFile
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, Response, UploadFile
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -21,32 +21,55 @@ from app.schemas.payment import (
     ConnectOnboardRequest,
     ConnectOnboardResponse,
     ConnectStatusResponse,
+    DriverEarningsResponse,
+    LedgerEntryResponse,
     PaymentIntentCreate,
     PaymentResponse,
     PayoutRequestResponse,
 )
+from app.services.idempotency_service import IdempotentRequest
 from app.services.payment_service import PaymentService
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
+intent_rate_limit = rate_limit("payments_intent", limit=5, window_seconds=60)
 payment_service = PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
 
 
 @router.post("/intent", response_model=DataResponse[PaymentResponse])
 def create_payment_intent(
+    request: Request,
     payload: PaymentIntentCreate,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
-    _=Depends(rate_limit("payments_intent", limit=5, window_seconds=60)),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
 ):
+    try:
+        guard = IdempotentRequest("payments_intent", current_user.id, idempotency_key, payload.model_dump())
+        replay = guard.replay()
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if replay is not None:
+        return replay
+    try:
+        # Limited after the replay check so retries of a completed request are never throttled.
+        intent_rate_limit(request)
+    except HTTPException:
+        guard.release()
+        raise
     try:
         payment = payment_service.create_payment_intent(db, UUID(payload.booking_id), current_user.id)
         db.commit()
-        return DataResponse(data=PaymentResponse.model_validate(payment))
+        response = DataResponse(data=PaymentResponse.model_validate(payment))
+        guard.store(200, response.model_dump(mode="json"))
+        return response
     except ValueError as exc:
         db.rollback()
+        guard.release()
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         db.rollback()
+        guard.release()
         logger.exception("Unexpected error in create_payment_intent")
         raise HTTPException(status_code=500, detail="Payment processing error") from exc
 
@@ -67,15 +90,23 @@ async def stripe_webhook(
 
 @router.get("/history", response_model=DataResponse[list[PaymentResponse]])
 def list_payment_history(
+    response: Response,
     period: str = Query(pattern="^(7d|30d|6m|1y)$"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
     _=Depends(rate_limit("payments_history", limit=20, window_seconds=60)),
 ):
+    """Succeeded payments in the period, newest first. Follow the X-Next-Cursor response header for more."""
     try:
-        return DataResponse(data=payment_service.list_payment_history(db, current_user.id, period))
+        payments = payment_service.list_payment_history(db, current_user.id, period, limit=limit, cursor=cursor)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    following = next_cursor(payments, limit)
+    if following:
+        response.headers["X-Next-Cursor"] = following
+    return DataResponse(data=payments)
 
 
 @router.post("/connect/onboard", response_model=DataResponse[ConnectOnboardResponse])
@@ -160,14 +191,51 @@ def attach_address_document(
 
 @router.get("/connect/payout-history", response_model=DataResponse[list[PaymentResponse]])
 def driver_payout_history(
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
 ):
-    """Driver's full transaction history — all earnings from their trips."""
-    payments = payment_service.payment_repo.list_payouts_by_driver(db, current_user.id)
+    """Driver's transaction history — earnings from their trips, newest first. Follow X-Next-Cursor for more."""
+    try:
+        payments = payment_service.list_driver_payouts(db, current_user.id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    following = next_cursor(payments, limit)
+    if following:
+        response.headers["X-Next-Cursor"] = following
     return DataResponse(data=payments)
 
 
+@router.get("/connect/earnings", response_model=DataResponse[DriverEarningsResponse])
+def driver_earnings(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Driver's earned, refunded and transferred totals and the balance still owed to them."""
+    return DataResponse(data=payment_service.get_driver_earnings(db, current_user.id))
+
+
+@router.get("/connect/ledger", response_model=DataResponse[list[LedgerEntryResponse]])
+def driver_ledger(
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
+):
+    """Driver's earnings ledger with the running balance after each entry, newest first."""
+    try:
+        entries = payment_service.list_driver_ledger(db, current_user.id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    following = next_cursor(entries, limit)
+    if following:
+        response.headers["X-Next-Cursor"] = following
+    return DataResponse(data=entries)
+
+
 @router.post("/connect/request-payout", response_model=DataResponse[PayoutRequestResponse])
 def request_payout(
     db: Session = Depends(get_db),
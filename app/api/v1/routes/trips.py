@@ -7,14 +7,19 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.core.dependencies import get_current_user, get_db
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
 from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
 from app.repositories.vehicle_repo import VehicleRepository
 from app.schemas.base import DataResponse
 from app.schemas.trip import TripCreate, TripResponse, TripUpdate
+from app.services.payment_service import PaymentService
 from app.services.trip_service import TripService
 
 router = APIRouter()
-trip_service = TripService(TripRepository())
+payment_service = PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+trip_service = TripService(TripRepository(), BookingRepository(), UserRepository(), payment_service)
 vehicle_repo = VehicleRepository()
 
 
@@ -25,12 +25,10 @@ from app.schemas.user import (
 )
 from app.services.email_service import EmailService
 from app.services.user_service import UserService
-from app.services.vision_service import VisionService
 
 router = APIRouter()
 user_service = UserService(UserRepository(), BookingRepository())
 email_service = EmailService()
-vision_service = VisionService()
 
 
 class _EmailChangeRequest(BaseModel):
@@ -84,14 +82,13 @@ def complete_onboarding(
 
 
 @router.post("/me/avatar", response_model=DataResponse[UserPrivateResponse])
-async def upload_avatar(
+def upload_avatar(
     avatar: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        content = await avatar.read()
-        user = user_service.update_avatar(db, current_user, content, avatar.content_type)
+        user = user_service.update_avatar(db, current_user, avatar.file, avatar.content_type)
         db.commit()
         return DataResponse(data=user)
     except ValueError as exc:
@@ -100,14 +97,13 @@ async def upload_avatar(
 
 
 @router.post("/me/vehicle/photo", response_model=DataResponse[UserPrivateResponse])
-async def upload_vehicle_photo(
+def upload_vehicle_photo(
     photo: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        content = await photo.read()
-        user = user_service.update_vehicle_photo(db, current_user, content, photo.content_type)
+        user = user_service.update_vehicle_photo(db, current_user, photo.file, photo.content_type)
         db.commit()
         return DataResponse(data=user)
     except ValueError as exc:
@@ -222,7 +218,7 @@ def get_public_profile(user_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/me/verification/driver-licence", response_model=DataResponse[UserPrivateResponse])
-async def upload_driver_licence(
+def upload_driver_licence(
     licence_number: str = Form(...),
     photo_front: UploadFile = File(...),
     photo_back: UploadFile | None = File(default=None),
@@ -230,14 +226,12 @@ async def upload_driver_licence(
     current_user=Depends(get_current_user),
 ):
     try:
-        front_content = await photo_front.read()
-        back_content = await photo_back.read() if photo_back else None
-        back_type = photo_back.content_type if photo_back else None
         user = user_service.submit_driver_license(
             db, current_user, licence_number,
-            front_content, photo_front.content_type,
-            email_service, vision_service,
-            back_content=back_content, back_content_type=back_type,
+            photo_front.file, photo_front.content_type,
+            email_service,
+            back_file=photo_back.file if photo_back else None,
+            back_content_type=photo_back.content_type if photo_back else None,
         )
         db.commit()
         return DataResponse(data=user)
@@ -247,14 +241,13 @@ async def upload_driver_licence(
 
 
 @router.post("/me/verification/selfie", response_model=DataResponse[UserPrivateResponse])
-async def upload_selfie(
+def upload_selfie(
     selfie: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        content = await selfie.read()
-        user = user_service.submit_selfie(db, current_user, content, selfie.content_type)
+        user = user_service.submit_selfie(db, current_user, selfie.file, selfie.content_type)
         db.commit()
         return DataResponse(data=user)
     except ValueError as exc:
@@ -263,14 +256,13 @@ async def upload_selfie(
 
 
 @router.post("/me/verification/id-document", response_model=DataResponse[UserPrivateResponse])
-async def upload_id_document(
+def upload_id_document(
     document: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     try:
-        content = await document.read()
-        user = user_service.submit_id_document(db, current_user, content, document.content_type)
+        user = user_service.submit_id_document(db, current_user, document.file, document.content_type)
         db.commit()
         return DataResponse(data=user)
     except ValueError as exc:
@@ -1,15 +1,12 @@
 """Vehicle lookup routes — makes, models, years for dropdown autocomplete."""
 
-import json
-import logging
-import urllib.request
 from datetime import datetime
-from functools import lru_cache
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
 from app.schemas.base import DataResponse
+from app.services.vehicle_catalogue import VALID_KINDS, Catalogue, get_catalogue
 
 
 class VehicleMake(BaseModel):
@@ -33,46 +30,26 @@ class VehicleModel(BaseModel):
         }
     }
 
-logger = logging.getLogger(__name__)
 router = APIRouter()
 
-_VEHICLESDB = "https://raw.githubusercontent.com/vehiclesdb/vehiclesdb/main/catalog"
-_VALID_TYPES = {"car", "van", "motorcycle", "moped", "truck", "bus"}
-
-# Fallback makes shown if CDN is unreachable
-_FALLBACK_MAKES = [
-    "Abarth", "Alfa Romeo", "Aston Martin", "Audi", "Bentley", "BMW", "Bugatti",
-    "Chevrolet", "Chrysler", "Citroën", "Cupra", "Dacia", "DS", "Ferrari", "Fiat",
-    "Ford", "Honda", "Hyundai", "Infiniti", "Jaguar", "Jeep", "Kia", "Lamborghini",
-    "Land Rover", "Lexus", "Maserati", "Mazda", "McLaren", "Mercedes-Benz", "MG",
-    "MINI", "Mitsubishi", "Nissan", "Peugeot", "Porsche", "Renault", "Rolls-Royce",
-    "SEAT", "Skoda", "Smart", "Subaru", "Suzuki", "Tesla", "Toyota", "Vauxhall",
-    "Volkswagen", "Volvo",
-]
-
-
-@lru_cache(maxsize=6)
-def _fetch_makes(kind: str) -> list[dict]:
-    """Fetch and cache makes from vehiclesdb CDN. Cached per process."""
-    url = f"{_VEHICLESDB}/{kind}/makes.json"
-    try:
-        with urllib.request.urlopen(url, timeout=8) as resp:
-            return json.loads(resp.read())
-    except Exception as exc:
-        logger.warning("vehiclesdb makes fetch failed, using fallback", exc_info=exc)
-        return [{"id": m.lower().replace(" ", "-"), "name": m} for m in _FALLBACK_MAKES]
-
-
-@lru_cache(maxsize=6)
-def _fetch_models(kind: str) -> list[dict]:
-    """Fetch and cache all models for a kind. Cached per process."""
-    url = f"{_VEHICLESDB}/{kind}/models.json"
-    try:
-        with urllib.request.urlopen(url, timeout=10) as resp:
-            return json.loads(resp.read())
-    except Exception as exc:
-        logger.warning("vehiclesdb models fetch failed", exc_info=exc)
-        return []
+# Clients and CDNs may reuse catalogue responses for an hour, then revalidate with If-None-Match
+_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _validate_kind(type: str) -> str:
+    kind = type.lower()
+    if kind not in VALID_KINDS:
+        raise HTTPException(status_code=400, detail=f"Invalid type. Must be one of: {', '.join(sorted(VALID_KINDS))}")
+    return kind
+
+
+def _not_modified(request: Request, response: Response, catalogue: Catalogue) -> Response | None:
+    """Set the catalogue validators; return a 304 when the client already has this version."""
+    headers = {"ETag": catalogue.etag, "Cache-Control": _CACHE_CONTROL}
+    if request.headers.get("if-none-match") == catalogue.etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 
 @router.get(
@@ -96,18 +73,17 @@ def _fetch_models(kind: str) -> list[dict]:
     },
 )
 def list_makes(
+    request: Request,
+    response: Response,
     type: str = Query(default="car", description="Vehicle type: car | van | motorcycle | moped | truck | bus"),
 ):
     """Return all makes for a vehicle type, sorted alphabetically."""
-    kind = type.lower()
-    if kind not in _VALID_TYPES:
-        raise HTTPException(status_code=400, detail=f"Invalid type. Must be one of: {', '.join(sorted(_VALID_TYPES))}")
-    raw = _fetch_makes(kind)
-    makes = sorted(
-        [VehicleMake(id=m["id"], name=m["name"]) for m in raw],
-        key=lambda x: x.name.lower(),
-    )
-    return DataResponse(data=makes)
+    kind = _validate_kind(type)
+    catalogue = get_catalogue()
+    not_modified = _not_modified(request, response, catalogue)
+    if not_modified is not None:
+        return not_modified
+    return DataResponse(data=catalogue.makes.get(kind, []))
 
 
 @router.get(
@@ -131,19 +107,18 @@ def list_makes(
     },
 )
 def list_models(
+    request: Request,
+    response: Response,
     make: str = Query(..., description="Make ID (slug), e.g. volkswagen"),
     type: str = Query(default="car", description="Vehicle type: car | van | motorcycle"),
 ):
     """Return all models for a given make, sorted alphabetically."""
-    kind = type.lower()
-    if kind not in _VALID_TYPES:
-        raise HTTPException(status_code=400, detail=f"Invalid type. Must be one of: {', '.join(sorted(_VALID_TYPES))}")
-    raw = _fetch_models(kind)
-    models = sorted(
-        [VehicleModel(id=m["id"], name=m["name"]) for m in raw if m.get("make_id") == make.lower()],
-        key=lambda x: x.name.lower(),
-    )
-    return DataResponse(data=models)
+    kind = _validate_kind(type)
+    catalogue = get_catalogue()
+    not_modified = _not_modified(request, response, catalogue)
+    if not_modified is not None:
+        return not_modified
+    return DataResponse(data=catalogue.models.get(kind, {}).get(make.lower(), []))
 
 
 @router.get(
@@ -1,13 +1,20 @@
 from celery import Celery
 
 from app.core.config import get_settings
+from app.core.constants import DAILY_STATS_RESTATE_DAYS
 
 settings = get_settings()
 
-celery_app = Celery("rideseat", include=["app.tasks.payment_tasks"])
+celery_app = Celery("rideseat", include=["app.tasks.payment_tasks", "app.tasks.maintenance_tasks", "app.tasks.media_tasks", "app.tasks.verification_tasks", "app.tasks.notification_tasks"])
 celery_app.conf.broker_url = settings.celery_broker_url
 celery_app.conf.result_backend = settings.celery_result_backend
-celery_app.conf.task_routes = {"app.tasks.payment_tasks.*": {"queue": "payments"}}
+celery_app.conf.task_routes = {
+    "app.tasks.payment_tasks.*": {"queue": "payments"},
+    "app.tasks.maintenance_tasks.*": {"queue": "celery"},
+    "app.tasks.media_tasks.*": {"queue": "celery"},
+    "app.tasks.verification_tasks.*": {"queue": "celery"},
+    "app.tasks.notification_tasks.*": {"queue": "celery"},
+}
 
 # Reliability: don't ack until the task succeeds; re-queue if worker dies mid-task
 celery_app.conf.task_acks_late = True
@@ -28,6 +35,14 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.payment_tasks.process_pending_intents",
         "schedule": 60.0,
     },
+    "drain-stripe-webhooks": {
+        "task": "app.tasks.payment_tasks.drain_stripe_webhooks",
+        "schedule": 15.0,  # safety net — the webhook endpoint queues a drain on demand
+    },
+    "reconcile-payments": {
+        "task": "app.tasks.payment_tasks.reconcile_payments",
+        "schedule": 600.0,  # every 10 minutes — catches webhooks Stripe never delivered
+    },
     "cancel-expired-pending-payments": {
         "task": "app.tasks.payment_tasks.cancel_expired_pending_payments",
         "schedule": 120.0,  # every 2 minutes
@@ -36,4 +51,29 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.payment_tasks.send_departure_reminders",
         "schedule": 300.0,  # every 5 minutes — 10-min window catches it regardless
     },
+    "archive-old-notifications": {
+        "task": "app.tasks.maintenance_tasks.archive_old_notifications",
+        "schedule": 86_400.0,  # daily
+    },
+    "refresh-admin-metrics": {
+        "task": "app.tasks.maintenance_tasks.refresh_admin_metrics",
+        "schedule": 60.0,
+    },
+    "refresh-daily-stats": {
+        "task": "app.tasks.maintenance_tasks.refresh_daily_stats",
+        "schedule": 300.0,  # every 5 minutes
+    },
+    "restate-daily-stats": {
+        "task": "app.tasks.maintenance_tasks.refresh_daily_stats",
+        "schedule": 86_400.0,  # daily — picks up refunds and cancellations of older payments
+        "args": (DAILY_STATS_RESTATE_DAYS,),
+    },
+    "run-payout-batches": {
+        "task": "app.tasks.payment_tasks.run_payout_batches",
+        "schedule": 3600.0,  # hourly — one grouped transfer per driver
+    },
+    "ocr-licence-backlog": {
+        "task": "app.tasks.verification_tasks.ocr_licence_backlog",
+        "schedule": 900.0,  # every 15 minutes
+    },
 }
@@ -18,6 +18,8 @@ class Settings:
     access_token_expire_minutes: int
     stripe_secret_key: str
     stripe_webhook_secret: str
+    stripe_connect_webhook_secret: str
+    stripe_api_base: str
     resend_api_key: str
     email_from: str
     frontend_base_url: str
@@ -28,6 +30,9 @@ class Settings:
     gcp_project_id: str
     gcp_storage_bucket: str
     gcp_credentials_json: str
+    storage_backend: str
+    local_storage_dir: str
+    vehicle_catalogue_cache: str
     admin_email: str
     admin_password: str
     admin_first_name: str
@@ -60,6 +65,8 @@ def get_settings() -> Settings:
         access_token_expire_minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
         stripe_secret_key=os.getenv("STRIPE_SECRET_KEY", ""),
         stripe_webhook_secret=os.getenv("STRIPE_WEBHOOK_SECRET", ""),
+        stripe_connect_webhook_secret=os.getenv("STRIPE_CONNECT_WEBHOOK_SECRET", ""),
+        stripe_api_base=os.getenv("STRIPE_API_BASE", ""),
         resend_api_key=os.getenv("RESEND_API_KEY", ""),
         email_from=os.getenv("EMAIL_FROM", ""),
         frontend_base_url=os.getenv("FRONTEND_BASE_URL", ""),
@@ -70,6 +77,11 @@ def get_settings() -> Settings:
         gcp_project_id=os.getenv("GCP_PROJECT_ID", ""),
         gcp_storage_bucket=os.getenv("GCP_STORAGE_BUCKET", ""),
         gcp_credentials_json=os.getenv("GCP_CREDENTIALS_JSON", ""),
+        storage_backend=os.getenv("STORAGE_BACKEND", "gcs"),
+        local_storage_dir=os.getenv("LOCAL_STORAGE_DIR", "/tmp/rideway-storage"),
+        vehicle_catalogue_cache=os.getenv(
+            "VEHICLE_CATALOGUE_CACHE", os.path.expanduser("~/.cache/rideway/vehicle-catalogue.json")
+        ),
         admin_email=os.getenv("ADMIN_EMAIL", ""),
         admin_password=os.getenv("ADMIN_PASSWORD", ""),
         admin_first_name=os.getenv("ADMIN_FIRST_NAME", "Admin"),
@@ -58,6 +58,18 @@ class PaymentStatus(StrEnum):
     REFUNDED = "REFUNDED"
 
 
+class PayoutBatchStatus(StrEnum):
+    PENDING = "PENDING"
+    PAID = "PAID"
+    FAILED = "FAILED"
+
+
+class LedgerEntryType(StrEnum):
+    EARNING = "EARNING"
+    REFUND = "REFUND"
+    TRANSFER = "TRANSFER"
+
+
 class ReviewRatingRange(StrEnum):
     MIN = "1"
     MAX = "5"
@@ -87,6 +99,13 @@ class IdentityVerificationStatus(StrEnum):
     REJECTED = "REJECTED"
 
 
+class LicenceOcrStatus(StrEnum):
+    PENDING = "PENDING"
+    MATCHED = "MATCHED"
+    MISMATCHED = "MISMATCHED"
+    UNREADABLE = "UNREADABLE"
+
+
 class TicketPriority(StrEnum):
     LOW = "LOW"
     MEDIUM = "MEDIUM"
@@ -118,3 +137,71 @@ class TripStatus(StrEnum):
 
 PLATFORM_FEE_PERCENT = 0.1
 CURRENCY = "gbp"
+
+# Notifications older than this move to notifications_archive; archived rows
+# are purged once they have been in the archive for the archive retention window.
+NOTIFICATION_RETENTION_DAYS = 90
+NOTIFICATION_ARCHIVE_RETENTION_DAYS = 365
+
+# Admin dashboard periods, each precomputed into admin_metrics_snapshots every
+# minute. A snapshot older than the max age is treated as missing and the
+# metrics are computed live instead (e.g. when beat is down).
+ADMIN_METRICS_PERIODS = ("today", "7d", "30d", "all")
+ADMIN_METRICS_SNAPSHOT_MAX_AGE_SECONDS = 300
+
+# Daily booking/revenue rollups: beat recomputes today and yesterday (and any
+# days since the last rollup if runs were missed); a nightly run restates the
+# trailing window so refunds and cancellations of older payments are reflected.
+DAILY_STATS_RESTATE_DAYS = 90
+
+# Batch OCR of the verification backlog: users per run, Vision batch requests
+# in flight at once, and the cap on Vision requests per second per worker.
+# Submissions younger than the grace period are left to their own OCR task.
+LICENCE_OCR_BACKLOG_LIMIT = 800
+LICENCE_OCR_BACKLOG_GRACE_SECONDS = 600
+LICENCE_OCR_MAX_CONCURRENCY = 4
+LICENCE_OCR_REQUESTS_PER_SECOND = 5
+
+# Driver payouts are batched: one Stripe transfer per driver per run. A batch
+# still PENDING after the stale window (worker died mid-transfer) is retried
+# with the same idempotency key, so Stripe never pays it twice.
+PAYOUT_BATCH_DRIVERS_PER_RUN = 500
+PAYOUT_BATCH_STALE_MINUTES = 15
+
+# Stripe calls run under a profile: interactive calls sit on a user's request
+# and must give up quickly; background calls (Celery payouts, recovery) can wait.
+# The connect timeout is shared; read timeouts and retry budgets differ.
+STRIPE_CONNECT_TIMEOUT_SECONDS = 3.05
+STRIPE_INTERACTIVE_READ_TIMEOUT_SECONDS = 10
+STRIPE_INTERACTIVE_MAX_RETRIES = 1
+STRIPE_BACKGROUND_READ_TIMEOUT_SECONDS = 60
+STRIPE_BACKGROUND_MAX_RETRIES = 3
+STRIPE_HTTP_POOL_SIZE = 20
+
+# Stripe Connect status/balance lookups are cached per connected account.
+# Within the fresh window an entry is served as is; after that it is still
+# served (up to the stale window) while one background refresh replaces it.
+# account.updated, balance.available and payout.* webhooks drop entries early.
+CONNECT_STATUS_FRESH_SECONDS = 120
+CONNECT_BALANCE_FRESH_SECONDS = 30
+CONNECT_CACHE_STALE_SECONDS = 900
+
+# Verified Stripe webhooks are buffered in a Redis stream and applied this many
+# per DB transaction by the drain task. An event still failing after the max
+# deliveries (same budget as the old per-event task's retries) is dead-lettered.
+STRIPE_WEBHOOK_BATCH_SIZE = 100
+STRIPE_WEBHOOK_MAX_DELIVERIES = 5
+
+# Payments are reconciled against Stripe PaymentIntents by a beat job. Each run
+# lists intents created since the checkpoint; the checkpoint then moves up to
+# the oldest intent still in flight, but never lags more than the open lookback.
+# The first run (no checkpoint yet) looks back the initial window.
+PAYMENT_RECONCILE_INITIAL_LOOKBACK_HOURS = 24
+PAYMENT_RECONCILE_OPEN_LOOKBACK_HOURS = 6
+PAYMENT_RECONCILE_PAGE_SIZE = 100
+
+# Payments created while Stripe was unreachable get their PaymentIntent from a
+# recovery sweep. Each run claims up to the batch size and queues one task per
+# payment; a claim not finished within the stale window is swept again.
+PAYMENT_INTENT_SWEEP_BATCH_SIZE = 500
+PAYMENT_INTENT_CLAIM_STALE_MINUTES = 5
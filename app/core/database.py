@@ -1,10 +1,15 @@
 """Database engine and session factory."""
 
-from sqlalchemy import create_engine
+import logging
+from typing import Callable
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,3 +22,32 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 def create_db_session() -> Session:
     return SessionLocal()
+
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run `callback` once the session's current transaction commits; drop it on rollback.
+
+    For side effects that must only see committed rows, e.g. queuing a Celery
+    task that reads what this transaction wrote. The commit has already happened
+    when the callback runs, so its errors are logged rather than raised.
+    """
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_after_commit_callbacks(session: Session, transaction) -> None:
+    # Still queued when the outermost transaction ends means it rolled back
+    if transaction.parent is None:
+        session.info.pop(_AFTER_COMMIT_KEY, None)
@@ -0,0 +1,23 @@
+"""Redis clients for application state, on the Celery broker's Redis instance.
+
+Each logical database gets its own cached client (and connection pool), kept
+apart from DB 0 where Celery queues live:
+  REDIS_DB_APP (2)      → idempotency locks
+  REDIS_DB_PAYMENTS (3) → circuit breaker, Stripe call metrics, Connect cache,
+                          webhook stream, reconciliation checkpoint
+"""
+
+from functools import lru_cache
+
+import redis
+
+from app.core.config import get_settings
+
+REDIS_DB_APP = 2
+REDIS_DB_PAYMENTS = 3
+
+
+@lru_cache
+def redis_client(db: int) -> redis.Redis:
+    base_url = get_settings().celery_broker_url.rsplit("/", 1)[0]
+    return redis.from_url(f"{base_url}/{db}", decode_responses=True)
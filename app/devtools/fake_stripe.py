@@ -0,0 +1,469 @@
+"""Local Stripe stand-in for load and integration testing.
+
+Implements the slice of the Stripe API the app uses — PaymentIntents,
+Refunds, Transfers, Payouts, Accounts and Balance — in memory, with
+configurable latency and error injection, and emits signed webhooks exactly
+as Stripe does so the real webhook endpoint can be exercised offline.
+
+Run it next to the API:
+
+    python -m app.devtools.fake_stripe --port 12111 \\
+        --webhook-url http://localhost:8000/api/v1/payments/webhook --auto-confirm-ms 200
+
+and start the API with STRIPE_API_BASE=http://localhost:12111,
+STRIPE_SECRET_KEY=sk_test_fake and STRIPE_WEBHOOK_SECRET=whsec_fake (the
+--webhook-secret default). Latency and error rates can be changed while it
+runs with POST /_fake/config, e.g. {"latency_ms": 300, "error_rate": 0.05}.
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import operator
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+_API_VERSION = "2024-06-20"
+# Stripe test-mode payment methods that decline on confirm
+_DECLINING_METHODS = {"pm_card_chargeDeclined", "pm_card_visa_chargeDeclined"}
+
+
+@dataclass
+class FakeStripeConfig:
+    latency_ms: int = 0
+    jitter_ms: int = 0
+    error_rate: float = 0.0
+    error_status: int = 500
+    auto_confirm_ms: int | None = None
+    webhook_url: str | None = None
+    webhook_secret: str = "whsec_fake"
+
+
+class StripeError(Exception):
+    def __init__(self, status: int, error_type: str, message: str, code: str | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.body = {"error": {"type": error_type, "message": message, "code": code}}
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{secrets.token_hex(12)}"
+
+
+_CREATED_FILTERS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+def _unflatten(pairs: list[tuple[str, str]]) -> dict:
+    """Turn Stripe's form encoding (metadata[booking_id]=…) back into nested dicts."""
+    params: dict = {}
+    for key, value in pairs:
+        parts = re.findall(r"[^\[\]]+", key)
+        target = params
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return params
+
+
+def sign_payload(payload: bytes, secret: str, timestamp: int | None = None) -> str:
+    """Build a Stripe-Signature header for `payload` (v1 scheme, HMAC-SHA256)."""
+    timestamp = timestamp or int(time.time())
+    signed = f"{timestamp}.".encode("utf-8") + payload
+    digest = hmac.new(secret.encode("utf-8"), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+class FakeStripe:
+    """In-memory Stripe state. All mutation goes through `lock`."""
+
+    def __init__(self, config: FakeStripeConfig | None = None) -> None:
+        self.config = config or FakeStripeConfig()
+        self.lock = threading.Lock()
+        self.objects: dict[str, dict[str, dict]] = {
+            "payment_intent": {}, "refund": {}, "transfer": {}, "payout": {}, "account": {},
+        }
+        self.idempotent: dict[tuple[str, str], tuple[int, dict]] = {}
+        self.events: list[dict] = []
+        self._webhook_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fake-stripe-webhook")
+
+    # ── routing ───────────────────────────────────────────────────────────
+
+    def handle(self, method: str, path: str, params: dict, headers: dict) -> tuple[int, dict]:
+        if path.startswith("/_fake/"):
+            return self._control(method, path, params)
+        self._inject_latency()
+        key = headers.get("idempotency-key")
+        if method == "POST" and key:
+            with self.lock:
+                cached = self.idempotent.get((path, key))
+            if cached is not None:
+                return cached
+        try:
+            if self.config.error_rate and random.random() < self.config.error_rate:
+                raise StripeError(self.config.error_status, "api_error", "Injected failure")
+            result = (200, self._dispatch(method, path, params, headers.get("stripe-account")))
+        except StripeError as exc:
+            result = (exc.status, exc.body)
+        if method == "POST" and key and result[0] < 500:
+            with self.lock:
+                self.idempotent[(path, key)] = result
+        return result
+
+    def _dispatch(self, method: str, path: str, params: dict, stripe_account: str | None) -> dict:
+        routes = [
+            ("POST", r"/v1/payment_intents", lambda: self.create_payment_intent(params)),
+            ("GET", r"/v1/payment_intents", lambda: self._list("payment_intent", params)),
+            ("GET", r"/v1/payment_intents/(?P<id>[^/]+)", lambda id: self._get("payment_intent", id)),
+            ("POST", r"/v1/payment_intents/(?P<id>[^/]+)/confirm", lambda id: self.confirm_payment_intent(id, params)),
+            ("POST", r"/v1/payment_intents/(?P<id>[^/]+)/cancel", lambda id: self.cancel_payment_intent(id)),
+            ("POST", r"/v1/refunds", lambda: self.create_refund(params)),
+            ("POST", r"/v1/transfers", lambda: self.create_transfer(params)),
+            ("POST", r"/v1/payouts", lambda: self.create_payout(params, stripe_account)),
+            ("POST", r"/v1/accounts", lambda: self.create_account(params)),
+            ("GET", r"/v1/accounts/(?P<id>[^/]+)", lambda id: self._account(id)),
+            ("POST", r"/v1/accounts/(?P<id>[^/]+)", lambda id: self.update_account(id, params)),
+            ("POST", r"/v1/accounts/(?P<id>[^/]+)/external_accounts", lambda id: self.add_external_account(id, params)),
+            ("GET", r"/v1/balance", lambda: self.balance(stripe_account)),
+        ]
+        for route_method, pattern, handler in routes:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                return handler(**match.groupdict())
+        raise StripeError(404, "invalid_request_error", f"Unrecognized request URL ({method}: {path})")
+
+    def _control(self, method: str, path: str, params: dict) -> tuple[int, dict]:
+        if path == "/_fake/config" and method == "POST":
+            for field_name, value in params.items():
+                if hasattr(self.config, field_name):
+                    setattr(self.config, field_name, value)
+            return 200, asdict(self.config)
+        if path == "/_fake/config":
+            return 200, asdict(self.config)
+        if path == "/_fake/events":
+            with self.lock:
+                return 200, {"data": list(self.events)}
+        if path == "/_fake/reset" and method == "POST":
+            with self.lock:
+                for bucket in self.objects.values():
+                    bucket.clear()
+                self.idempotent.clear()
+                self.events.clear()
+            return 200, {"reset": True}
+        return 404, {"error": {"type": "invalid_request_error", "message": "Unknown control endpoint"}}
+
+    def _inject_latency(self) -> None:
+        delay_ms = self.config.latency_ms + random.uniform(0, self.config.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    # ── objects ───────────────────────────────────────────────────────────
+
+    def _get(self, kind: str, object_id: str) -> dict:
+        with self.lock:
+            obj = self.objects[kind].get(object_id)
+        if obj is None:
+            raise StripeError(404, "invalid_request_error", f"No such {kind}: '{object_id}'", "resource_missing")
+        return obj
+
+    def _list(self, kind: str, params: dict) -> dict:
+        """Newest first with starting_after cursors and created[gte]-style filters, like Stripe's list endpoints."""
+        limit = min(int(params.get("limit", 10)), 100)
+        with self.lock:
+            rows = sorted(self.objects[kind].values(), key=lambda o: (o["created"], o["id"]), reverse=True)
+        created = params.get("created")
+        if isinstance(created, dict):
+            for op, value in created.items():
+                compare = _CREATED_FILTERS[op]
+                rows = [o for o in rows if compare(o["created"], int(value))]
+        if params.get("starting_after"):
+            ids = [o["id"] for o in rows]
+            rows = rows[ids.index(params["starting_after"]) + 1:] if params["starting_after"] in ids else []
+        page = rows[:limit]
+        return {"object": "list", "url": f"/v1/{kind}s", "data": page, "has_more": len(rows) > limit}
+
+    def _store(self, kind: str, obj: dict) -> dict:
+        with self.lock:
+            self.objects[kind][obj["id"]] = obj
+        return obj
+
+    def create_payment_intent(self, params: dict) -> dict:
+        intent_id = _new_id("pi")
+        intent = self._store("payment_intent", {
+            "id": intent_id,
+            "object": "payment_intent",
+            "amount": int(params["amount"]),
+            "currency": params.get("currency", "gbp"),
+            "status": "requires_payment_method",
+            "client_secret": f"{intent_id}_secret_{secrets.token_hex(8)}",
+            "metadata": params.get("metadata", {}),
+            "latest_charge": None,
+            "last_payment_error": None,
+            "created": int(time.time()),
+            "livemode": False,
+        })
+        if self.config.auto_confirm_ms is not None:
+            timer = threading.Timer(self.config.auto_confirm_ms / 1000, self.confirm_payment_intent, args=(intent_id, {}))
+            timer.daemon = True
+            timer.start()
+        return intent
+
+    def confirm_payment_intent(self, intent_id: str, params: dict) -> dict:
+        intent = self._get("payment_intent", intent_id)
+        with self.lock:
+            if intent["status"] in ("succeeded", "canceled"):
+                raise StripeError(400, "invalid_request_error", f"PaymentIntent has status {intent['status']}")
+            if params.get("payment_method") in _DECLINING_METHODS:
+                intent["status"] = "requires_payment_method"
+                intent["last_payment_error"] = {"type": "card_error", "code": "card_declined"}
+                event_type = "payment_intent.payment_failed"
+            else:
+                intent["status"] = "succeeded"
+                intent["latest_charge"] = _new_id("ch")
+                event_type = "payment_intent.succeeded"
+        self.emit(event_type, intent)
+        return intent
+
+    def cancel_payment_intent(self, intent_id: str) -> dict:
+        intent = self._get("payment_intent", intent_id)
+        with self.lock:
+            if intent["status"] == "succeeded":
+                raise StripeError(400, "invalid_request_error", "PaymentIntent has already succeeded")
+            intent["status"] = "canceled"
+        self.emit("payment_intent.canceled", intent)
+        return intent
+
+    def create_refund(self, params: dict) -> dict:
+        intent = self._get("payment_intent", params["payment_intent"])
+        if intent["status"] != "succeeded":
+            raise StripeError(400, "invalid_request_error", "PaymentIntent has not succeeded", "charge_not_refundable")
+        refund = self._store("refund", {
+            "id": _new_id("re"),
+            "object": "refund",
+            "amount": int(params.get("amount", intent["amount"])),
+            "currency": intent["currency"],
+            "payment_intent": intent["id"],
+            "charge": intent["latest_charge"],
+            "status": "succeeded",
+            "created": int(time.time()),
+        })
+        self.emit("charge.refunded", {**intent, "amount_refunded": refund["amount"]})
+        return refund
+
+    def create_transfer(self, params: dict) -> dict:
+        self._account(params["destination"])
+        transfer = self._store("transfer", {
+            "id": _new_id("tr"),
+            "object": "transfer",
+            "amount": int(params["amount"]),
+            "currency": params.get("currency", "gbp"),
+            "destination": params["destination"],
+            "transfer_group": params.get("transfer_group"),
+            "metadata": params.get("metadata", {}),
+            "reversed": False,
+            "created": int(time.time()),
+        })
+        self.emit("transfer.created", transfer)
+        return transfer
+
+    def create_payout(self, params: dict, stripe_account: str | None) -> dict:
+        amount = int(params["amount"])
+        if stripe_account and amount > self._available(stripe_account):
+            raise StripeError(400, "invalid_request_error", "Insufficient funds in Stripe account", "balance_insufficient")
+        payout = self._store("payout", {
+            "id": _new_id("po"),
+            "object": "payout",
+            "amount": amount,
+            "currency": params.get("currency", "gbp"),
+            "account": stripe_account,
+            "status": "pending",
+            "created": int(time.time()),
+        })
+        self.emit("payout.created", payout, account=stripe_account)
+        return payout
+
+    def create_account(self, params: dict) -> dict:
+        return self._store("account", self._new_account(_new_id("acct"), params))
+
+    def _new_account(self, account_id: str, params: dict | None = None) -> dict:
+        params = params or {}
+        return {
+            "id": account_id,
+            "object": "account",
+            "type": params.get("type", "custom"),
+            "country": params.get("country", "GB"),
+            "email": params.get("email"),
+            "charges_enabled": True,
+            "payouts_enabled": True,
+            "details_submitted": True,
+            "requirements": {"currently_due": [], "eventually_due": [], "disabled_reason": None},
+            "external_accounts": {"object": "list", "data": []},
+            "created": int(time.time()),
+        }
+
+    def _account(self, account_id: str) -> dict:
+        # Accounts seeded in the app's database are unknown here; adopt them on first use
+        with self.lock:
+            account = self.objects["account"].get(account_id)
+            if account is None:
+                account = self.objects["account"][account_id] = self._new_account(account_id)
+        return account
+
+    def update_account(self, account_id: str, params: dict) -> dict:
+        account = self._account(account_id)
+        with self.lock:
+            for key, value in params.items():
+                if key not in ("id", "object"):
+                    account[key] = value
+        self.emit("account.updated", account, account=account_id)
+        return account
+
+    def add_external_account(self, account_id: str, params: dict) -> dict:
+        account = self._account(account_id)
+        bank = {**params.get("external_account", {}), "id": _new_id("ba"), "object": "bank_account", "account": account_id}
+        with self.lock:
+            account["external_accounts"]["data"].append(bank)
+        return bank
+
+    def _available(self, account_id: str | None) -> int:
+        with self.lock:
+            if account_id is None:
+                charged = sum(i["amount"] for i in self.objects["payment_intent"].values() if i["status"] == "succeeded")
+                refunded = sum(r["amount"] for r in self.objects["refund"].values())
+                transferred = sum(t["amount"] for t in self.objects["transfer"].values())
+                return charged - refunded - transferred
+            received = sum(t["amount"] for t in self.objects["transfer"].values() if t["destination"] == account_id)
+            paid_out = sum(p["amount"] for p in self.objects["payout"].values() if p["account"] == account_id)
+            return received - paid_out
+
+    def balance(self, stripe_account: str | None) -> dict:
+        return {
+            "object": "balance",
+            "available": [{"amount": self._available(stripe_account), "currency": "gbp"}],
+            "pending": [{"amount": 0, "currency": "gbp"}],
+            "livemode": False,
+        }
+
+    # ── webhooks ──────────────────────────────────────────────────────────
+
+    def emit(self, event_type: str, obj: dict, account: str | None = None) -> dict:
+        event = {
+            "id": _new_id("evt"),
+            "object": "event",
+            "api_version": _API_VERSION,
+            "created": int(time.time()),
+            "type": event_type,
+            "account": account,
+            "livemode": False,
+            "data": {"object": dict(obj)},
+        }
+        with self.lock:
+            self.events.append(event)
+        if self.config.webhook_url:
+            self._webhook_pool.submit(self._deliver, event)
+        return event
+
+    def _deliver(self, event: dict) -> None:
+        payload = json.dumps(event).encode("utf-8")
+        req = urllib.request.Request(
+            self.config.webhook_url,
+            data=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Stripe-Signature": sign_payload(payload, self.config.webhook_secret),
+            },
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                resp.read()
+        except Exception as exc:
+            logger.warning("Webhook delivery of %s failed: %s", event["id"], exc)
+
+
+def _make_handler(stripe_state: FakeStripe) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _serve(self) -> None:
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if url.path.startswith("/_fake/"):
+                params = json.loads(raw) if raw else {}
+            else:
+                params = _unflatten(parse_qsl(url.query) + parse_qsl(raw.decode("utf-8")))
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            status, body = stripe_state.handle(self.command, url.path, params, headers)
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Request-Id", _new_id("req"))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = _serve
+        do_POST = _serve
+        do_DELETE = _serve
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug(format, *args)
+
+    return Handler
+
+
+def make_server(host: str = "127.0.0.1", port: int = 12111, config: FakeStripeConfig | None = None):
+    """Build the HTTP server; `server.stripe` exposes the in-memory state."""
+    state = FakeStripe(config)
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    server.daemon_threads = True
+    server.stripe = state
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Stripe stand-in for load and integration tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12111)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Fixed delay added to every API call")
+    parser.add_argument("--jitter-ms", type=int, default=0, help="Extra random delay, uniform in [0, jitter]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API calls that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected failures (e.g. 429)")
+    parser.add_argument("--auto-confirm-ms", type=int, default=None, help="Confirm new PaymentIntents after this delay")
+    parser.add_argument("--webhook-url", default=None, help="Where to POST signed events")
+    parser.add_argument("--webhook-secret", default="whsec_fake")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = make_server(args.host, args.port, FakeStripeConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        auto_confirm_ms=args.auto_confirm_ms,
+        webhook_url=args.webhook_url,
+        webhook_secret=args.webhook_secret,
+    ))
+    logger.info("Fake Stripe listening on http://%s:%d", args.host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
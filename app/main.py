@@ -18,6 +18,7 @@ from app.core.database import SessionLocal
 from app.core.security import hash_password
 from app.models.user import User
 from app.repositories.user_repo import UserRepository
+from app.services import vehicle_catalogue
 
 
 def create_app() -> FastAPI:
@@ -37,6 +38,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
     )
 
     @app.exception_handler(RequestValidationError)
@@ -112,6 +114,12 @@ def create_app() -> FastAPI:
                 db.rollback()
         finally:
             db.close()
+
+    @app.on_event("startup")
+    def load_vehicle_catalogue():
+        vehicle_catalogue.get_catalogue()
+        vehicle_catalogue.start_background_refresh()
+
     app.include_router(api_router)
     app.include_router(admin_web_router, prefix="/admin")
     return app
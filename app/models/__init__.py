@@ -4,14 +4,20 @@ from app.models.user import User
 from app.models.trip import Trip
 from app.models.booking import Booking
 from app.models.payment import Payment
+from app.models.payout import PayoutBatch
+from app.models.ledger import DriverBalance, DriverLedgerEntry
 from app.models.message import Message
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationArchive
 from app.models.device import Device
 from app.models.review import Review
 from app.models.ticket import Ticket
 from app.models.vehicle import Vehicle
+from app.models.stored_object import StoredObject
+from app.models.metrics import AdminMetricsSnapshot, DailyBookingStats, DailyRevenueStats
 
 __all__ = [
     "User", "Trip", "Booking", "Payment", "Message",
-    "Notification", "Device", "Review", "Ticket", "Vehicle",
+    "Notification", "NotificationArchive", "Device", "Review", "Ticket", "Vehicle",
+    "AdminMetricsSnapshot", "DailyBookingStats", "DailyRevenueStats", "StoredObject",
+    "PayoutBatch", "DriverLedgerEntry", "DriverBalance",
 ]
@@ -22,7 +22,9 @@ class Booking(Base):
     is_disputed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, server_default="false")
     dispute_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
     payment_deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     trip = relationship("Trip", back_populates="bookings")
@@ -0,0 +1,50 @@
+"""Driver earnings ledger models."""
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.constants import LedgerEntryType
+from app.core.database import Base
+
+
+class DriverLedgerEntry(Base):
+    """Append-only record of money owed to a driver.
+
+    Earnings are positive; refunds and transfers are negative. `balance` is the
+    driver's running balance after this entry. Each payment or payout batch
+    produces at most one entry of each type.
+    """
+
+    __tablename__ = "driver_ledger"
+    __table_args__ = (
+        Index("ix_driver_ledger_driver_created", "driver_id", "created_at"),
+        UniqueConstraint("entry_type", "payment_id", name="uq_driver_ledger_payment"),
+        UniqueConstraint("entry_type", "payout_batch_id", name="uq_driver_ledger_payout_batch"),
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    driver_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"))
+    entry_type: Mapped[LedgerEntryType] = mapped_column(Enum(LedgerEntryType))
+    amount: Mapped[float] = mapped_column(Numeric(10, 2))
+    balance: Mapped[float] = mapped_column(Numeric(12, 2))
+    payment_id: Mapped[UUID | None] = mapped_column(ForeignKey("payments.id"), default=None)
+    payout_batch_id: Mapped[UUID | None] = mapped_column(ForeignKey("payout_batches.id"), default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class DriverBalance(Base):
+    """Current totals per driver, updated in the same transaction as each ledger entry."""
+
+    __tablename__ = "driver_balances"
+
+    driver_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    balance: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    total_earned: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    total_refunded: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    total_transferred: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,40 @@
+"""Precomputed admin metrics, refreshed by Celery beat."""
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import JSON, Date, DateTime, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class AdminMetricsSnapshot(Base):
+    """One row per dashboard period ("today", "7d", "30d", "all")."""
+
+    __tablename__ = "admin_metrics_snapshots"
+
+    period: Mapped[str] = mapped_column(String(16), primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class DailyBookingStats(Base):
+    """Bookings created per UTC day; recent days are recomputed by beat."""
+
+    __tablename__ = "daily_booking_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    booking_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class DailyRevenueStats(Base):
+    """Succeeded payment totals per UTC day; recent days are recomputed by beat."""
+
+    __tablename__ = "daily_revenue_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    payment_count: Mapped[int] = mapped_column(Integer, default=0)
+    revenue: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    platform_fees: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Numeric, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants import PaymentStatus
@@ -15,15 +15,31 @@ class Payment(Base):
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     booking_id: Mapped[UUID] = mapped_column(ForeignKey("bookings.id"), index=True)
+    # Copy of bookings.passenger_id so a passenger's history is one index range scan, no join
+    payer_id: Mapped[UUID | None] = mapped_column(ForeignKey("users.id"), default=None)
     amount: Mapped[float] = mapped_column(Numeric(10, 2))
     platform_fee: Mapped[float] = mapped_column(Numeric(10, 2))
     payout_amount: Mapped[float] = mapped_column(Numeric(10, 2))
     status: Mapped[PaymentStatus] = mapped_column(Enum(PaymentStatus))
-    stripe_payment_intent_id: Mapped[str | None] = mapped_column(String(255), default=None)
+    stripe_payment_intent_id: Mapped[str | None] = mapped_column(String(255), default=None, index=True)
     stripe_client_secret: Mapped[str | None] = mapped_column(String(500), default=None)
     stripe_charge_id: Mapped[str | None] = mapped_column(String(255), default=None)
     stripe_transfer_id: Mapped[str | None] = mapped_column(String(255), default=None)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    intent_claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    payout_batch_id: Mapped[UUID | None] = mapped_column(ForeignKey("payout_batches.id"), index=True, default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     booking = relationship("Booking", back_populates="payments")
+
+
+# Serves payment history keyset pages; status is included so the SUCCEEDED filter needs no heap fetch
+Index(
+    "ix_payments_payer_created",
+    Payment.payer_id,
+    Payment.created_at.desc(),
+    Payment.id.desc(),
+    postgresql_include=["status"],
+)
@@ -0,0 +1,33 @@
+"""Payout batch model."""
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.constants import PayoutBatchStatus
+from app.core.database import Base
+
+
+class PayoutBatch(Base):
+    """One Stripe transfer covering all of a driver's payments claimed by the batch.
+
+    Payments point back here via payments.payout_batch_id; the transfer is
+    tagged with transfer_group so Stripe reporting groups the same way.
+    """
+
+    __tablename__ = "payout_batches"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    driver_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
+    transfer_group: Mapped[str] = mapped_column(String(100), unique=True)
+    status: Mapped[PayoutBatchStatus] = mapped_column(Enum(PayoutBatchStatus), default=PayoutBatchStatus.PENDING)
+    amount: Mapped[float] = mapped_column(Numeric(10, 2), default=0)
+    payment_count: Mapped[int] = mapped_column(Integer, default=0)
+    stripe_transfer_id: Mapped[str | None] = mapped_column(String(255), default=None)
+    error: Mapped[str | None] = mapped_column(String(500), default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
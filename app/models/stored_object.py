@@ -0,0 +1,32 @@
+"""Stored object model — one row per distinct upload, keyed by content hash."""
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.utils.crypto import EncryptedString
+
+
+class StoredObject(Base):
+    """An uploaded file, deduplicated per owner and folder by SHA-256.
+
+    Licence photos also carry the memoized OCR result, so resubmitting the same
+    image never calls Vision twice.
+    """
+
+    __tablename__ = "stored_objects"
+    __table_args__ = (UniqueConstraint("owner_id", "folder", "sha256", name="uq_stored_objects_owner_folder_sha256"),)
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    owner_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    folder: Mapped[str] = mapped_column(String(50))
+    sha256: Mapped[str] = mapped_column(String(64))
+    url: Mapped[str] = mapped_column(String(500))
+    content_type: Mapped[str] = mapped_column(String(100))
+    size_bytes: Mapped[int] = mapped_column(Integer)
+    ocr_licence_number: Mapped[str | None] = mapped_column(EncryptedString(), default=None)
+    ocr_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -3,10 +3,18 @@
 from datetime import datetime, timezone, date
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, Integer, Numeric, String
+from sqlalchemy import JSON, Boolean, DateTime, Enum, Index, Integer, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.constants import ChatPreference, Gender, IdentityVerificationStatus, LuggageSize, SmokingPreference, UserRole
+from app.core.constants import (
+    ChatPreference,
+    Gender,
+    IdentityVerificationStatus,
+    LicenceOcrStatus,
+    LuggageSize,
+    SmokingPreference,
+    UserRole,
+)
 from app.core.database import Base
 from app.utils.crypto import EncryptedDate, EncryptedString
 
@@ -25,6 +33,8 @@ class User(Base):
     phone_verification_token: Mapped[str | None] = mapped_column(String(255), default=None)
     phone_verification_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
     profile_photo_url: Mapped[str | None] = mapped_column(String(500), default=None)
+    # {"thumb": {"webp": url, "jpeg": url}, "medium": {...}} — filled in by media_tasks
+    profile_photo_variants: Mapped[dict | None] = mapped_column(JSON, default=None)
     payment_details: Mapped[str | None] = mapped_column(EncryptedString(), default=None)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.PASSENGER)
     bio: Mapped[str | None] = mapped_column(String(300), default=None)
@@ -39,6 +49,7 @@ class User(Base):
     notify_in_app: Mapped[bool] = mapped_column(Boolean, default=True)
     marketing_emails: Mapped[bool] = mapped_column(Boolean, default=False)
     vehicle_photo_url: Mapped[str | None] = mapped_column(String(500), default=None)
+    vehicle_photo_variants: Mapped[dict | None] = mapped_column(JSON, default=None)
     vehicle_make: Mapped[str | None] = mapped_column(String(100), default=None)
     vehicle_model: Mapped[str | None] = mapped_column(String(100), default=None)
     vehicle_type: Mapped[str | None] = mapped_column(String(100), default=None)
@@ -64,12 +75,17 @@ class User(Base):
     driver_license_number: Mapped[str | None] = mapped_column(EncryptedString(), default=None)
     identity_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     identity_verification_status: Mapped[IdentityVerificationStatus | None] = mapped_column(
-        Enum(IdentityVerificationStatus), default=None
+        Enum(IdentityVerificationStatus), default=None, index=True
     )
+    # Result of the background OCR check of the licence front photo
+    licence_ocr_status: Mapped[LicenceOcrStatus | None] = mapped_column(Enum(LicenceOcrStatus), default=None)
+    licence_ocr_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
     is_email_verified: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     trips = relationship("Trip", back_populates="driver", cascade="all, delete-orphan")
@@ -80,3 +96,13 @@ class User(Base):
     reviews_received = relationship("Review", back_populates="reviewee", foreign_keys="Review.reviewee_id")
     devices = relationship("Device", back_populates="user", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+
+
+# Serves the admin activity feed's verification_pending keyset scan
+Index(
+    "ix_users_pending_verification_updated",
+    User.updated_at.desc(),
+    User.id.desc(),
+    postgresql_where=(User.identity_verification_status == IdentityVerificationStatus.PENDING)
+    & (User.updated_at != User.created_at),
+)
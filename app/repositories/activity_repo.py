@@ -0,0 +1,55 @@
+"""Admin activity feed repository."""
+
+from sqlalchemy import Numeric, String, Uuid, cast, literal, null, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from app.core.constants import IdentityVerificationStatus, PaymentStatus
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.user import User
+from app.utils.pagination import Cursor
+
+
+class ActivityRepository:
+    def list_recent(self, db: Session, limit: int = 20, cursor: Cursor | None = None) -> list:
+        """Newest signups, verification submissions, bookings and succeeded payments.
+
+        One UNION ALL statement. Each branch is an ordered, limited scan of its own
+        index (created_at, or ix_users_pending_verification_updated for pending
+        verifications); the outer query merges them. Rows expose kind, id,
+        created_at, first_name, last_name, email, status, amount and ref_id.
+        """
+
+        def branch(kind: str, ts, row_id, *, first_name=None, last_name=None, email=None,
+                   status=None, amount=None, ref_id=None, where=()):
+            stmt = select(
+                literal(kind, String(32)).label("kind"),
+                row_id.label("id"),
+                ts.label("created_at"),
+                (first_name if first_name is not None else cast(null(), String(100))).label("first_name"),
+                (last_name if last_name is not None else cast(null(), String(100))).label("last_name"),
+                (email if email is not None else cast(null(), String(255))).label("email"),
+                (cast(status, String(32)) if status is not None else cast(null(), String(32))).label("status"),
+                (amount if amount is not None else cast(null(), Numeric(10, 2))).label("amount"),
+                (ref_id if ref_id is not None else cast(null(), Uuid)).label("ref_id"),
+            ).where(*where)
+            if cursor is not None:
+                stmt = stmt.where(tuple_(ts, row_id) < tuple_(cursor.created_at, cursor.id))
+            sub = stmt.order_by(ts.desc(), row_id.desc()).limit(limit).subquery()
+            return select(*sub.c)
+
+        feed = union_all(
+            branch("signup", User.created_at, User.id,
+                   first_name=User.first_name, last_name=User.last_name, email=User.email),
+            branch("verification_pending", User.updated_at, User.id,
+                   first_name=User.first_name, last_name=User.last_name, email=User.email,
+                   where=(User.identity_verification_status == IdentityVerificationStatus.PENDING,
+                          User.updated_at != User.created_at)),
+            branch("booking", Booking.created_at, Booking.id,
+                   status=Booking.status, amount=Booking.total_amount),
+            branch("payment", Payment.created_at, Payment.id,
+                   amount=Payment.amount, ref_id=Payment.booking_id,
+                   where=(Payment.status == PaymentStatus.SUCCEEDED,)),
+        ).subquery()
+        stmt = select(feed).order_by(feed.c.created_at.desc(), feed.c.id.desc()).limit(limit)
+        return list(db.execute(stmt).all())
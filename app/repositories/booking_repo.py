@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import cast, Date, func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session, selectinload
 
 from app.core.constants import BookingStatus
@@ -117,31 +117,45 @@ class BookingRepository:
         )
         return list(db.execute(stmt).scalars().all())
 
-    def list_expired_pending_payments(self, db: Session, now) -> list[Booking]:
-        """Return PENDING_PAYMENT bookings whose payment_deadline has passed."""
-        stmt = select(Booking).where(
-            Booking.status == BookingStatus.PENDING_PAYMENT,
-            Booking.payment_deadline != None,  # noqa: E711
-            Booking.payment_deadline < now,
+    def cancel_expired_pending_payments(self, db: Session, now, limit: int = 500) -> list:
+        """Cancel up to `limit` PENDING_PAYMENT bookings past their payment_deadline.
+
+        One UPDATE ... RETURNING over a SKIP LOCKED subselect, so rows held by a
+        concurrent booking/payment transaction are left for the next sweep.
+        Returns (id, trip_id, passenger_id) rows for the cancelled bookings.
+        """
+        expired_ids = (
+            select(Booking.id)
+            .where(
+                Booking.status == BookingStatus.PENDING_PAYMENT,
+                Booking.payment_deadline != None,  # noqa: E711
+                Booking.payment_deadline < now,
+            )
+            .order_by(Booking.payment_deadline)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
         )
-        return list(db.execute(stmt).scalars().all())
+        stmt = (
+            update(Booking)
+            .where(Booking.id.in_(expired_ids.scalar_subquery()))
+            .values(status=BookingStatus.CANCELLED, updated_at=now)
+            .returning(Booking.id, Booking.trip_id, Booking.passenger_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(db.execute(stmt).all())
 
-    def bookings_timeseries(self, db: Session, days: int = 7) -> list[dict]:
-        """Daily booking count for the last N days."""
-        from datetime import timedelta
-        from app.utils.datetime import now_utc
-        since = now_utc() - timedelta(days=days)
+    def complete_confirmed_for_trip(self, db: Session, trip_id: UUID, now) -> list:
+        """Mark every CONFIRMED booking on the trip COMPLETED in one statement.
+
+        Returns (id, passenger_id) rows for the bookings that were completed.
+        """
         stmt = (
-            select(
-                cast(Booking.created_at, Date).label("date"),
-                func.count(Booking.id).label("value"),
-            )
-            .where(Booking.created_at >= since)
-            .group_by(cast(Booking.created_at, Date))
-            .order_by(cast(Booking.created_at, Date))
+            update(Booking)
+            .where(Booking.trip_id == trip_id, Booking.status == BookingStatus.CONFIRMED)
+            .values(status=BookingStatus.COMPLETED, updated_at=now)
+            .returning(Booking.id, Booking.passenger_id)
         )
-        rows = db.execute(stmt).all()
-        return [{"date": str(row.date), "value": int(row.value)} for row in rows]
+        return list(db.execute(stmt).all())
 
     def has_confirmed_booking_between(self, db: Session, driver_id: UUID, passenger_id: UUID) -> bool:
         stmt = (
@@ -17,6 +17,12 @@ class DeviceRepository:
         stmt = select(Device).where(Device.user_id == user_id)
         return list(db.execute(stmt).scalars().all())
 
+    def list_by_users(self, db: Session, user_ids) -> list[Device]:
+        if not user_ids:
+            return []
+        stmt = select(Device).where(Device.user_id.in_(list(user_ids)))
+        return list(db.execute(stmt).scalars().all())
+
     def create(self, db: Session, device: Device) -> Device:
         db.add(device)
         db.flush()
@@ -0,0 +1,102 @@
+"""Driver ledger repository."""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.constants import LedgerEntryType
+from app.models.booking import Booking
+from app.models.ledger import DriverBalance, DriverLedgerEntry
+from app.models.trip import Trip
+from app.utils.pagination import Cursor
+
+# Which running total each entry type moves; stored totals are positive
+_TOTAL_FOR = {
+    LedgerEntryType.EARNING: "total_earned",
+    LedgerEntryType.REFUND: "total_refunded",
+    LedgerEntryType.TRANSFER: "total_transferred",
+}
+
+
+class LedgerRepository:
+    def get_balance(self, db: Session, driver_id: UUID) -> DriverBalance | None:
+        return db.get(DriverBalance, driver_id)
+
+    def driver_for_booking(self, db: Session, booking_id: UUID) -> UUID | None:
+        stmt = select(Trip.driver_id).join(Booking, Booking.trip_id == Trip.id).where(Booking.id == booking_id)
+        return db.execute(stmt).scalar_one_or_none()
+
+    def append(
+        self,
+        db: Session,
+        driver_id: UUID,
+        entry_type: LedgerEntryType,
+        amount: float,
+        now: datetime,
+        payment_id: UUID | None = None,
+        payout_batch_id: UUID | None = None,
+    ) -> DriverLedgerEntry | None:
+        """Add an entry and move the driver's totals; returns None if the entry was already recorded.
+
+        The driver's balance row is created if missing (ON CONFLICT DO NOTHING,
+        so two first entries cannot race on the key) and then locked FOR UPDATE,
+        so concurrent entries for one driver are serialised and every running
+        balance is exact.
+        """
+        insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        db.execute(
+            insert(DriverBalance)
+            .values(
+                driver_id=driver_id, balance=0, total_earned=0, total_refunded=0, total_transferred=0, updated_at=now
+            )
+            .on_conflict_do_nothing(index_elements=[DriverBalance.driver_id])
+        )
+        balance = db.execute(
+            select(DriverBalance)
+            .where(DriverBalance.driver_id == driver_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalar_one()
+
+        source = (
+            DriverLedgerEntry.payment_id == payment_id
+            if payment_id is not None
+            else DriverLedgerEntry.payout_batch_id == payout_batch_id
+        )
+        existing = db.execute(
+            select(DriverLedgerEntry.id).where(DriverLedgerEntry.entry_type == entry_type, source)
+        ).first()
+        if existing:
+            return None
+
+        balance.balance = round(float(balance.balance) + amount, 2)
+        total = _TOTAL_FOR[entry_type]
+        setattr(balance, total, round(float(getattr(balance, total)) + abs(amount), 2))
+        balance.updated_at = now
+        entry = DriverLedgerEntry(
+            driver_id=driver_id,
+            entry_type=entry_type,
+            amount=amount,
+            balance=balance.balance,
+            payment_id=payment_id,
+            payout_batch_id=payout_batch_id,
+            created_at=now,
+        )
+        db.add_all([balance, entry])
+        db.flush()
+        return entry
+
+    def list_by_driver(
+        self, db: Session, driver_id: UUID, limit: int = 50, cursor: Cursor | None = None
+    ) -> list[DriverLedgerEntry]:
+        """Newest first, keyset-paged on (created_at, id) over ix_driver_ledger_driver_created."""
+        stmt = select(DriverLedgerEntry).where(DriverLedgerEntry.driver_id == driver_id)
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(DriverLedgerEntry.created_at, DriverLedgerEntry.id) < tuple_(cursor.created_at, cursor.id)
+            )
+        stmt = stmt.order_by(DriverLedgerEntry.created_at.desc(), DriverLedgerEntry.id.desc()).limit(limit)
+        return list(db.execute(stmt).scalars().all())
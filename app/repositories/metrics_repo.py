@@ -0,0 +1,156 @@
+"""Admin metrics repository — aggregate queries and precomputed snapshots."""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import case, func, select, true
+from sqlalchemy.orm import Session
+
+from app.core.constants import BookingStatus, PaymentStatus
+from app.models.booking import Booking
+from app.models.metrics import AdminMetricsSnapshot, DailyBookingStats, DailyRevenueStats
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class MetricsRepository:
+    def compute(self, db: Session, since: datetime | None, trips_window_start: datetime) -> dict:
+        """Every dashboard counter in one round trip: one CTE per table, cross-joined.
+
+        `since` bounds the period-scoped counters; `trips_window_start` bounds
+        trips_created_last_7_days, which ignores the period like before.
+        """
+        in_period = (lambda col: col >= since) if since is not None else (lambda col: true())
+
+        users = (
+            select(func.count(User.id).label("total_users"))
+            .where(in_period(User.created_at))
+            .cte("user_stats")
+        )
+        trips = (
+            select(
+                _count_where(in_period(Trip.created_at)).label("total_trips"),
+                _count_where(Trip.created_at >= trips_window_start).label("trips_created_last_7_days"),
+            )
+            .cte("trip_stats")
+        )
+        bookings = (
+            select(
+                func.count(Booking.id).label("total_bookings"),
+                _count_where(Booking.status == BookingStatus.CONFIRMED).label("confirmed_bookings"),
+                _count_where(Booking.status == BookingStatus.COMPLETED).label("completed_bookings"),
+            )
+            .where(in_period(Booking.created_at))
+            .cte("booking_stats")
+        )
+        payments = (
+            select(
+                func.coalesce(func.sum(Payment.amount), 0).label("total_revenue"),
+                func.coalesce(func.sum(Payment.platform_fee), 0).label("platform_fee_total"),
+            )
+            .where(Payment.status == PaymentStatus.SUCCEEDED, in_period(Payment.created_at))
+            .cte("payment_stats")
+        )
+        repeat_passengers = (
+            select(Booking.passenger_id)
+            .where(Booking.status == BookingStatus.COMPLETED)
+            .group_by(Booking.passenger_id)
+            .having(func.count(Booking.id) >= 2)
+            .subquery()
+        )
+        repeat = select(func.count().label("repeat_users")).select_from(repeat_passengers).cte("repeat_stats")
+
+        stmt = select(
+            users.c.total_users,
+            trips.c.total_trips,
+            trips.c.trips_created_last_7_days,
+            bookings.c.total_bookings,
+            bookings.c.confirmed_bookings,
+            bookings.c.completed_bookings,
+            payments.c.total_revenue,
+            payments.c.platform_fee_total,
+            repeat.c.repeat_users,
+        ).select_from(
+            users.join(trips, true()).join(bookings, true()).join(payments, true()).join(repeat, true())
+        )
+        row = db.execute(stmt).one()
+        return {
+            "total_users": int(row.total_users),
+            "total_trips": int(row.total_trips),
+            "trips_created_last_7_days": int(row.trips_created_last_7_days),
+            "total_bookings": int(row.total_bookings),
+            "confirmed_bookings": int(row.confirmed_bookings),
+            "completed_bookings": int(row.completed_bookings),
+            "total_revenue": float(row.total_revenue),
+            "platform_fee_total": float(row.platform_fee_total),
+            "repeat_users": int(row.repeat_users),
+        }
+
+    def get_snapshot(self, db: Session, period: str) -> AdminMetricsSnapshot | None:
+        return db.get(AdminMetricsSnapshot, period)
+
+    def save_snapshot(self, db: Session, period: str, payload: dict, computed_at: datetime) -> AdminMetricsSnapshot:
+        snapshot = db.get(AdminMetricsSnapshot, period)
+        if snapshot is None:
+            snapshot = AdminMetricsSnapshot(period=period)
+        snapshot.payload = payload
+        snapshot.computed_at = computed_at
+        db.add(snapshot)
+        db.flush()
+        return snapshot
+
+    # ── daily rollups ──────────────────────────────────────────────────────────
+
+    def refresh_daily_stats(self, db: Session, day: date) -> None:
+        """Recompute one UTC day of daily_booking_stats / daily_revenue_stats from raw rows."""
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        end = start + timedelta(days=1)
+        booking_count = db.execute(
+            select(func.count(Booking.id)).where(Booking.created_at >= start, Booking.created_at < end)
+        ).scalar_one()
+        revenue = db.execute(
+            select(
+                func.count(Payment.id).label("payment_count"),
+                func.coalesce(func.sum(Payment.amount), 0).label("revenue"),
+                func.coalesce(func.sum(Payment.platform_fee), 0).label("platform_fees"),
+            ).where(
+                Payment.status == PaymentStatus.SUCCEEDED,
+                Payment.created_at >= start,
+                Payment.created_at < end,
+            )
+        ).one()
+
+        now = datetime.now(timezone.utc)
+        booking_row = db.get(DailyBookingStats, day) or DailyBookingStats(day=day)
+        booking_row.booking_count = int(booking_count)
+        booking_row.updated_at = now
+        revenue_row = db.get(DailyRevenueStats, day) or DailyRevenueStats(day=day)
+        revenue_row.payment_count = int(revenue.payment_count)
+        revenue_row.revenue = revenue.revenue
+        revenue_row.platform_fees = revenue.platform_fees
+        revenue_row.updated_at = now
+        db.add_all([booking_row, revenue_row])
+        db.flush()
+
+    def last_rolled_up_day(self, db: Session) -> date | None:
+        return db.execute(select(func.max(DailyRevenueStats.day))).scalar_one_or_none()
+
+    def bookings_timeseries(self, db: Session, since: date) -> list[dict]:
+        stmt = (
+            select(DailyBookingStats.day, DailyBookingStats.booking_count)
+            .where(DailyBookingStats.day >= since)
+            .order_by(DailyBookingStats.day)
+        )
+        return [{"date": str(row.day), "value": int(row.booking_count)} for row in db.execute(stmt).all()]
+
+    def revenue_timeseries(self, db: Session, since: date) -> list[dict]:
+        stmt = (
+            select(DailyRevenueStats.day, DailyRevenueStats.revenue)
+            .where(DailyRevenueStats.day >= since)
+            .order_by(DailyRevenueStats.day)
+        )
+        return [{"date": str(row.day), "value": float(row.revenue)} for row in db.execute(stmt).all()]
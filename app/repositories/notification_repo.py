@@ -2,10 +2,11 @@
 
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationArchive
+from app.utils.pagination import Cursor
 
 
 class NotificationRepository:
@@ -27,21 +28,70 @@ class NotificationRepository:
         )
         return result.rowcount
 
-    def list_by_user(self, db: Session, user_id: UUID, limit: int = 50, offset: int = 0) -> list[Notification]:
-        stmt = (
-            select(Notification)
-            .where(Notification.user_id == user_id)
-            .order_by(Notification.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
+    def list_by_user(
+        self,
+        db: Session,
+        user_id: UUID,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Cursor | None = None,
+    ) -> list[Notification]:
+        """Newest first. Pass `cursor` for keyset paging — cost stays flat however
+        deep the client scrolls; `offset` is kept for older clients."""
+        stmt = select(Notification).where(Notification.user_id == user_id)
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(Notification.created_at, Notification.id) < tuple_(cursor.created_at, cursor.id)
+            )
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
+    def archive_older_than(self, db: Session, cutoff, limit: int = 1000) -> int:
+        """Move up to `limit` notifications created before `cutoff` into the archive."""
+        ids = list(
+            db.execute(
+                select(Notification.id)
+                .where(Notification.created_at < cutoff)
+                .order_by(Notification.created_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+        )
+        if not ids:
+            return 0
+        columns = ["id", "user_id", "notification_type", "title", "body", "is_read", "data", "created_at"]
+        db.execute(
+            insert(NotificationArchive).from_select(
+                columns,
+                select(*(getattr(Notification, c) for c in columns)).where(Notification.id.in_(ids)),
+            )
+        )
+        db.execute(
+            delete(Notification).where(Notification.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        return len(ids)
+
+    def purge_archive_older_than(self, db: Session, cutoff, limit: int = 1000) -> int:
+        ids = select(NotificationArchive.id).where(NotificationArchive.archived_at < cutoff).limit(limit)
+        result = db.execute(
+            delete(NotificationArchive)
+            .where(NotificationArchive.id.in_(ids.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     def create(self, db: Session, notification: Notification) -> Notification:
         db.add(notification)
         db.flush()
         return notification
 
+    def create_many(self, db: Session, notifications: list[Notification]) -> list[Notification]:
+        db.add_all(notifications)
+        db.flush()
+        return notifications
+
     def update(self, db: Session, notification: Notification) -> Notification:
         db.add(notification)
         db.flush()
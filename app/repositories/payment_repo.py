@@ -1,15 +1,16 @@
 """Payment repository."""
 
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from sqlalchemy import cast, Date, func, select
+from sqlalchemy import func, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
 from app.core.constants import PaymentStatus
 from app.models.payment import Payment
 from app.models.booking import Booking
 from app.models.trip import Trip
+from app.utils.pagination import Cursor
 
 
 class PaymentRepository:
@@ -20,6 +21,32 @@ class PaymentRepository:
         stmt = select(Payment).where(Payment.booking_id == booking_id)
         return db.execute(stmt).scalar_one_or_none()
 
+    def list_by_booking_ids(self, db: Session, booking_ids: list[UUID]) -> dict[UUID, Payment]:
+        """Payments for many bookings in one IN query, keyed by booking_id."""
+        if not booking_ids:
+            return {}
+        stmt = select(Payment).where(Payment.booking_id.in_(booking_ids))
+        return {payment.booking_id: payment for payment in db.execute(stmt).scalars()}
+
+    def list_by_intent_ids(self, db: Session, intent_ids: list[str]) -> dict[str, Payment]:
+        """Payments for many Stripe PaymentIntents in one IN query, keyed by intent id."""
+        if not intent_ids:
+            return {}
+        stmt = select(Payment).where(Payment.stripe_payment_intent_id.in_(intent_ids))
+        return {payment.stripe_payment_intent_id: payment for payment in db.execute(stmt).scalars()}
+
+    def set_status_bulk(self, db: Session, payment_ids: list[UUID], status: PaymentStatus) -> int:
+        """One UPDATE for many payments; returns the number of rows changed."""
+        if not payment_ids:
+            return 0
+        stmt = (
+            update(Payment)
+            .where(Payment.id.in_(payment_ids))
+            .values(status=status)
+            .execution_options(synchronize_session="fetch")
+        )
+        return db.execute(stmt).rowcount
+
     def create(self, db: Session, payment: Payment) -> Payment:
         db.add(payment)
         db.flush()
@@ -43,30 +70,30 @@ class PaymentRepository:
         stmt = stmt.order_by(Payment.created_at.desc()).offset(offset).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
-    def revenue_timeseries(self, db: Session, days: int = 7) -> list[dict]:
-        """Daily revenue for the last N days."""
-        from app.utils.datetime import now_utc
-        since = now_utc() - timedelta(days=days)
-        stmt = (
-            select(
-                cast(Payment.created_at, Date).label("date"),
-                func.coalesce(func.sum(Payment.amount), 0).label("value"),
-            )
-            .where(Payment.status == PaymentStatus.SUCCEEDED, Payment.created_at >= since)
-            .group_by(cast(Payment.created_at, Date))
-            .order_by(cast(Payment.created_at, Date))
-        )
-        rows = db.execute(stmt).all()
-        return [{"date": str(row.date), "value": float(row.value)} for row in rows]
+    def claim_pending_intents(self, db: Session, now: datetime, stale_before: datetime, limit: int = 500) -> list[UUID]:
+        """Mark up to `limit` payments still missing a PaymentIntent as in flight and return their ids.
 
-    def list_pending_intents(self, db: Session, limit: int = 50) -> list[Payment]:
-        stmt = (
-            select(Payment)
+        One UPDATE ... RETURNING over a SKIP LOCKED subselect, so concurrent
+        sweeps never claim the same row. Claims older than `stale_before`
+        (the worker never finished) are taken again.
+        """
+        pending_ids = (
+            select(Payment.id)
             .where(
                 Payment.stripe_payment_intent_id.is_(None),
                 Payment.status == PaymentStatus.REQUIRES_PAYMENT_METHOD,
+                or_(Payment.intent_claimed_at.is_(None), Payment.intent_claimed_at < stale_before),
             )
+            .order_by(Payment.created_at)
             .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Payment)
+            .where(Payment.id.in_(pending_ids.scalar_subquery()))
+            .values(intent_claimed_at=now)
+            .returning(Payment.id)
+            .execution_options(synchronize_session=False)
         )
         return list(db.execute(stmt).scalars().all())
 
@@ -82,47 +109,42 @@ class PaymentRepository:
             stmt = stmt.where(Payment.created_at >= since)
         return float(db.execute(stmt).scalar_one())
 
-    def list_payouts_by_driver(self, db: Session, driver_id: UUID) -> list[Payment]:
-        """All payments for trips driven by this driver, ordered newest first."""
+    def list_payouts_by_driver(
+        self, db: Session, driver_id: UUID, limit: int = 50, cursor: Cursor | None = None
+    ) -> list[Payment]:
+        """Payments for trips driven by this driver, newest first, keyset-paged on (created_at, id)."""
         stmt = (
             select(Payment)
             .join(Booking, Booking.id == Payment.booking_id)
             .join(Trip, Trip.id == Booking.trip_id)
             .where(Trip.driver_id == driver_id)
-            .order_by(Payment.created_at.desc())
-        )
-        return list(db.execute(stmt).scalars().all())
-
-    def list_unpaid_by_driver(self, db: Session, driver_id: UUID) -> list[Payment]:
-        """Payments that succeeded but haven't been transferred to the driver yet."""
-        stmt = (
-            select(Payment)
-            .join(Booking, Booking.id == Payment.booking_id)
-            .join(Trip, Trip.id == Booking.trip_id)
-            .where(
-                Trip.driver_id == driver_id,
-                Payment.status == PaymentStatus.SUCCEEDED,
-                Payment.stripe_transfer_id.is_(None),
-            )
         )
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Payment.created_at, Payment.id) < tuple_(cursor.created_at, cursor.id))
+        stmt = stmt.order_by(Payment.created_at.desc(), Payment.id.desc()).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
-    def list_by_passenger_between(
+    def list_by_payer(
         self,
         db: Session,
-        passenger_id: UUID,
+        payer_id: UUID,
         start: datetime,
         end: datetime,
+        limit: int = 50,
+        cursor: Cursor | None = None,
     ) -> list[Payment]:
-        stmt = (
-            select(Payment)
-            .join(Booking, Booking.id == Payment.booking_id)
-            .where(
-                Booking.passenger_id == passenger_id,
-                Payment.created_at >= start,
-                Payment.created_at <= end,
-                Payment.status == PaymentStatus.SUCCEEDED,
-            )
-            .order_by(Payment.created_at.desc())
+        """Succeeded payments made by the passenger, newest first, keyset-paged on (created_at, id).
+
+        Reads ix_payments_payer_created directly, so a page costs the same however
+        long the passenger's history is.
+        """
+        stmt = select(Payment).where(
+            Payment.payer_id == payer_id,
+            Payment.created_at >= start,
+            Payment.created_at <= end,
+            Payment.status == PaymentStatus.SUCCEEDED,
         )
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Payment.created_at, Payment.id) < tuple_(cursor.created_at, cursor.id))
+        stmt = stmt.order_by(Payment.created_at.desc(), Payment.id.desc()).limit(limit)
         return list(db.execute(stmt).scalars().all())
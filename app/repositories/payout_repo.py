@@ -0,0 +1,105 @@
+"""Payout batch repository."""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.constants import BookingStatus, PaymentStatus, PayoutBatchStatus
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.payout import PayoutBatch
+from app.models.trip import Trip
+from app.models.user import User
+
+
+def _unpaid_for_driver(driver_id: UUID):
+    """Succeeded payments on the driver's completed bookings that no transfer or batch covers yet."""
+    bookings = (
+        select(Booking.id)
+        .join(Trip, Trip.id == Booking.trip_id)
+        .where(Trip.driver_id == driver_id, Booking.status == BookingStatus.COMPLETED)
+    )
+    return (
+        Payment.booking_id.in_(bookings),
+        Payment.status == PaymentStatus.SUCCEEDED,
+        Payment.stripe_transfer_id.is_(None),
+        Payment.payout_batch_id.is_(None),
+    )
+
+
+class PayoutRepository:
+    def get_by_id(self, db: Session, batch_id: UUID) -> PayoutBatch | None:
+        return db.get(PayoutBatch, batch_id)
+
+    def create(self, db: Session, batch: PayoutBatch) -> PayoutBatch:
+        db.add(batch)
+        db.flush()
+        return batch
+
+    def update(self, db: Session, batch: PayoutBatch) -> PayoutBatch:
+        db.add(batch)
+        db.flush()
+        return batch
+
+    def list_drivers_with_unpaid(self, db: Session, limit: int) -> list[UUID]:
+        """Drivers with a connected account and unpaid earnings on completed bookings, longest-waiting first."""
+        stmt = (
+            select(Trip.driver_id)
+            .join(Booking, Booking.trip_id == Trip.id)
+            .join(Payment, Payment.booking_id == Booking.id)
+            .join(User, User.id == Trip.driver_id)
+            .where(
+                User.payment_details.is_not(None),
+                Booking.status == BookingStatus.COMPLETED,
+                Payment.status == PaymentStatus.SUCCEEDED,
+                Payment.stripe_transfer_id.is_(None),
+                Payment.payout_batch_id.is_(None),
+            )
+            .group_by(Trip.driver_id)
+            .order_by(func.min(Payment.created_at))
+            .limit(limit)
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    def list_stale_pending(self, db: Session, created_before: datetime) -> list[PayoutBatch]:
+        stmt = (
+            select(PayoutBatch)
+            .where(PayoutBatch.status == PayoutBatchStatus.PENDING, PayoutBatch.created_at < created_before)
+            .order_by(PayoutBatch.created_at)
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    def claim_unpaid_for_driver(self, db: Session, driver_id: UUID, batch_id: UUID) -> list[tuple[UUID, float]]:
+        """Attach the driver's unpaid payments to the batch in one UPDATE; returns (id, payout_amount) pairs.
+
+        The payout_batch_id IS NULL guard means two concurrent batchers can never claim the same payment.
+        """
+        stmt = (
+            update(Payment)
+            .where(*_unpaid_for_driver(driver_id))
+            .values(payout_batch_id=batch_id)
+            .returning(Payment.id, Payment.payout_amount)
+            .execution_options(synchronize_session=False)
+        )
+        return [(row.id, float(row.payout_amount)) for row in db.execute(stmt)]
+
+    def mark_transferred(self, db: Session, batch_id: UUID, transfer_id: str) -> int:
+        stmt = (
+            update(Payment)
+            .where(Payment.payout_batch_id == batch_id)
+            .values(stripe_transfer_id=transfer_id)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).rowcount
+
+    def release(self, db: Session, batch_id: UUID) -> int:
+        """Detach a failed batch's payments so the next run can claim them again."""
+        stmt = (
+            update(Payment)
+            .where(Payment.payout_batch_id == batch_id, Payment.stripe_transfer_id.is_(None))
+            .values(payout_batch_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).rowcount
@@ -0,0 +1,35 @@
+"""Stored object repository."""
+
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.stored_object import StoredObject
+
+
+class StoredObjectRepository:
+    def get_by_id(self, db: Session, stored_object_id: UUID) -> StoredObject | None:
+        return db.get(StoredObject, stored_object_id)
+
+    def get_by_hash(self, db: Session, owner_id: UUID, folder: str, sha256: str) -> StoredObject | None:
+        stmt = select(StoredObject).where(
+            StoredObject.owner_id == owner_id,
+            StoredObject.folder == folder,
+            StoredObject.sha256 == sha256,
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+    def get_by_url(self, db: Session, owner_id: UUID, url: str) -> StoredObject | None:
+        stmt = select(StoredObject).where(StoredObject.owner_id == owner_id, StoredObject.url == url)
+        return db.execute(stmt).scalars().first()
+
+    def create(self, db: Session, stored: StoredObject) -> StoredObject:
+        db.add(stored)
+        db.flush()
+        return stored
+
+    def update(self, db: Session, stored: StoredObject) -> StoredObject:
+        db.add(stored)
+        db.flush()
+        return stored
@@ -16,6 +16,12 @@ class TripRepository:
         stmt = select(Trip).options(selectinload(Trip.driver)).where(Trip.id == trip_id)
         return db.execute(stmt).scalar_one_or_none()
 
+    def list_by_ids(self, db: Session, trip_ids) -> list[Trip]:
+        if not trip_ids:
+            return []
+        stmt = select(Trip).where(Trip.id.in_(list(trip_ids)))
+        return list(db.execute(stmt).scalars().all())
+
     def get_by_id_for_update(self, db: Session, trip_id: UUID) -> Trip | None:
         stmt = select(Trip).where(Trip.id == trip_id).with_for_update()
         return db.execute(stmt).scalar_one_or_none()
@@ -1,17 +1,26 @@
 """User repository."""
 
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from app.core.constants import LicenceOcrStatus
 from app.models.user import User
+from app.utils.pagination import Cursor
 
 
 class UserRepository:
     def get_by_id(self, db: Session, user_id: UUID) -> User | None:
         return db.get(User, user_id)
 
+    def list_by_ids(self, db: Session, user_ids) -> list[User]:
+        if not user_ids:
+            return []
+        stmt = select(User).where(User.id.in_(list(user_ids)))
+        return list(db.execute(stmt).scalars().all())
+
     def get_by_email(self, db: Session, email: str) -> User | None:
         stmt = select(User).where(User.email == email)
         return db.execute(stmt).scalar_one_or_none()
@@ -29,8 +38,39 @@ class UserRepository:
         search: str | None = None,
         role: str | None = None,
         verification_status: str | None = None,
+        sort: str = "newest",
+        cursor: Cursor | None = None,
     ) -> list[User]:
-        stmt = select(User)
+        """Filtered users ordered by signup time ("newest" or "oldest").
+
+        Pass `cursor` for keyset paging; `offset` is ignored when it is set.
+        """
+        stmt = self._filtered(select(User), search, role, verification_status)
+        key = tuple_(User.created_at, User.id)
+        if sort == "oldest":
+            if cursor is not None:
+                stmt = stmt.where(key > tuple_(cursor.created_at, cursor.id))
+            stmt = stmt.order_by(User.created_at.asc(), User.id.asc())
+        else:
+            if cursor is not None:
+                stmt = stmt.where(key < tuple_(cursor.created_at, cursor.id))
+            stmt = stmt.order_by(User.created_at.desc(), User.id.desc())
+        if cursor is None:
+            stmt = stmt.offset(offset)
+        return list(db.execute(stmt.limit(limit)).scalars().all())
+
+    def count_matching(
+        self,
+        db: Session,
+        search: str | None = None,
+        role: str | None = None,
+        verification_status: str | None = None,
+    ) -> int:
+        stmt = self._filtered(select(func.count(User.id)), search, role, verification_status)
+        return int(db.execute(stmt).scalar_one())
+
+    @staticmethod
+    def _filtered(stmt, search: str | None, role: str | None, verification_status: str | None):
         if search:
             term = f"%{search}%"
             stmt = stmt.where(
@@ -44,8 +84,21 @@ class UserRepository:
             stmt = stmt.where(User.role == role)
         if verification_status:
             stmt = stmt.where(User.identity_verification_status == verification_status)
-        stmt = stmt.offset(offset).limit(limit)
-        return list(db.execute(stmt).scalars().all())
+        return stmt
+
+    def set_photo_variants(self, db: Session, user_id: UUID, kind: str, source_url: str, variants: dict) -> bool:
+        """Record variants only if the photo they were built from is still current."""
+        url_column, variants_column = (
+            (User.profile_photo_url, "profile_photo_variants") if kind == "avatar"
+            else (User.vehicle_photo_url, "vehicle_photo_variants")
+        )
+        result = db.execute(
+            update(User)
+            .where(User.id == user_id, url_column == source_url)
+            .values({variants_column: variants})
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
 
     def count_users(self, db: Session, since=None) -> int:
         stmt = select(func.count(User.id))
@@ -53,17 +106,59 @@ class UserRepository:
             stmt = stmt.where(User.created_at >= since)
         return int(db.execute(stmt).scalar_one())
 
-    def list_pending_verifications(self, db: Session, limit: int = 50, offset: int = 0) -> list[User]:
+    def count_pending_verifications(self, db: Session) -> int:
         from app.core.constants import IdentityVerificationStatus
+        stmt = select(func.count(User.id)).where(
+            User.identity_verification_status == IdentityVerificationStatus.PENDING
+        )
+        return int(db.execute(stmt).scalar_one())
+
+    def list_pending_verifications(
+        self,
+        db: Session,
+        limit: int = 50,
+        offset: int = 0,
+        licence_ocr_status: LicenceOcrStatus | None = None,
+    ) -> list[User]:
+        from app.core.constants import IdentityVerificationStatus
+        stmt = select(User).where(User.identity_verification_status == IdentityVerificationStatus.PENDING)
+        if licence_ocr_status:
+            stmt = stmt.where(User.licence_ocr_status == licence_ocr_status)
         stmt = (
-            select(User)
-            .where(User.identity_verification_status == IdentityVerificationStatus.PENDING)
+            stmt
             .order_by(User.updated_at.asc())
             .offset(offset)
             .limit(limit)
         )
         return list(db.execute(stmt).scalars().all())
 
+    def list_licence_ocr_backlog(self, db: Session, submitted_before: datetime, limit: int) -> list[User]:
+        """Pending verifications whose licence photo has never been OCR-checked, oldest first."""
+        from app.core.constants import IdentityVerificationStatus
+        stmt = (
+            select(User)
+            .where(
+                User.identity_verification_status == IdentityVerificationStatus.PENDING,
+                User.driver_license_url.is_not(None),
+                User.licence_ocr_checked_at.is_(None),
+                User.updated_at < submitted_before,
+            )
+            .order_by(User.updated_at.asc(), User.id.asc())
+            .limit(limit)
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    def increment_trips_completed(self, db: Session, user_ids) -> int:
+        """Bump trips_completed by one for each user in a single UPDATE."""
+        if not user_ids:
+            return 0
+        result = db.execute(
+            update(User)
+            .where(User.id.in_(list(user_ids)))
+            .values(trips_completed=User.trips_completed + 1)
+        )
+        return result.rowcount
+
     def update(self, db: Session, user: User) -> User:
         db.add(user)
         db.flush()
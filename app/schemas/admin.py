@@ -1,5 +1,7 @@
 """Admin schemas."""
 
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 
@@ -25,3 +27,4 @@ class AdminMetricsResponse(BaseModel):
     trip_completion_rate: float
     repeat_users: int
     period: str = "all"
+    computed_at: datetime | None = None
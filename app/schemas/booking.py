@@ -35,6 +35,7 @@ class PassengerSummary(BaseModel):
     first_name: str | None = None
     last_name: str | None = None
     profile_photo_url: str | None = None
+    profile_photo_variants: dict[str, dict[str, str]] | None = None
     rating_avg: float = 0
     rating_count: int = 0
 
@@ -46,6 +47,7 @@ class DriverSummary(BaseModel):
     first_name: str | None = None
     last_name: str | None = None
     profile_photo_url: str | None = None
+    profile_photo_variants: dict[str, dict[str, str]] | None = None
     rating_avg: float = 0
     rating_count: int = 0
 
@@ -4,7 +4,7 @@ from datetime import date, datetime
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 
-from app.core.constants import PaymentStatus
+from app.core.constants import LedgerEntryType, PaymentStatus
 
 
 class PaymentIntentCreate(BaseModel):
@@ -93,3 +93,24 @@ class ConnectBalanceResponse(BaseModel):
     available: float
     pending: float
     currency: str
+
+
+class DriverEarningsResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    balance: float
+    total_earned: float
+    total_refunded: float
+    total_transferred: float
+
+
+class LedgerEntryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    entry_type: LedgerEntryType
+    amount: float
+    balance: float
+    payment_id: UUID | None = None
+    payout_batch_id: UUID | None = None
+    created_at: datetime
@@ -5,7 +5,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, computed_field, model_validator
 
-from app.core.constants import ChatPreference, Gender, IdentityVerificationStatus, LuggageSize, SmokingPreference, UserRole
+from app.core.constants import ChatPreference, Gender, IdentityVerificationStatus, LicenceOcrStatus, LuggageSize, SmokingPreference, UserRole
 
 
 class UserBase(BaseModel):
@@ -79,6 +79,8 @@ class UserPublicResponse(UserBase):
     is_email_verified: bool = False
     is_phone_verified: bool = False
     identity_verified: bool = False
+    profile_photo_variants: dict[str, dict[str, str]] | None = None
+    vehicle_photo_variants: dict[str, dict[str, str]] | None = None
 
     @computed_field
     @property
@@ -109,6 +111,7 @@ class UserPrivateResponse(UserPublicResponse):
     driver_license_back_url: str | None = None
     driver_license_number: str | None = None
     identity_verification_status: IdentityVerificationStatus | None = None
+    licence_ocr_status: LicenceOcrStatus | None = None
     vehicle_plate_verified: bool = False
     vehicle_plate_verified_at: datetime | None = None
     created_at: datetime
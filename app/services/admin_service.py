@@ -1,16 +1,19 @@
 """Admin service."""
 
-from datetime import timedelta
+from datetime import date, datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 
-from app.core.constants import BookingStatus
+from app.core.constants import ADMIN_METRICS_PERIODS, ADMIN_METRICS_SNAPSHOT_MAX_AGE_SECONDS
 from app.models.user import User
+from app.repositories.activity_repo import ActivityRepository
 from app.repositories.booking_repo import BookingRepository
+from app.repositories.metrics_repo import MetricsRepository
 from app.repositories.payment_repo import PaymentRepository
 from app.repositories.trip_repo import TripRepository
 from app.repositories.user_repo import UserRepository
-from app.utils.datetime import now_utc
+from app.utils.datetime import ensure_utc, now_utc
+from app.utils.pagination import decode_cursor, next_cursor
 
 
 class AdminService:
@@ -20,47 +23,107 @@ class AdminService:
         trip_repo: TripRepository,
         booking_repo: BookingRepository,
         payment_repo: PaymentRepository,
+        metrics_repo: MetricsRepository | None = None,
+        activity_repo: ActivityRepository | None = None,
     ) -> None:
         self.user_repo = user_repo
         self.trip_repo = trip_repo
         self.booking_repo = booking_repo
         self.payment_repo = payment_repo
+        self.metrics_repo = metrics_repo or MetricsRepository()
+        self.activity_repo = activity_repo or ActivityRepository()
 
     def get_metrics(self, db: Session, actor: User, period: str = "all") -> dict:
+        """Dashboard metrics, read from the beat-refreshed snapshot when it is fresh."""
         if not actor.is_admin:
             raise ValueError("Admin privileges required")
 
-        # Compute since cutoff based on period
-        since = None
-        if period == "today":
-            from datetime import date, datetime, timezone
-            today = date.today()
-            since = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
-        elif period == "7d":
-            since = now_utc() - timedelta(days=7)
-        elif period == "30d":
-            since = now_utc() - timedelta(days=30)
-
-        total_users = self.user_repo.count_users(db, since=since)
-        total_trips = self.trip_repo.count_trips(db, since=since)
-        confirmed_bookings = self.booking_repo.count_by_status(db, BookingStatus.CONFIRMED, since=since)
-        completed_bookings = self.booking_repo.count_by_status(db, BookingStatus.COMPLETED, since=since)
-        total_bookings = self.booking_repo.count_all(db, since=since)
-        total_revenue = self.payment_repo.sum_total_revenue(db, since=since)
-        platform_fee_total = self.payment_repo.sum_platform_fees(db, since=since)
-        trips_created_last_7_days = self.trip_repo.count_created_since(db, now_utc() - timedelta(days=7))
-        booking_conversion_rate = confirmed_bookings / total_bookings if total_bookings else 0.0
-        trip_completion_rate = completed_bookings / confirmed_bookings if confirmed_bookings else 0.0
-        repeat_users = self.booking_repo.count_repeat_users(db)
+        key = period if period in ADMIN_METRICS_PERIODS else "all"
+        snapshot = self.metrics_repo.get_snapshot(db, key)
+        if snapshot is not None:
+            age = (now_utc() - ensure_utc(snapshot.computed_at)).total_seconds()
+            if age <= ADMIN_METRICS_SNAPSHOT_MAX_AGE_SECONDS:
+                return {**snapshot.payload, "period": period, "computed_at": ensure_utc(snapshot.computed_at)}
+        return {**self.compute_metrics(db, key), "period": period, "computed_at": now_utc()}
+
+    def compute_metrics(self, db: Session, period: str = "all") -> dict:
+        since = self._period_start(period)
+        counts = self.metrics_repo.compute(db, since=since, trips_window_start=now_utc() - timedelta(days=7))
+        total_bookings = counts["total_bookings"]
+        confirmed_bookings = counts["confirmed_bookings"]
+        completed_bookings = counts["completed_bookings"]
         return {
-            "total_users": total_users,
-            "total_trips": total_trips,
+            "total_users": counts["total_users"],
+            "total_trips": counts["total_trips"],
             "confirmed_bookings": confirmed_bookings,
-            "total_revenue": total_revenue,
-            "platform_fee_total": platform_fee_total,
-            "trips_created_last_7_days": trips_created_last_7_days,
-            "booking_conversion_rate": booking_conversion_rate,
-            "trip_completion_rate": trip_completion_rate,
-            "repeat_users": repeat_users,
-            "period": period,
+            "total_revenue": counts["total_revenue"],
+            "platform_fee_total": counts["platform_fee_total"],
+            "trips_created_last_7_days": counts["trips_created_last_7_days"],
+            "booking_conversion_rate": confirmed_bookings / total_bookings if total_bookings else 0.0,
+            "trip_completion_rate": completed_bookings / confirmed_bookings if confirmed_bookings else 0.0,
+            "repeat_users": counts["repeat_users"],
         }
+
+    def refresh_metric_snapshots(self, db: Session) -> None:
+        """Recompute every dashboard period into admin_metrics_snapshots."""
+        for period in ADMIN_METRICS_PERIODS:
+            computed_at = now_utc()
+            self.metrics_repo.save_snapshot(db, period, self.compute_metrics(db, period), computed_at)
+
+    def bookings_timeseries(self, db: Session, days: int) -> list[dict]:
+        return self.metrics_repo.bookings_timeseries(db, since=now_utc().date() - timedelta(days=days))
+
+    def revenue_timeseries(self, db: Session, days: int) -> list[dict]:
+        return self.metrics_repo.revenue_timeseries(db, since=now_utc().date() - timedelta(days=days))
+
+    def refresh_daily_stats(self, db: Session, days_back: int = 1) -> None:
+        """Recompute today's rollups plus `days_back` earlier days.
+
+        Yesterday is included so late writes around midnight are picked up. If
+        the last rolled-up day is older than that (beat was down), every day
+        since it is recomputed too, so missed runs catch up.
+        """
+        today = now_utc().date()
+        start = today - timedelta(days=days_back)
+        last = self.metrics_repo.last_rolled_up_day(db)
+        if last is not None and last < start:
+            start = last
+        for offset in range((today - start).days + 1):
+            self.metrics_repo.refresh_daily_stats(db, start + timedelta(days=offset))
+
+    def activity_feed(self, db: Session, limit: int = 20, cursor: str | None = None) -> tuple[list[dict], str | None]:
+        """Recent platform events, newest first, plus the cursor for the next page."""
+        rows = self.activity_repo.list_recent(db, limit=limit, cursor=decode_cursor(cursor))
+        events = [self._format_event(row) for row in rows]
+        return events, next_cursor(rows, limit)
+
+    @staticmethod
+    def _format_event(row) -> dict:
+        name = f"{row.first_name or ''} {row.last_name or ''}".strip() or row.email
+        if row.kind == "signup":
+            message, detail = name, f"New user registered ({row.email})"
+        elif row.kind == "verification_pending":
+            message, detail = name, "Submitted identity for verification"
+        elif row.kind == "booking":
+            message = f"Booking {str(row.id)[:8]}"
+            detail = f"Booking {row.status.lower()} — £{float(row.amount):.2f}"
+        else:
+            message = f"Payment £{float(row.amount):.2f}"
+            detail = f"Payment succeeded for booking {str(row.ref_id)[:8]}"
+        return {
+            "type": row.kind,
+            "message": message,
+            "detail": detail,
+            "timestamp": ensure_utc(row.created_at).isoformat(),
+        }
+
+    @staticmethod
+    def _period_start(period: str) -> datetime | None:
+        if period == "today":
+            today = date.today()
+            return datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+        if period == "7d":
+            return now_utc() - timedelta(days=7)
+        if period == "30d":
+            return now_utc() - timedelta(days=30)
+        return None
@@ -6,6 +6,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.core.constants import BookingStatus, NotificationType
+from app.core.database import run_after_commit
 from app.models.booking import Booking
 from app.models.user import User
 from app.repositories.booking_repo import BookingRepository
@@ -36,44 +37,29 @@ class BookingService:
         self.payment_service = payment_service
 
     def _handle_completion(self, db: Session, booking: Booking, trip) -> None:
-        passenger = self.user_repo.get_by_id(db, booking.passenger_id)
-        driver = self.user_repo.get_by_id(db, trip.driver_id)
+        participants = {u.id: u for u in self.user_repo.list_by_ids(db, {booking.passenger_id, trip.driver_id})}
+        self.user_repo.increment_trips_completed(db, participants.keys())
         departure_time = trip.departure_time.isoformat()
-        if passenger:
-            passenger.trips_completed += 1
-            self.user_repo.update(db, passenger)
-            self.email_service.send_trip_completed_email(
-                passenger.email,
-                passenger.first_name or "Passenger",
-                trip.origin_city,
-                trip.destination_city,
-                departure_time,
-            )
-            self.notification_service.create_notification(
-                db,
-                passenger.id,
-                NotificationType.TRIP_COMPLETED,
-                "Trip completed",
-                f"Your trip from {trip.origin_city} to {trip.destination_city} is completed.",
-            )
-        if driver:
-            driver.trips_completed += 1
-            self.user_repo.update(db, driver)
+        for user_id, fallback_name in ((booking.passenger_id, "Passenger"), (trip.driver_id, "Driver")):
+            user = participants.get(user_id)
+            if not user:
+                continue
             self.email_service.send_trip_completed_email(
-                driver.email,
-                driver.first_name or "Driver",
+                user.email,
+                user.first_name or fallback_name,
                 trip.origin_city,
                 trip.destination_city,
                 departure_time,
             )
             self.notification_service.create_notification(
                 db,
-                driver.id,
+                user.id,
                 NotificationType.TRIP_COMPLETED,
                 "Trip completed",
                 f"Your trip from {trip.origin_city} to {trip.destination_city} is completed.",
             )
-        self.payment_service.trigger_payout_background(booking.id)
+        booking_id = booking.id
+        run_after_commit(db, lambda: self.payment_service.trigger_payout_background(booking_id))
 
     def _handle_cancellation(self, db: Session, booking: Booking, trip, actor: User) -> None:
         self.payment_service.refund_for_cancellation(db, booking.id, trip.departure_time)
@@ -329,37 +315,41 @@ class BookingService:
                     )
         return updated
 
-    def cancel_expired_pending_payments(self, db: Session) -> int:
-        """Cancel PENDING_PAYMENT bookings whose payment_deadline has passed."""
-        expired = self.booking_repo.list_expired_pending_payments(db, now_utc())
-        count = 0
-        for booking in expired:
-            booking.status = BookingStatus.CANCELLED
-            self.booking_repo.update(db, booking)
-            trip = self.trip_repo.get_by_id(db, booking.trip_id)
+    def cancel_expired_pending_payments(self, db: Session, limit: int = 500) -> int:
+        """Cancel one chunk of PENDING_PAYMENT bookings whose payment_deadline has passed.
+
+        The caller commits after each chunk and repeats while a full chunk comes
+        back, so row locks are only ever held for `limit` bookings at a time.
+        """
+        cancelled = self.booking_repo.cancel_expired_pending_payments(db, now_utc(), limit=limit)
+        if not cancelled:
+            return 0
+        trips = {t.id: t for t in self.trip_repo.list_by_ids(db, {row.trip_id for row in cancelled})}
+        notifications: list[dict] = []
+        for row in cancelled:
+            trip = trips.get(row.trip_id)
             origin = trip.origin_city if trip else "origin"
             destination = trip.destination_city if trip else "destination"
+            data = {"booking_id": str(row.id), "trip_id": str(row.trip_id)}
             # Notify passenger their seat was released
-            self.notification_service.create_notification(
-                db,
-                booking.passenger_id,
-                NotificationType.BOOKING_CANCELLED,
-                "Booking cancelled — payment not received",
-                f"Your seat from {origin} to {destination} was released because payment wasn't completed in time.",
-                data={"booking_id": str(booking.id), "trip_id": str(booking.trip_id)},
-            )
+            notifications.append({
+                "user_id": row.passenger_id,
+                "notification_type": NotificationType.BOOKING_CANCELLED,
+                "title": "Booking cancelled — payment not received",
+                "body": f"Your seat from {origin} to {destination} was released because payment wasn't completed in time.",
+                "data": data,
+            })
             # Notify driver the request is off
             if trip:
-                self.notification_service.create_notification(
-                    db,
-                    trip.driver_id,
-                    NotificationType.BOOKING_CANCELLED,
-                    "Booking request expired",
-                    f"A passenger didn't complete payment for their seat from {origin} to {destination}. The request has been removed.",
-                    data={"booking_id": str(booking.id), "trip_id": str(booking.trip_id)},
-                )
-            count += 1
-        return count
+                notifications.append({
+                    "user_id": trip.driver_id,
+                    "notification_type": NotificationType.BOOKING_CANCELLED,
+                    "title": "Booking request expired",
+                    "body": f"A passenger didn't complete payment for their seat from {origin} to {destination}. The request has been removed.",
+                    "data": data,
+                })
+        self.notification_service.create_notifications(db, notifications)
+        return len(cancelled)
 
     def cancel_booking(self, db: Session, actor: User, booking_id: UUID) -> Booking:
         return self.update_status(db, actor, booking_id, BookingStatus.CANCELLED)
@@ -0,0 +1,176 @@
+"""Redis-backed circuit breaker shared by every API and Celery worker.
+
+Breaker state lives in Redis so one outage opens the breaker cluster-wide
+instead of each process burning its own budget of slow failing calls:
+  rideway:breaker:{name}:failures  → consecutive outage failures, TTL failure window
+  rideway:breaker:{name}:open      → present while open (calls rejected), TTL recovery window
+  rideway:breaker:{name}:tripped   → present from opening until the next success
+  rideway:breaker:{name}:probe     → half-open probe token, TTL probe timeout
+  rideway:breaker:{name}:metrics   → hash of "{endpoint}:{counter}" → count
+
+Once the open key expires the breaker is half-open: the single caller that
+wins SET NX on the probe key goes through, everyone else is still rejected.
+A successful probe closes the breaker; a failed one reopens it.
+
+If Redis itself is unreachable the breaker fails open — calls go through
+as if it were closed — rather than turning a Redis blip into a payments outage.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Iterator
+
+import redis
+
+from app.core.redis_client import REDIS_DB_PAYMENTS, redis_client
+
+logger = logging.getLogger(__name__)
+
+_KEY = "rideway:breaker:{}:{}"
+_COUNTERS = ("successes", "failures", "rejected", "probes", "opened")
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of calling the upstream while the breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_exceptions: tuple[type[BaseException], ...] = (Exception,),
+        failure_threshold: int = 5,
+        recovery_seconds: int = 60,
+        failure_window_seconds: int = 60,
+        probe_timeout_seconds: int = 45,
+        unavailable_message: str = "Service temporarily unavailable, try again shortly",
+    ) -> None:
+        self.name = name
+        self.failure_exceptions = failure_exceptions
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.failure_window_seconds = failure_window_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.unavailable_message = unavailable_message
+
+    def _key(self, part: str) -> str:
+        return _KEY.format(self.name, part)
+
+    def _count(self, pipe: redis.client.Pipeline, endpoint: str, counter: str) -> None:
+        pipe.hincrby(self._key("metrics"), f"{endpoint}:{counter}", 1)
+
+    def is_open(self) -> bool:
+        """Cheap pre-check that never takes the half-open probe token."""
+        try:
+            return bool(redis_client(REDIS_DB_PAYMENTS).exists(self._key("open")))
+        except redis.RedisError:
+            logger.warning("Redis unavailable for circuit breaker %s, allowing calls", self.name)
+            return False
+
+    def allow(self, endpoint: str) -> bool:
+        """Return True if a call to `endpoint` may go ahead.
+
+        In the half-open state this claims the probe token, so a True result
+        must be followed by record_success() or record_failure().
+        """
+        try:
+            r = redis_client(REDIS_DB_PAYMENTS)
+            pipe = r.pipeline(transaction=False)
+            pipe.exists(self._key("open"))
+            pipe.exists(self._key("tripped"))
+            is_open, tripped = pipe.execute()
+            if not is_open and not tripped:
+                return True
+            if not is_open and r.set(self._key("probe"), endpoint, nx=True, ex=self.probe_timeout_seconds):
+                pipe = r.pipeline(transaction=False)
+                self._count(pipe, endpoint, "probes")
+                pipe.execute()
+                logger.info("Circuit breaker %s half-open, probing via %s", self.name, endpoint)
+                return True
+            pipe = r.pipeline(transaction=False)
+            self._count(pipe, endpoint, "rejected")
+            pipe.execute()
+            return False
+        except redis.RedisError:
+            logger.warning("Redis unavailable for circuit breaker %s, allowing calls", self.name)
+            return True
+
+    def record_success(self, endpoint: str) -> None:
+        try:
+            pipe = redis_client(REDIS_DB_PAYMENTS).pipeline(transaction=False)
+            self._count(pipe, endpoint, "successes")
+            pipe.delete(self._key("failures"))
+            pipe.delete(self._key("tripped"), self._key("probe"))
+            closed = pipe.execute()[2]
+            if closed:
+                logger.info("Circuit breaker %s closed after successful %s call", self.name, endpoint)
+        except redis.RedisError:
+            logger.warning("Redis unavailable for circuit breaker %s, success not recorded", self.name)
+
+    def record_failure(self, endpoint: str) -> None:
+        try:
+            r = redis_client(REDIS_DB_PAYMENTS)
+            pipe = r.pipeline(transaction=False)
+            self._count(pipe, endpoint, "failures")
+            pipe.incr(self._key("failures"))
+            pipe.expire(self._key("failures"), self.failure_window_seconds)
+            pipe.exists(self._key("tripped"))
+            _, failures, _, tripped = pipe.execute()
+            # Any failure after the breaker has tripped is the half-open probe failing
+            if tripped or failures >= self.failure_threshold:
+                self._open(r, endpoint)
+        except redis.RedisError:
+            logger.warning("Redis unavailable for circuit breaker %s, failure not recorded", self.name)
+
+    def _open(self, r: redis.Redis, endpoint: str) -> None:
+        pipe = r.pipeline(transaction=False)
+        pipe.set(self._key("open"), endpoint, ex=self.recovery_seconds)
+        pipe.set(self._key("tripped"), endpoint)
+        pipe.delete(self._key("failures"), self._key("probe"))
+        self._count(pipe, endpoint, "opened")
+        pipe.execute()
+        logger.warning(
+            "Circuit breaker %s opened for %ss after %s failure", self.name, self.recovery_seconds, endpoint
+        )
+
+    @contextmanager
+    def guard(self, endpoint: str) -> Iterator[None]:
+        """Run the block as one call to `endpoint`, or raise CircuitOpenError.
+
+        Only exceptions in failure_exceptions count against the breaker; any
+        other error means the upstream answered, so it is recorded as a success.
+        """
+        if not self.allow(endpoint):
+            raise CircuitOpenError(self.unavailable_message)
+        try:
+            yield
+        except self.failure_exceptions:
+            self.record_failure(endpoint)
+            raise
+        except BaseException:
+            self.record_success(endpoint)
+            raise
+        self.record_success(endpoint)
+
+    def snapshot(self) -> dict:
+        """Current state plus per-endpoint counters, for the admin API."""
+        r = redis_client(REDIS_DB_PAYMENTS)
+        pipe = r.pipeline(transaction=False)
+        pipe.exists(self._key("open"))
+        pipe.exists(self._key("tripped"))
+        pipe.get(self._key("failures"))
+        pipe.ttl(self._key("open"))
+        pipe.hgetall(self._key("metrics"))
+        is_open, tripped, failures, open_ttl, metrics = pipe.execute()
+
+        endpoints: dict[str, dict[str, int]] = {}
+        for field, value in metrics.items():
+            endpoint, _, counter = field.rpartition(":")
+            endpoints.setdefault(endpoint, dict.fromkeys(_COUNTERS, 0))[counter] = int(value)
+        return {
+            "name": self.name,
+            "state": "open" if is_open else "half_open" if tripped else "closed",
+            "consecutive_failures": int(failures or 0),
+            "open_seconds_remaining": max(open_ttl, 0) if is_open else 0,
+            "endpoints": endpoints,
+        }
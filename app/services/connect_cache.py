@@ -0,0 +1,78 @@
+"""Redis cache for Stripe Connect status and balance lookups.
+
+Drivers' app screens read their Connect status and balance on every view, so
+the Stripe responses are cached per connected account:
+  rideway:connect:{kind}:{account_id}          → JSON {value, fetched_at}, TTL stale window
+  rideway:connect:{kind}:{account_id}:refresh  → held while one background refresh runs
+
+get() reports whether an entry is still fresh; a stale entry is served while
+the caller queues a single refresh (stale-while-revalidate). Webhooks for the
+account call invalidate() so the next read goes back to Stripe.
+
+Redis errors are treated as cache misses — the lookup falls through to Stripe.
+"""
+
+import json
+import logging
+import time
+
+import redis
+
+from app.core.constants import (
+    CONNECT_BALANCE_FRESH_SECONDS,
+    CONNECT_CACHE_STALE_SECONDS,
+    CONNECT_STATUS_FRESH_SECONDS,
+)
+from app.core.redis_client import REDIS_DB_PAYMENTS, redis_client
+
+logger = logging.getLogger(__name__)
+
+STATUS = "status"
+BALANCE = "balance"
+_FRESH_SECONDS = {STATUS: CONNECT_STATUS_FRESH_SECONDS, BALANCE: CONNECT_BALANCE_FRESH_SECONDS}
+_REFRESH_LOCK_TTL = 30
+_KEY = "rideway:connect:{}:{}"
+
+
+def get(kind: str, account_id: str) -> tuple[dict, bool] | None:
+    """Return (value, is_fresh) for a cached lookup, or None on a miss."""
+    try:
+        raw = redis_client(REDIS_DB_PAYMENTS).get(_KEY.format(kind, account_id))
+    except redis.RedisError:
+        logger.warning("Redis unavailable for Connect cache, reading %s from Stripe", kind)
+        return None
+    if raw is None:
+        return None
+    entry = json.loads(raw)
+    return entry["value"], time.time() - entry["fetched_at"] < _FRESH_SECONDS[kind]
+
+
+def put(kind: str, account_id: str, value: dict) -> None:
+    entry = json.dumps({"value": value, "fetched_at": time.time()})
+    try:
+        redis_client(REDIS_DB_PAYMENTS).set(_KEY.format(kind, account_id), entry, ex=CONNECT_CACHE_STALE_SECONDS)
+    except redis.RedisError:
+        logger.warning("Redis unavailable for Connect cache, %s not cached", kind)
+
+
+def claim_refresh(kind: str, account_id: str) -> bool:
+    """True for the one caller that should refresh a stale entry."""
+    try:
+        key = _KEY.format(kind, account_id) + ":refresh"
+        return bool(redis_client(REDIS_DB_PAYMENTS).set(key, "1", nx=True, ex=_REFRESH_LOCK_TTL))
+    except redis.RedisError:
+        return False
+
+
+def release_refresh(kind: str, account_id: str) -> None:
+    try:
+        redis_client(REDIS_DB_PAYMENTS).delete(_KEY.format(kind, account_id) + ":refresh")
+    except redis.RedisError:
+        pass
+
+
+def invalidate(account_id: str, *kinds: str) -> None:
+    try:
+        redis_client(REDIS_DB_PAYMENTS).delete(*(_KEY.format(kind, account_id) for kind in kinds))
+    except redis.RedisError:
+        logger.warning("Redis unavailable, Connect cache for %s not invalidated", account_id)
@@ -0,0 +1,125 @@
+"""Redis-backed Idempotency-Key handling for retried POST requests.
+
+Mobile clients retry on flaky networks, so the same booking or payment-intent
+request can arrive several times. A client-supplied `Idempotency-Key` header
+lets us execute the request once and replay the stored response afterwards.
+
+Keys are scoped per endpoint and per user:
+  rideway:idem:{scope}:{user_id}:{key}       → JSON {fingerprint, status_code, body}, TTL 24h
+  rideway:idem:{scope}:{user_id}:{key}:lock  → request fingerprint while in flight, TTL 60s
+
+A concurrent duplicate waits on the in-flight marker until the first request
+stores its response, then replays it instead of executing a second time.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from uuid import UUID
+
+import redis
+from fastapi.responses import JSONResponse
+
+from app.core.redis_client import REDIS_DB_APP, redis_client
+
+logger = logging.getLogger(__name__)
+
+_RESPONSE_TTL = 86_400  # 24 hours
+_LOCK_TTL = 60  # in-flight marker outlives any sane request, then self-heals
+_WAIT_SECONDS = 10.0
+_POLL_INTERVAL = 0.1
+_KEY = "rideway:idem:{}:{}:{}"
+_MAX_KEY_LENGTH = 255
+
+
+def fingerprint(payload: dict) -> str:
+    """Stable hash of the request body — same key with a different body is rejected."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotentRequest:
+    """One request guarded by an Idempotency-Key.
+
+    Usage in a route:
+        guard = IdempotentRequest("bookings_create", user.id, key, payload.model_dump())
+        replay = guard.replay()          # cached JSONResponse, or None → execute
+        ...execute and commit...
+        guard.store(201, body)           # on success
+        guard.release()                  # on failure, so the client can retry
+
+    With no key supplied (or Redis down) every method is a no-op and the
+    request executes normally.
+    """
+
+    def __init__(self, scope: str, user_id: UUID, key: str | None, payload: dict) -> None:
+        self.key = key.strip() if key else None
+        if self.key and len(self.key) > _MAX_KEY_LENGTH:
+            raise ValueError("Idempotency-Key too long")
+        self.redis_key = _KEY.format(scope, user_id, self.key) if self.key else None
+        self.lock_key = f"{self.redis_key}:lock" if self.key else None
+        self.fingerprint = fingerprint(payload)
+        self.acquired = False
+
+    def replay(self) -> JSONResponse | None:
+        """Return the stored response for this key, or claim it for execution.
+
+        Raises ValueError if the key was used for a different request, or if
+        a duplicate is still in flight after waiting.
+        """
+        if not self.key:
+            return None
+        try:
+            r = redis_client(REDIS_DB_APP)
+            deadline = time.monotonic() + _WAIT_SECONDS
+            while True:
+                cached = r.get(self.redis_key)
+                if cached:
+                    return self._to_response(json.loads(cached))
+                if r.set(self.lock_key, self.fingerprint, nx=True, ex=_LOCK_TTL):
+                    self.acquired = True
+                    return None
+                in_flight = r.get(self.lock_key)
+                if in_flight and in_flight != self.fingerprint:
+                    raise ValueError("Idempotency-Key reused with a different request")
+                if time.monotonic() >= deadline:
+                    raise ValueError("A request with this Idempotency-Key is still in progress")
+                time.sleep(_POLL_INTERVAL)
+        except redis.RedisError:
+            logger.warning("Redis unavailable for idempotency, executing request", extra={"key": self.key})
+            return None
+
+    def store(self, status_code: int, body: dict) -> None:
+        """Persist the response for replay and clear the in-flight marker."""
+        if not self.acquired:
+            return
+        record = {"fingerprint": self.fingerprint, "status_code": status_code, "body": body}
+        try:
+            r = redis_client(REDIS_DB_APP)
+            pipe = r.pipeline()
+            pipe.set(self.redis_key, json.dumps(record, default=str), ex=_RESPONSE_TTL)
+            pipe.delete(self.lock_key)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Redis unavailable, idempotent response not stored", extra={"key": self.key})
+        self.acquired = False
+
+    def release(self) -> None:
+        """Drop the in-flight marker without storing — failed requests may be retried."""
+        if not self.acquired:
+            return
+        try:
+            redis_client(REDIS_DB_APP).delete(self.lock_key)
+        except redis.RedisError:
+            pass
+        self.acquired = False
+
+    def _to_response(self, record: dict) -> JSONResponse:
+        if record.get("fingerprint") != self.fingerprint:
+            raise ValueError("Idempotency-Key reused with a different request")
+        return JSONResponse(
+            status_code=record["status_code"],
+            content=record["body"],
+            headers={"Idempotent-Replayed": "true"},
+        )
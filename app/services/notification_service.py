@@ -2,13 +2,20 @@
 
 import base64
 import json
+from datetime import timedelta
 from urllib import request as http_request
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.core.celery_app import celery_app
 from app.core.config import get_settings
-from app.core.constants import NotificationType
+from app.core.constants import (
+    NOTIFICATION_ARCHIVE_RETENTION_DAYS,
+    NOTIFICATION_RETENTION_DAYS,
+    NotificationType,
+)
+from app.core.database import run_after_commit
 from app.models.device import Device
 from app.models.notification import Notification
 from app.models.user import User
@@ -16,6 +23,7 @@ from app.repositories.device_repo import DeviceRepository
 from app.repositories.notification_repo import NotificationRepository
 from app.repositories.user_repo import UserRepository
 from app.utils.datetime import now_utc
+from app.utils.pagination import decode_cursor
 
 # Firebase Admin app is initialised once and reused for all requests
 _firebase_app = None
@@ -102,8 +110,29 @@ class NotificationService:
 
     # ── in-app notifications ───────────────────────────────────────────────────
 
-    def list_notifications(self, db: Session, user: User, limit: int, offset: int) -> list[Notification]:
-        return self.notification_repo.list_by_user(db, user.id, limit=limit, offset=offset)
+    def list_notifications(
+        self,
+        db: Session,
+        user: User,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> list[Notification]:
+        return self.notification_repo.list_by_user(
+            db, user.id, limit=limit, offset=offset, cursor=decode_cursor(cursor)
+        )
+
+    def archive_expired(self, db: Session, batch_size: int = 1000) -> int:
+        """Move one batch of notifications past the retention window to the archive,
+        and purge one batch of archived rows past the archive window."""
+        now = now_utc()
+        archived = self.notification_repo.archive_older_than(
+            db, now - timedelta(days=NOTIFICATION_RETENTION_DAYS), limit=batch_size
+        )
+        self.notification_repo.purge_archive_older_than(
+            db, now - timedelta(days=NOTIFICATION_ARCHIVE_RETENTION_DAYS), limit=batch_size
+        )
+        return archived
 
     def unread_count(self, db: Session, user: User) -> int:
         return self.notification_repo.count_unread(db, user.id)
@@ -149,15 +178,90 @@ class NotificationService:
             notification = self.notification_repo.create(db, notification)
 
         # 2. FCM push notification
-        if user.notify_push:
-            devices = self.device_repo.list_by_user(db, user_id)
-            stale_tokens: list[Device] = []
-            for device in devices:
-                sent = self._send_push(device.device_token, title, body, enriched_data)
-                if not sent:
-                    stale_tokens.append(device)
-            for device in stale_tokens:
-                self.device_repo.delete(db, device)
+        devices = self.device_repo.list_by_user(db, user_id) if user.notify_push else []
+        self._deliver_external(db, user, devices, notification_type, title, body, enriched_data)
+
+        return notification
+
+    def create_notifications(self, db: Session, items: list[dict]) -> list[Notification]:
+        """Batch variant of create_notification for sweeps that notify many users.
+
+        Each item has user_id, notification_type, title, body and optional data.
+        Only the in-app rows are written here, in a single flush, so the caller's
+        transaction stays short. Push and SMS go out from a Celery task queued
+        once that transaction commits.
+        """
+        if not items:
+            return []
+        user_ids = {item["user_id"] for item in items}
+        users = {u.id: u for u in self.user_repo.list_by_ids(db, user_ids)}
+
+        in_app: list[Notification] = []
+        external: list[dict] = []
+        for item in items:
+            user = users.get(item["user_id"])
+            if not user:
+                continue
+            notification_type = item["notification_type"]
+            enriched_data = {"type": notification_type.value, **(item.get("data") or {})}
+            if user.notify_in_app:
+                in_app.append(
+                    Notification(
+                        user_id=user.id,
+                        notification_type=notification_type,
+                        title=item["title"],
+                        body=item["body"],
+                        data=enriched_data,
+                    )
+                )
+            if user.notify_push or user.notify_sms:
+                external.append({
+                    "user_id": str(user.id),
+                    "notification_type": notification_type.value,
+                    "title": item["title"],
+                    "body": item["body"],
+                    "data": enriched_data,
+                })
+        if external:
+            run_after_commit(db, lambda: celery_app.send_task(
+                "app.tasks.notification_tasks.deliver_external_notifications", args=[external]
+            ))
+        return self.notification_repo.create_many(db, in_app)
+
+    def deliver_external_batch(self, db: Session, items: list[dict]) -> None:
+        """Push and SMS for payloads queued by create_notifications; one query each for users and devices."""
+        users = {u.id: u for u in self.user_repo.list_by_ids(db, {UUID(item["user_id"]) for item in items})}
+        push_ids = {uid for uid, u in users.items() if u.notify_push}
+        devices_by_user: dict[UUID, list[Device]] = {}
+        for device in self.device_repo.list_by_users(db, push_ids):
+            devices_by_user.setdefault(device.user_id, []).append(device)
+        for item in items:
+            user = users.get(UUID(item["user_id"]))
+            if not user:
+                continue
+            self._deliver_external(
+                db, user, devices_by_user.get(user.id, []),
+                NotificationType(item["notification_type"]), item["title"], item["body"], item["data"],
+            )
+
+    def _deliver_external(
+        self,
+        db: Session,
+        user: User,
+        devices: list[Device],
+        notification_type: NotificationType,
+        title: str,
+        body: str,
+        enriched_data: dict,
+    ) -> None:
+        """Push to each device (pruning stale tokens) and send SMS for booking events."""
+        stale_tokens: list[Device] = []
+        for device in devices:
+            sent = self._send_push(device.device_token, title, body, enriched_data)
+            if not sent:
+                stale_tokens.append(device)
+        for device in stale_tokens:
+            self.device_repo.delete(db, device)
 
         # 3. SMS for booking-related events
         if (
@@ -168,8 +272,6 @@ class NotificationService:
         ):
             self._send_sms(user.phone_number, title, body)
 
-        return notification
-
     # ── FCM push ───────────────────────────────────────────────────────────────
 
     def _send_push(
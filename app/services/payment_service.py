@@ -2,65 +2,121 @@
 
 import logging
 import stripe
-import time
+from contextlib import contextmanager
 from datetime import timedelta
-from threading import Lock
 from sqlalchemy.orm import Session
-from uuid import UUID
+from typing import Iterable, Iterator
+from uuid import UUID, uuid4
 
 import redis
 
 from app.core.config import get_settings
 from app.core.celery_app import celery_app
-from app.core.constants import CURRENCY, PLATFORM_FEE_PERCENT, PaymentStatus
+from app.core.constants import (
+    CURRENCY,
+    LedgerEntryType,
+    PAYOUT_BATCH_DRIVERS_PER_RUN,
+    PAYMENT_INTENT_CLAIM_STALE_MINUTES,
+    PAYMENT_INTENT_SWEEP_BATCH_SIZE,
+    PAYMENT_RECONCILE_INITIAL_LOOKBACK_HOURS,
+    PAYMENT_RECONCILE_OPEN_LOOKBACK_HOURS,
+    PAYMENT_RECONCILE_PAGE_SIZE,
+    PAYOUT_BATCH_STALE_MINUTES,
+    PLATFORM_FEE_PERCENT,
+    STRIPE_WEBHOOK_BATCH_SIZE,
+    STRIPE_WEBHOOK_MAX_DELIVERIES,
+    BookingStatus,
+    PaymentStatus,
+    PayoutBatchStatus,
+)
 from app.core.database import create_db_session
+from app.core.redis_client import REDIS_DB_PAYMENTS, redis_client
+from app.models.ledger import DriverBalance, DriverLedgerEntry
 from app.models.payment import Payment
+from app.models.payout import PayoutBatch
 from app.repositories.booking_repo import BookingRepository
+from app.repositories.ledger_repo import LedgerRepository
 from app.repositories.payment_repo import PaymentRepository
+from app.repositories.payout_repo import PayoutRepository
 from app.repositories.trip_repo import TripRepository
 from app.repositories.user_repo import UserRepository
+from app.services import connect_cache, stripe_client, webhook_stream
+from app.services.circuit_breaker import CircuitBreaker
 from app.services.email_service import EmailService
 from app.utils.datetime import now_utc
+from app.utils.pagination import decode_cursor
 
 logger = logging.getLogger(__name__)
 
+# Point the SDK at a Stripe stand-in (app/devtools/fake_stripe.py) for offline load tests
+if get_settings().stripe_api_base:
+    stripe.api_base = get_settings().stripe_api_base
+
 _WEBHOOK_DEDUP_TTL = 86_400  # 24 hours — matches Stripe's retry window
 _WEBHOOK_KEY = "rideway:stripe_event:{}"
+_PAYMENT_INTENT_EVENTS = (
+    "payment_intent.succeeded",
+    "payment_intent.processing",
+    "payment_intent.payment_failed",
+    "payment_intent.canceled",
+)
+# Connect webhooks that make a cached lookup out of date; payout.* events also drop the balance
+_CONNECT_CACHE_EVENTS = {"account.updated": connect_cache.STATUS, "balance.available": connect_cache.BALANCE}
+_RECONCILE_CHECKPOINT_KEY = "rideway:stripe:reconcile:checkpoint"
+_RECONCILE_SETTLE_SECONDS = 60  # intents this recent may still be mid-write on our side
+# Stripe intent status → (local status, local statuses it may overwrite). A
+# webhook that already moved the payment further along is never rolled back.
+_RECONCILE_RULES = {
+    "succeeded": (
+        PaymentStatus.SUCCEEDED,
+        {
+            PaymentStatus.REQUIRES_PAYMENT_METHOD,
+            PaymentStatus.REQUIRES_CONFIRMATION,
+            PaymentStatus.PROCESSING,
+            PaymentStatus.FAILED,
+        },
+    ),
+    "processing": (
+        PaymentStatus.PROCESSING,
+        {PaymentStatus.REQUIRES_PAYMENT_METHOD, PaymentStatus.REQUIRES_CONFIRMATION},
+    ),
+    "canceled": (
+        PaymentStatus.FAILED,
+        {PaymentStatus.REQUIRES_PAYMENT_METHOD, PaymentStatus.REQUIRES_CONFIRMATION, PaymentStatus.PROCESSING},
+    ),
+}
+_TERMINAL_INTENT_STATUSES = ("succeeded", "canceled")
+
 
+# Shared across every API and Celery worker via Redis. Only errors that point at
+# Stripe being down count; a declined card or invalid request is a healthy answer.
+payment_circuit_breaker = CircuitBreaker(
+    "stripe",
+    failure_exceptions=(stripe.APIConnectionError, stripe.APIError, stripe.RateLimitError),
+    unavailable_message="Payment service temporarily unavailable, try again shortly",
+)
 
-def _redis_client() -> redis.Redis:
-    settings = get_settings()
-    base_url = settings.celery_broker_url.rsplit("/", 1)[0]
-    return redis.from_url(f"{base_url}/3", decode_responses=True)
 
+def _webhook_booking_id(event: dict) -> UUID | None:
+    if event["type"] not in _PAYMENT_INTENT_EVENTS:
+        return None
+    booking_id = (event["data"]["object"].get("metadata") or {}).get("booking_id")
+    return UUID(booking_id) if booking_id else None
 
-class CircuitBreaker:
-    def __init__(self, failure_threshold: int = 5, recovery_seconds: int = 60) -> None:
-        self.failure_threshold = failure_threshold
-        self.recovery_seconds = recovery_seconds
-        self.failure_count = 0
-        self.open_until = 0.0
-        self.lock = Lock()
 
-    def allow(self) -> bool:
-        with self.lock:
-            if self.open_until > time.monotonic():
-                return False
-            return True
+def _load_reconcile_checkpoint() -> int | None:
+    raw = redis_client(REDIS_DB_PAYMENTS).get(_RECONCILE_CHECKPOINT_KEY)
+    return int(raw) if raw else None
 
-    def record_success(self) -> None:
-        with self.lock:
-            self.failure_count = 0
-            self.open_until = 0.0
 
-    def record_failure(self) -> None:
-        with self.lock:
-            self.failure_count += 1
-            if self.failure_count >= self.failure_threshold:
-                self.open_until = time.monotonic() + self.recovery_seconds
+def _save_reconcile_checkpoint(created: int) -> None:
+    redis_client(REDIS_DB_PAYMENTS).set(_RECONCILE_CHECKPOINT_KEY, created)
 
 
-payment_circuit_breaker = CircuitBreaker()
+@contextmanager
+def _stripe_call(endpoint: str, profile: stripe_client.CallProfile = stripe_client.INTERACTIVE) -> Iterator[None]:
+    with payment_circuit_breaker.guard(endpoint), stripe_client.call(endpoint, profile):
+        yield
 
 
 class PaymentService:
@@ -70,25 +126,23 @@ class PaymentService:
         booking_repo: BookingRepository,
         trip_repo: TripRepository,
         user_repo: UserRepository,
+        payout_repo: PayoutRepository | None = None,
+        ledger_repo: LedgerRepository | None = None,
     ) -> None:
         self.payment_repo = payment_repo
         self.booking_repo = booking_repo
         self.trip_repo = trip_repo
         self.user_repo = user_repo
+        self.payout_repo = payout_repo or PayoutRepository()
+        self.ledger_repo = ledger_repo or LedgerRepository()
 
     def _configured_stripe(self) -> None:
         settings = get_settings()
         if not settings.stripe_secret_key:
             raise ValueError("Payments are not yet enabled")
-        if not payment_circuit_breaker.allow():
+        if payment_circuit_breaker.is_open():
             raise ValueError("Payment service temporarily unavailable, try again shortly")
-        stripe.api_key = settings.stripe_secret_key
-        stripe.max_network_retries = 2
-        # Set timeout — stripe 12+ uses http_client, older versions used stripe.timeout
-        try:
-            stripe.default_http_client = stripe.new_default_http_client(timeout=30)
-        except Exception:
-            pass
+        stripe_client.configure(settings.stripe_secret_key)
 
     def create_payment_intent(self, db: Session, booking_id: UUID, actor_id: UUID) -> Payment:
         """Create a Stripe PaymentIntent synchronously and return client_secret immediately."""
@@ -110,6 +164,7 @@ class PaymentService:
         payout = round(amount - platform_fee, 2)
         payment = Payment(
             booking_id=booking_id,
+            payer_id=booking.passenger_id,
             amount=amount,
             platform_fee=platform_fee,
             payout_amount=payout,
@@ -118,23 +173,24 @@ class PaymentService:
         saved = self.payment_repo.create(db, payment)
         return self._sync_stripe_intent(db, saved)
 
-    def _sync_stripe_intent(self, db: Session, payment: Payment) -> Payment:
+    def _sync_stripe_intent(
+        self, db: Session, payment: Payment, profile: stripe_client.CallProfile = stripe_client.INTERACTIVE
+    ) -> Payment:
         try:
-            intent = stripe.PaymentIntent.create(
-                amount=int(float(payment.amount) * 100),
-                currency=CURRENCY,
-                metadata={"booking_id": str(payment.booking_id)},
-                idempotency_key=f"payment_intent:{payment.id}",
-            )
-            payment.stripe_payment_intent_id = intent.id
-            payment.stripe_client_secret = intent.client_secret
-            payment.status = PaymentStatus.REQUIRES_PAYMENT_METHOD
-            self.payment_repo.update(db, payment)
-            payment_circuit_breaker.record_success()
-            return payment
+            with _stripe_call("payment_intents", profile):
+                intent = stripe.PaymentIntent.create(
+                    amount=int(float(payment.amount) * 100),
+                    currency=CURRENCY,
+                    metadata={"booking_id": str(payment.booking_id)},
+                    idempotency_key=f"payment_intent:{payment.id}",
+                )
         except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
             raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
+        payment.stripe_payment_intent_id = intent.id
+        payment.stripe_client_secret = intent.client_secret
+        payment.status = PaymentStatus.REQUIRES_PAYMENT_METHOD
+        self.payment_repo.update(db, payment)
+        return payment
 
     def process_payment_intent(self, payment_id: UUID) -> None:
         """Celery recovery: fill in missing PI for payments created before a Stripe outage."""
@@ -143,67 +199,300 @@ class PaymentService:
             payment = self.payment_repo.get_by_id(db, payment_id)
             if not payment or payment.stripe_payment_intent_id:
                 return
-            if not payment_circuit_breaker.allow():
+            if payment_circuit_breaker.is_open():
                 return
             settings = get_settings()
             if not settings.stripe_secret_key:
                 return
-            stripe.api_key = settings.stripe_secret_key
-            self._sync_stripe_intent(db, payment)
+            stripe_client.configure(settings.stripe_secret_key)
+            self._sync_stripe_intent(db, payment, stripe_client.BACKGROUND)
+            db.commit()
+        except Exception:
+            db.rollback()
+        finally:
+            db.close()
+
+    def process_pending_intents(self, limit: int = PAYMENT_INTENT_SWEEP_BATCH_SIZE) -> list[UUID]:
+        """Scheduled recovery: claim payments missing a PaymentIntent and fan them out as tasks."""
+        if payment_circuit_breaker.is_open():
+            return []
+        db = create_db_session()
+        try:
+            now = now_utc()
+            stale_before = now - timedelta(minutes=PAYMENT_INTENT_CLAIM_STALE_MINUTES)
+            claimed = self.payment_repo.claim_pending_intents(db, now, stale_before, limit)
             db.commit()
         except Exception:
             db.rollback()
+            raise
         finally:
             db.close()
+        for payment_id in claimed:
+            celery_app.send_task("app.tasks.payment_tasks.process_payment_intent", args=[str(payment_id)])
+        return claimed
+
+    def reconcile_payments(self) -> dict:
+        """Scheduled: correct payments whose status diverged from Stripe (e.g. a webhook never arrived).
 
-    def process_pending_intents(self, limit: int = 50) -> None:
+        Streams PaymentIntents created since the last checkpoint page by page,
+        matches each page to payments with one IN query on the intent id and
+        fixes divergent rows in bulk, committing once per page.
+        """
+        self._configured_stripe()
+        started = int(now_utc().timestamp())
+        since = _load_reconcile_checkpoint()
+        if since is None:
+            since = started - PAYMENT_RECONCILE_INITIAL_LOOKBACK_HOURS * 3600
+        counts = {"checked": 0, "succeeded": 0, "processing": 0, "failed": 0}
+        oldest_open = started
         db = create_db_session()
         try:
-            pending = self.payment_repo.list_pending_intents(db, limit=limit)
-            for payment in pending:
-                self.process_payment_intent(payment.id)
+            for intents in self._iter_payment_intents(since):
+                for status, fixed in self._reconcile_page(db, intents).items():
+                    counts[status] += fixed
+                db.commit()
+                counts["checked"] += len(intents)
+                open_created = [i["created"] for i in intents if i["status"] not in _TERMINAL_INTENT_STATUSES]
+                oldest_open = min([oldest_open, *open_created])
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
 
+        # Next run starts at the oldest intent still in flight so its outcome is
+        # picked up, but abandoned intents cannot hold the window open for ever
+        checkpoint = min(oldest_open, started - _RECONCILE_SETTLE_SECONDS)
+        _save_reconcile_checkpoint(max(checkpoint, started - PAYMENT_RECONCILE_OPEN_LOOKBACK_HOURS * 3600))
+        return counts
+
+    def _iter_payment_intents(self, since: int) -> Iterator[list]:
+        """Yield pages of PaymentIntents created at or after `since`, each fetched behind the breaker."""
+        params = {"created": {"gte": since}, "limit": PAYMENT_RECONCILE_PAGE_SIZE}
+        while True:
+            try:
+                with _stripe_call("payment_intents", stripe_client.BACKGROUND):
+                    page = stripe.PaymentIntent.list(**params)
+            except stripe.StripeError as exc:
+                raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
+            if page.data:
+                yield page.data
+            if not page.has_more or not page.data:
+                return
+            params["starting_after"] = page.data[-1]["id"]
+
+    def _reconcile_page(self, db: Session, intents: Iterable) -> dict:
+        payments = self.payment_repo.list_by_intent_ids(db, [intent["id"] for intent in intents])
+        to_processing, to_failed, succeeded = [], [], 0
+        for intent in intents:
+            payment = payments.get(intent["id"])
+            rule = _RECONCILE_RULES.get(intent["status"])
+            if payment is None or rule is None:
+                continue
+            target, fixable = rule
+            if payment.status not in fixable:
+                continue
+            logger.warning(
+                "Payment diverged from Stripe, reconciling",
+                extra={"payment_id": str(payment.id), "local": payment.status, "stripe": intent["status"]},
+            )
+            if target == PaymentStatus.SUCCEEDED:
+                # Needs the charge id, a ledger entry and a booking confirmation, so not part of the bulk update
+                self._mark_succeeded(db, payment, intent.get("latest_charge"))
+                succeeded += 1
+            elif target == PaymentStatus.PROCESSING:
+                to_processing.append(payment.id)
+            else:
+                to_failed.append(payment.id)
+        return {
+            "succeeded": succeeded,
+            "processing": self.payment_repo.set_status_bulk(db, to_processing, PaymentStatus.PROCESSING),
+            "failed": self.payment_repo.set_status_bulk(db, to_failed, PaymentStatus.FAILED),
+        }
+
     def trigger_payout_background(self, booking_id: UUID) -> None:
         celery_app.send_task("app.tasks.payment_tasks.process_payout", args=[str(booking_id)])
 
+    def trigger_trip_payouts_background(self, trip_id: UUID) -> None:
+        celery_app.send_task("app.tasks.payment_tasks.process_trip_payouts", args=[str(trip_id)])
+
     def refund_for_cancellation(self, db: Session, booking_id: UUID, departure_time=None) -> Payment | None:
         """Issue a full Stripe refund on cancellation.
-        No payment or payment not succeeded → no-op.
+        No payment or payment not succeeded → no-op. A payment already batched
+        for a driver payout is rejected: the passenger's money has left the platform.
         """
         payment = self.payment_repo.get_by_booking(db, booking_id)
         if not payment or payment.status != PaymentStatus.SUCCEEDED:
             return None
         if not payment.stripe_payment_intent_id:
             return None
+        if payment.payout_batch_id is not None:
+            raise ValueError("Payment has already been paid out to the driver and cannot be refunded")
+
+        self._refund_in_full(payment)
+        payment.status = PaymentStatus.REFUNDED
+        self._record_ledger(db, payment, LedgerEntryType.REFUND, -float(payment.payout_amount))
+        return self.payment_repo.update(db, payment)
 
+    def _refund_in_full(
+        self, payment: Payment, profile: stripe_client.CallProfile = stripe_client.INTERACTIVE
+    ) -> None:
         refund_amount = int(float(payment.amount) * 100)  # 100% refund always
 
         self._configured_stripe()
         try:
-            stripe.Refund.create(
-                payment_intent=payment.stripe_payment_intent_id,
-                amount=refund_amount,
-                idempotency_key=f"refund:{payment.id}",
-            )
+            with _stripe_call("refunds", profile):
+                stripe.Refund.create(
+                    payment_intent=payment.stripe_payment_intent_id,
+                    amount=refund_amount,
+                    idempotency_key=f"refund:{payment.id}",
+                )
         except stripe.StripeError as exc:
             raise ValueError(f"Refund failed: {exc.user_message or str(exc)}") from exc
 
-        payment.status = PaymentStatus.REFUNDED
-        return self.payment_repo.update(db, payment)
-
     def process_payout(self, booking_id: str | UUID) -> None:
+        """Pay out the booking's driver — one batched transfer covering all their unpaid earnings."""
         booking_uuid = UUID(booking_id) if isinstance(booking_id, str) else booking_id
         db = create_db_session()
         try:
-            self.create_payout_for_booking(db, booking_uuid)
-            db.commit()
-        except Exception:
+            booking = self.booking_repo.get_by_id(db, booking_uuid)
+            trip = self.trip_repo.get_by_id(db, booking.trip_id) if booking else None
+            if trip is not None:
+                self.payout_driver(db, trip.driver_id)
+        except ValueError as exc:
+            db.rollback()
+            logger.warning("Payout skipped for booking %s: %s", booking_uuid, exc)
+        finally:
+            db.close()
+
+    def process_trip_payouts(self, trip_id: str | UUID) -> int:
+        """Pay out a completed trip's driver in one batched transfer.
+
+        Returns the number of payments the transfer covered.
+        """
+        trip_uuid = UUID(trip_id) if isinstance(trip_id, str) else trip_id
+        db = create_db_session()
+        try:
+            trip = self.trip_repo.get_by_id(db, trip_uuid)
+            if trip is None:
+                return 0
+            batch = self.payout_driver(db, trip.driver_id)
+            return batch.payment_count if batch else 0
+        except ValueError as exc:
             db.rollback()
+            logger.warning("Payout skipped for trip %s: %s", trip_uuid, exc)
+            return 0
+        finally:
+            db.close()
+
+    def run_payout_batches(self) -> dict:
+        """Scheduled payout run: retry interrupted batches, then one transfer per driver with unpaid earnings."""
+        db = create_db_session()
+        counts = {"paid": 0, "failed": 0, "retried": 0}
+        try:
+            counts["retried"] = self.retry_stale_payout_batches(db)
+            for driver_id in self.payout_repo.list_drivers_with_unpaid(db, PAYOUT_BATCH_DRIVERS_PER_RUN):
+                try:
+                    if self.payout_driver(db, driver_id) is not None:
+                        counts["paid"] += 1
+                except ValueError as exc:
+                    db.rollback()
+                    counts["failed"] += 1
+                    logger.warning("Payout batch failed for driver %s: %s", driver_id, exc)
+            return counts
         finally:
             db.close()
 
+    def payout_driver(
+        self, db: Session, driver_id: UUID, profile: stripe_client.CallProfile = stripe_client.BACKGROUND
+    ) -> PayoutBatch | None:
+        """Transfer all of a driver's unpaid earnings as a single Stripe transfer.
+
+        The batch and its claimed payments are committed before Stripe is
+        called, so a worker dying mid-transfer leaves a PENDING batch that
+        retry_stale_payout_batches re-sends with the same idempotency key.
+        Returns None when there is nothing to pay.
+        """
+        driver = self.user_repo.get_by_id(db, driver_id)
+        if not driver or not driver.payment_details:
+            return None
+        self._configured_stripe()
+        batch_id = uuid4()
+        batch = self.payout_repo.create(
+            db, PayoutBatch(id=batch_id, driver_id=driver_id, transfer_group=f"payout_{batch_id}")
+        )
+        claimed = self.payout_repo.claim_unpaid_for_driver(db, driver_id, batch.id)
+        if not claimed:
+            db.delete(batch)
+            db.flush()
+            return None
+        batch.amount = round(sum(amount for _, amount in claimed), 2)
+        batch.payment_count = len(claimed)
+        self.payout_repo.update(db, batch)
+        db.commit()
+        return self._send_payout_batch(db, batch, driver.payment_details, profile)
+
+    def retry_stale_payout_batches(self, db: Session) -> int:
+        cutoff = now_utc() - timedelta(minutes=PAYOUT_BATCH_STALE_MINUTES)
+        retried = 0
+        for batch in self.payout_repo.list_stale_pending(db, cutoff):
+            driver = self.user_repo.get_by_id(db, batch.driver_id)
+            try:
+                if not driver or not driver.payment_details:
+                    self._fail_payout_batch(db, batch, "Driver has no connected payout account")
+                    continue
+                self._configured_stripe()
+                self._send_payout_batch(db, batch, driver.payment_details)
+                retried += 1
+            except ValueError as exc:
+                db.rollback()
+                logger.warning("Retry of payout batch %s failed: %s", batch.id, exc)
+        return retried
+
+    def _send_payout_batch(
+        self,
+        db: Session,
+        batch: PayoutBatch,
+        destination: str,
+        profile: stripe_client.CallProfile = stripe_client.BACKGROUND,
+    ) -> PayoutBatch:
+        try:
+            with _stripe_call("transfers", profile):
+                transfer = stripe.Transfer.create(
+                    amount=int(round(float(batch.amount) * 100)),
+                    currency=CURRENCY,
+                    destination=destination,
+                    transfer_group=batch.transfer_group,
+                    metadata={"payout_batch_id": str(batch.id), "payment_count": str(batch.payment_count)},
+                    idempotency_key=f"payout_batch:{batch.id}",
+                )
+        except stripe.APIConnectionError as exc:
+            # Stripe may have created the transfer — keep the batch PENDING for an idempotent retry
+            raise ValueError(f"Payout failed: {exc.user_message or str(exc)}") from exc
+        except stripe.StripeError as exc:
+            self._fail_payout_batch(db, batch, exc.user_message or str(exc))
+            raise ValueError(f"Payout failed: {exc.user_message or str(exc)}") from exc
+        batch.stripe_transfer_id = transfer.id
+        batch.status = PayoutBatchStatus.PAID
+        batch.completed_at = now_utc()
+        self.payout_repo.mark_transferred(db, batch.id, transfer.id)
+        self.payout_repo.update(db, batch)
+        self.ledger_repo.append(
+            db, batch.driver_id, LedgerEntryType.TRANSFER, -float(batch.amount), batch.completed_at,
+            payout_batch_id=batch.id,
+        )
+        db.commit()
+        return batch
+
+    def _fail_payout_batch(self, db: Session, batch: PayoutBatch, error: str) -> None:
+        """Mark the batch failed and release its payments to the next run."""
+        batch.status = PayoutBatchStatus.FAILED
+        batch.error = error[:500]
+        batch.completed_at = now_utc()
+        self.payout_repo.release(db, batch.id)
+        self.payout_repo.update(db, batch)
+        db.commit()
+
     def get_payment_status_for_user(self, db: Session, booking_id: UUID, actor_id: UUID) -> Payment:
         booking = self.booking_repo.get_by_id(db, booking_id)
         if not booking:
@@ -218,7 +507,9 @@ class PaymentService:
             raise ValueError("Payment not found")
         return payment
 
-    def list_payment_history(self, db: Session, passenger_id: UUID, period: str) -> list[Payment]:
+    def list_payment_history(
+        self, db: Session, passenger_id: UUID, period: str, limit: int = 50, cursor: str | None = None
+    ) -> list[Payment]:
         now = now_utc()
         if period == "7d":
             start = now - timedelta(days=7)
@@ -230,40 +521,9 @@ class PaymentService:
             start = now - timedelta(days=365)
         else:
             raise ValueError("Invalid period")
-        return self.payment_repo.list_by_passenger_between(db, passenger_id, start=start, end=now)
-
-    def create_payout_for_booking(self, db: Session, booking_id: UUID) -> Payment:
-        booking = self.booking_repo.get_by_id(db, booking_id)
-        if not booking:
-            raise ValueError("Booking not found")
-        payment = self.payment_repo.get_by_booking(db, booking_id)
-        if not payment:
-            raise ValueError("Payment not found")
-        if payment.status != PaymentStatus.SUCCEEDED:
-            raise ValueError("Payment not completed")
-        if payment.stripe_transfer_id:
-            return payment
-        trip = self.trip_repo.get_by_id(db, booking.trip_id)
-        if not trip:
-            raise ValueError("Trip not found")
-        driver = self.user_repo.get_by_id(db, trip.driver_id)
-        if not driver or not driver.payment_details:
-            raise ValueError("Driver has not connected their payout account")
-        self._configured_stripe()
-        try:
-            transfer = stripe.Transfer.create(
-                amount=int(float(payment.payout_amount) * 100),
-                currency=CURRENCY,
-                destination=driver.payment_details,
-                metadata={"booking_id": str(booking_id)},
-                idempotency_key=f"payout:{payment.id}",
-            )
-            payment_circuit_breaker.record_success()
-        except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
-            raise ValueError(f"Payout failed: {exc.user_message or str(exc)}") from exc
-        payment.stripe_transfer_id = transfer.id
-        return self.payment_repo.update(db, payment)
+        return self.payment_repo.list_by_payer(
+            db, passenger_id, start=start, end=now, limit=limit, cursor=decode_cursor(cursor)
+        )
 
     def verify_webhook_signature(self, payload: bytes, sig_header: str) -> dict:
         """Validate Stripe signature and return the parsed event dict.
@@ -273,11 +533,16 @@ class PaymentService:
         if not settings.stripe_webhook_secret:
             raise ValueError("Payments are not yet enabled")
         self._configured_stripe()
-        try:
-            event = stripe.Webhook.construct_event(payload, sig_header, settings.stripe_webhook_secret)
-        except stripe.SignatureVerificationError as exc:
-            raise ValueError("Invalid webhook signature") from exc
-        return dict(event)
+        # Connected-account events arrive on a separate Connect endpoint with its own signing secret
+        secrets = [settings.stripe_webhook_secret]
+        if settings.stripe_connect_webhook_secret:
+            secrets.append(settings.stripe_connect_webhook_secret)
+        for secret in secrets:
+            try:
+                return dict(stripe.Webhook.construct_event(payload, sig_header, secret))
+            except stripe.SignatureVerificationError:
+                continue
+        raise ValueError("Invalid webhook signature")
 
     def process_webhook_event(self, db: Session, event: dict) -> Payment | None:
         """Process a pre-verified Stripe event dict. Called from the Celery worker."""
@@ -285,7 +550,7 @@ class PaymentService:
 
         # Deduplicate: Stripe delivers at-least-once; same event_id within 24h is a replay
         try:
-            r = _redis_client()
+            r = redis_client(REDIS_DB_PAYMENTS)
             key = _WEBHOOK_KEY.format(event_id)
             already_processed = not r.set(key, "1", nx=True, ex=_WEBHOOK_DEDUP_TTL)
             if already_processed:
@@ -294,34 +559,136 @@ class PaymentService:
         except redis.RedisError:
             logger.warning("Redis unavailable for webhook dedup, processing anyway", extra={"event_id": event_id})
 
+        booking_id = _webhook_booking_id(event)
+        payment = self.payment_repo.get_by_booking(db, booking_id) if booking_id else None
+        return self._apply_webhook_event(db, event, payment)
+
+    def process_webhook_batch(self, db: Session, events: list[dict]) -> int:
+        """Apply pre-verified events in the caller's transaction; returns how many were new.
+
+        Replays are dropped with one pipelined SET NX, and the payments for
+        every payment_intent event are loaded with a single IN query.
+        """
+        fresh = self._claim_webhook_events(events)
+        booking_ids = {booking_id for booking_id in map(_webhook_booking_id, fresh) if booking_id}
+        payments = self.payment_repo.list_by_booking_ids(db, list(booking_ids))
+        for event in fresh:
+            self._apply_webhook_event(db, event, payments.get(_webhook_booking_id(event)))
+        return len(fresh)
+
+    def drain_webhook_stream(self, consumer: str, batch_size: int = STRIPE_WEBHOOK_BATCH_SIZE) -> dict:
+        """Consume the webhook stream batch by batch, one transaction per batch, until it is empty."""
+        db = create_db_session()
+        counts = {"processed": 0, "dead_lettered": 0}
+        released = False
+        try:
+            while True:
+                entries = webhook_stream.read_batch(consumer, batch_size)
+                if entries:
+                    released = False
+                    self._process_webhook_entries(db, entries, counts)
+                    continue
+                if released:
+                    return counts
+                # Drop the drain flag, then look once more: an event appended after
+                # this point queues its own drain, one appended before is read here
+                webhook_stream.release_drain()
+                released = True
+        finally:
+            db.close()
+
+    def _process_webhook_entries(self, db: Session, entries: list[tuple[str, dict, int]], counts: dict) -> None:
+        # An entry reclaimed past its delivery budget crashed its worker every time; don't run it again
+        exhausted = [entry for entry in entries if entry[2] > STRIPE_WEBHOOK_MAX_DELIVERIES]
+        for _, event, delivered in exhausted:
+            counts["dead_lettered"] += 1
+            self._dead_letter_webhook(event, RuntimeError(f"Still pending after {delivered - 1} deliveries"))
+        webhook_stream.ack([entry_id for entry_id, _, _ in exhausted])
+        entries = [entry for entry in entries if entry[2] <= STRIPE_WEBHOOK_MAX_DELIVERIES]
+        if not entries:
+            return
+
+        events = [event for _, event, _ in entries]
+        try:
+            counts["processed"] += self.process_webhook_batch(db, events)
+            db.commit()
+            webhook_stream.ack([entry_id for entry_id, _, _ in entries])
+            return
+        except Exception:
+            db.rollback()
+            self._release_webhook_events(events)
+            logger.warning("Stripe webhook batch failed, retrying its events one by one", exc_info=True)
+
+        # Isolate the bad event: bad data goes to the DLQ; anything else (e.g. the
+        # database is down) leaves the rest pending for the next drain to reclaim,
+        # until an event fails on its last delivery and is dead-lettered too
+        done = []
+        try:
+            for entry_id, event, delivered in entries:
+                try:
+                    counts["processed"] += self.process_webhook_batch(db, [event])
+                    db.commit()
+                except Exception as exc:
+                    db.rollback()
+                    self._release_webhook_events([event])  # so a retry or DLQ replay is not taken for a duplicate
+                    if not isinstance(exc, ValueError) and delivered < STRIPE_WEBHOOK_MAX_DELIVERIES:
+                        raise
+                    counts["dead_lettered"] += 1
+                    self._dead_letter_webhook(event, exc)
+                done.append(entry_id)
+        finally:
+            webhook_stream.ack(done)
+
+    def _dead_letter_webhook(self, event: dict, exc: Exception) -> None:
+        logger.error("Stripe webhook event dead-lettered: %s", exc, extra={"event_id": event.get("id")})
+        celery_app.send_task(
+            "app.tasks.payment_tasks.dead_letter",
+            args=["app.tasks.payment_tasks.process_stripe_webhook", event.get("id"), [event], str(exc)],
+            queue="payments.dlq",
+        )
+
+    def _claim_webhook_events(self, events: list[dict]) -> list[dict]:
+        """Pipelined SET NX per event id; returns the events not seen before."""
+        try:
+            pipe = redis_client(REDIS_DB_PAYMENTS).pipeline(transaction=False)
+            for event in events:
+                pipe.set(_WEBHOOK_KEY.format(event["id"]), "1", nx=True, ex=_WEBHOOK_DEDUP_TTL)
+            claimed = pipe.execute()
+        except redis.RedisError:
+            logger.warning("Redis unavailable for webhook dedup, processing batch anyway")
+            return list(events)
+        duplicates = [event["id"] for event, fresh in zip(events, claimed) if not fresh]
+        if duplicates:
+            logger.info("Duplicate Stripe webhooks ignored", extra={"event_ids": duplicates})
+        return [event for event, fresh in zip(events, claimed) if fresh]
+
+    def _release_webhook_events(self, events: list[dict]) -> None:
+        """Forget dedup claims for events whose transaction rolled back, so they can be retried."""
+        try:
+            redis_client(REDIS_DB_PAYMENTS).delete(*(_WEBHOOK_KEY.format(event["id"]) for event in events))
+        except redis.RedisError:
+            logger.warning("Redis unavailable, webhook dedup claims not released")
+
+    def _apply_webhook_event(self, db: Session, event: dict, payment: Payment | None) -> Payment | None:
         event_type = event["type"]
         data_object = event["data"]["object"]
 
-        if event_type not in (
-            "payment_intent.succeeded",
-            "payment_intent.processing",
-            "payment_intent.payment_failed",
-            "payment_intent.canceled",
-        ):
+        if event_type in _CONNECT_CACHE_EVENTS or event_type.startswith("payout."):
+            self._invalidate_connect_cache(event)
+            return None
+
+        if event_type not in _PAYMENT_INTENT_EVENTS:
             logger.info("Unhandled Stripe event type ignored", extra={"event_type": event_type})
             return None
 
-        booking_id_str = (data_object.get("metadata") or {}).get("booking_id")
-        if not booking_id_str:
+        booking_id = _webhook_booking_id(event)
+        if not booking_id:
             raise ValueError("No booking_id in webhook metadata")
-
-        booking_id = UUID(booking_id_str)
-        payment = self.payment_repo.get_by_booking(db, booking_id)
         if not payment:
             raise ValueError("Payment not found")
 
         if event_type == "payment_intent.succeeded":
-            payment.status = PaymentStatus.SUCCEEDED
-            payment.stripe_charge_id = data_object.get("latest_charge")
-            self.payment_repo.update(db, payment)
-            self._confirm_booking(db, booking_id)
-            self.trigger_payout_background(booking_id)
-            return payment
+            return self._mark_succeeded(db, payment, data_object.get("latest_charge"))
         elif event_type == "payment_intent.processing":
             payment.status = PaymentStatus.PROCESSING
         else:
@@ -329,6 +696,58 @@ class PaymentService:
 
         return self.payment_repo.update(db, payment)
 
+    def _mark_succeeded(self, db: Session, payment: Payment, charge_id: str | None) -> Payment:
+        payment.status = PaymentStatus.SUCCEEDED
+        payment.stripe_charge_id = charge_id
+        self.payment_repo.update(db, payment)
+        booking = self.booking_repo.get_by_id(db, payment.booking_id)
+        if booking is not None and booking.status in (BookingStatus.CANCELLED, BookingStatus.REJECTED):
+            return self._refund_lapsed_payment(db, payment)
+        self._record_ledger(db, payment, LedgerEntryType.EARNING, float(payment.payout_amount))
+        self._confirm_booking(db, payment.booking_id)
+        return payment
+
+    def _refund_lapsed_payment(self, db: Session, payment: Payment) -> Payment:
+        """Refund a payment that succeeded after its booking was cancelled (e.g. by the expiry sweep).
+
+        The passenger has no seat, so no driver earning is recorded. If the refund
+        fails the payment stays SUCCEEDED on a cancelled booking, which the payout
+        batcher never claims, and is logged for an admin to refund by hand.
+        """
+        try:
+            self._refund_in_full(payment, stripe_client.BACKGROUND)
+        except ValueError as exc:
+            logger.error(
+                "Payment succeeded on a cancelled booking and could not be refunded",
+                extra={"payment_id": str(payment.id), "booking_id": str(payment.booking_id), "error": str(exc)},
+            )
+            return payment
+        logger.warning(
+            "Payment succeeded on a cancelled booking, refunded",
+            extra={"payment_id": str(payment.id), "booking_id": str(payment.booking_id)},
+        )
+        payment.status = PaymentStatus.REFUNDED
+        return self.payment_repo.update(db, payment)
+
+    def _record_ledger(self, db: Session, payment: Payment, entry_type: LedgerEntryType, amount: float) -> None:
+        """Append the driver's ledger entry for a payment; a repeat of the same entry is ignored."""
+        driver_id = self.ledger_repo.driver_for_booking(db, payment.booking_id)
+        if driver_id is None:
+            return
+        self.ledger_repo.append(db, driver_id, entry_type, amount, now_utc(), payment_id=payment.id)
+
+    def _invalidate_connect_cache(self, event: dict) -> None:
+        """Connect events carry the connected account in event.account; account.updated also in the object."""
+        event_type = event["type"]
+        account_id = event.get("account")
+        if not account_id and event_type == "account.updated":
+            account_id = event["data"]["object"].get("id")
+        if not account_id:
+            logger.info("Platform-level Stripe event ignored", extra={"event_type": event_type})
+            return
+        kind = _CONNECT_CACHE_EVENTS.get(event_type, connect_cache.BALANCE)
+        connect_cache.invalidate(account_id, kind)
+
     def handle_webhook(self, db: Session, payload: bytes, sig_header: str) -> Payment | None:
         """Legacy synchronous handler — kept for backwards compatibility. Prefer the queued path."""
         event = self.verify_webhook_signature(payload, sig_header)
@@ -370,58 +789,59 @@ class PaymentService:
             if driver.payment_details:
                 account_id = driver.payment_details
             else:
-                account = stripe.Account.create(
-                    type="custom",
-                    country="GB",
-                    email=driver.email,
-                    business_type="individual",
-                    business_profile={"url": "https://rideway.co.uk"},
-                    capabilities={"transfers": {"requested": True}},
-                    individual={
-                        "first_name": data["first_name"],
-                        "last_name": data["last_name"],
-                        "dob": {
-                            "day": data["dob"]["day"],
-                            "month": data["dob"]["month"],
-                            "year": data["dob"]["year"],
+                with _stripe_call("accounts"):
+                    account = stripe.Account.create(
+                        type="custom",
+                        country="GB",
+                        email=driver.email,
+                        business_type="individual",
+                        business_profile={"url": "https://rideway.co.uk"},
+                        capabilities={"transfers": {"requested": True}},
+                        individual={
+                            "first_name": data["first_name"],
+                            "last_name": data["last_name"],
+                            "dob": {
+                                "day": data["dob"]["day"],
+                                "month": data["dob"]["month"],
+                                "year": data["dob"]["year"],
+                            },
+                            "address": {
+                                "line1": data["address"]["line1"],
+                                "city": data["address"]["city"],
+                                "postal_code": data["address"]["postal_code"],
+                                "country": "GB",
+                            },
+                            "email": driver.email,
+                            "phone": data["phone"],
                         },
-                        "address": {
-                            "line1": data["address"]["line1"],
-                            "city": data["address"]["city"],
-                            "postal_code": data["address"]["postal_code"],
-                            "country": "GB",
+                        tos_acceptance={
+                            "date": int(_time.time()),
+                            "ip": client_ip,
                         },
-                        "email": driver.email,
-                        "phone": data["phone"],
-                    },
-                    tos_acceptance={
-                        "date": int(_time.time()),
-                        "ip": client_ip,
-                    },
-                    metadata={"user_id": str(driver_id)},
-                )
+                        metadata={"user_id": str(driver_id)},
+                    )
                 account_id = account.id
                 driver.payment_details = account_id
                 self.user_repo.update(db, driver)
 
             # Attach UK bank account for payouts
-            stripe.Account.create_external_account(
-                account_id,
-                external_account={
-                    "object": "bank_account",
-                    "country": "GB",
-                    "currency": "gbp",
-                    "account_holder_name": data["account_holder_name"],
-                    "routing_number": data["sort_code"],
-                    "account_number": data["account_number"],
-                },
-                idempotency_key=f"bank:{driver_id}",
-            )
+            with _stripe_call("accounts"):
+                stripe.Account.create_external_account(
+                    account_id,
+                    external_account={
+                        "object": "bank_account",
+                        "country": "GB",
+                        "currency": "gbp",
+                        "account_holder_name": data["account_holder_name"],
+                        "routing_number": data["sort_code"],
+                        "account_number": data["account_number"],
+                    },
+                    idempotency_key=f"bank:{driver_id}",
+                )
 
-            account = stripe.Account.retrieve(account_id)
-            payment_circuit_breaker.record_success()
+            with _stripe_call("accounts"):
+                account = stripe.Account.retrieve(account_id)
         except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
             raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
 
         return {
@@ -444,13 +864,12 @@ class PaymentService:
         try:
             file_obj = io.BytesIO(file_bytes)
             file_obj.name = safe_filename
-            stripe_file = stripe.File.create(
-                purpose="identity_document",
-                file=file_obj,
-            )
-            payment_circuit_breaker.record_success()
+            with _stripe_call("files"):
+                stripe_file = stripe.File.create(
+                    purpose="identity_document",
+                    file=file_obj,
+                )
         except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
             raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
         return {"file_id": stripe_file.id, "message": f"{purpose} uploaded successfully"}
 
@@ -464,13 +883,12 @@ class PaymentService:
         if back_file_id:
             doc["back"] = back_file_id
         try:
-            stripe.Account.modify(
-                driver.payment_details,
-                individual={"verification": {"document": doc}},
-            )
-            payment_circuit_breaker.record_success()
+            with _stripe_call("accounts"):
+                stripe.Account.modify(
+                    driver.payment_details,
+                    individual={"verification": {"document": doc}},
+                )
         except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
             raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
 
     def attach_address_document(self, db: Session, driver_id: UUID, file_id: str) -> None:
@@ -480,13 +898,12 @@ class PaymentService:
         if not driver or not driver.payment_details:
             raise ValueError("Driver has no connected account")
         try:
-            stripe.Account.modify(
-                driver.payment_details,
-                individual={"verification": {"additional_document": {"front": file_id}}},
-            )
-            payment_circuit_breaker.record_success()
+            with _stripe_call("accounts"):
+                stripe.Account.modify(
+                    driver.payment_details,
+                    individual={"verification": {"additional_document": {"front": file_id}}},
+                )
         except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
             raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
 
     def request_payout(self, db: Session, driver_id: UUID, amount: float | None = None) -> dict:
@@ -494,7 +911,7 @@ class PaymentService:
 
         If amount is given, creates a direct Stripe Payout from the connected
         account to their bank for that specific amount (must not exceed available
-        balance). If amount is None, transfers all unpaid bookings as before.
+        balance). If amount is None, transfers all unpaid bookings as one batch.
         """
         self._configured_stripe()
         driver = self.user_repo.get_by_id(db, driver_id)
@@ -507,15 +924,14 @@ class PaymentService:
             # Partial / specific-amount payout — Stripe Payout from connected account to bank
             amount_pence = int(round(amount * 100))
             try:
-                payout = stripe.Payout.create(
-                    amount=amount_pence,
-                    currency=CURRENCY,
-                    stripe_account=driver.payment_details,
-                    idempotency_key=f"manual_payout:{driver_id}:{amount_pence}",
-                )
-                payment_circuit_breaker.record_success()
+                with _stripe_call("payouts"):
+                    payout = stripe.Payout.create(
+                        amount=amount_pence,
+                        currency=CURRENCY,
+                        stripe_account=driver.payment_details,
+                        idempotency_key=f"manual_payout:{driver_id}:{amount_pence}",
+                    )
             except stripe.StripeError as exc:
-                payment_circuit_breaker.record_failure()
                 raise ValueError(f"Payout failed: {exc.user_message or str(exc)}") from exc
             return {
                 "transfers_initiated": 1,
@@ -524,62 +940,94 @@ class PaymentService:
                 "stripe_payout_id": payout.id,
             }
 
-        pending = self.payment_repo.list_unpaid_by_driver(db, driver_id)
-        if not pending:
+        batch = self.payout_driver(db, driver_id, stripe_client.INTERACTIVE)
+        if batch is None:
             return {"transfers_initiated": 0, "total_amount": 0.0, "message": "No pending earnings to pay out"}
-
-        total = 0.0
-        count = 0
-        errors = []
-        for payment in pending:
-            try:
-                self.create_payout_for_booking(db, payment.booking_id)
-                total += float(payment.payout_amount)
-                count += 1
-            except ValueError as exc:
-                logger.warning("Payout skipped for booking %s: %s", payment.booking_id, exc)
-                errors.append(str(exc))
-
         return {
-            "transfers_initiated": count,
-            "total_amount": round(total, 2),
-            "message": f"{count} payout(s) initiated" + (f"; {len(errors)} skipped" if errors else ""),
+            "transfers_initiated": 1,
+            "total_amount": round(float(batch.amount), 2),
+            "message": f"Payout of £{float(batch.amount):.2f} initiated for {batch.payment_count} booking(s)",
         }
 
+    def get_driver_earnings(self, db: Session, driver_id: UUID) -> DriverBalance:
+        """Current totals from the driver's balance row — no scan of their payment history."""
+        return self.ledger_repo.get_balance(db, driver_id) or DriverBalance(
+            driver_id=driver_id, balance=0, total_earned=0, total_refunded=0, total_transferred=0
+        )
+
+    def list_driver_payouts(self, db: Session, driver_id: UUID, limit: int, cursor: str | None = None) -> list[Payment]:
+        return self.payment_repo.list_payouts_by_driver(db, driver_id, limit=limit, cursor=decode_cursor(cursor))
+
+    def list_driver_ledger(
+        self, db: Session, driver_id: UUID, limit: int, cursor: str | None = None
+    ) -> list[DriverLedgerEntry]:
+        return self.ledger_repo.list_by_driver(db, driver_id, limit=limit, cursor=decode_cursor(cursor))
+
     def get_connect_status(self, db: Session, driver_id: UUID) -> dict:
         """Return Stripe Connect onboarding status for the driver."""
-        self._configured_stripe()
         driver = self.user_repo.get_by_id(db, driver_id)
         if not driver:
             raise ValueError("User not found")
         if not driver.payment_details:
             return {"connected": False, "charges_enabled": False, "payouts_enabled": False, "account_id": None}
-        try:
-            account = stripe.Account.retrieve(driver.payment_details)
-            payment_circuit_breaker.record_success()
-        except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
-            raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
-        return {
-            "connected": account.get("charges_enabled", False),
-            "charges_enabled": account.get("charges_enabled", False),
-            "payouts_enabled": account.get("payouts_enabled", False),
-            "account_id": driver.payment_details,
-        }
+        return self._cached_connect_lookup(connect_cache.STATUS, driver.payment_details)
 
     def get_connect_balance(self, db: Session, driver_id: UUID) -> dict:
         """Return available and pending balance from the driver's Stripe connected account."""
-        self._configured_stripe()
         driver = self.user_repo.get_by_id(db, driver_id)
         if not driver:
             raise ValueError("User not found")
         if not driver.payment_details:
             raise ValueError("No Stripe account found. Complete onboarding first.")
+        return self._cached_connect_lookup(connect_cache.BALANCE, driver.payment_details)
+
+    def _cached_connect_lookup(self, kind: str, account_id: str) -> dict:
+        """Serve a Connect lookup from cache; a stale hit is served while one refresh is queued."""
+        cached = connect_cache.get(kind, account_id)
+        if cached is not None:
+            value, fresh = cached
+            if not fresh and connect_cache.claim_refresh(kind, account_id):
+                self.trigger_connect_refresh_background(kind, account_id)
+            return value
+        value = self._fetch_connect(kind, account_id)
+        connect_cache.put(kind, account_id, value)
+        return value
+
+    def trigger_connect_refresh_background(self, kind: str, account_id: str) -> None:
+        try:
+            celery_app.send_task("app.tasks.payment_tasks.refresh_connect_cache", args=[kind, account_id])
+        except Exception as exc:
+            connect_cache.release_refresh(kind, account_id)
+            logger.warning("Could not queue Connect %s refresh for %s: %s", kind, account_id, exc)
+
+    def refresh_connect_cache(self, kind: str, account_id: str) -> None:
+        """Celery: replace a stale cached Connect lookup with a live one."""
+        try:
+            value = self._fetch_connect(kind, account_id, stripe_client.BACKGROUND)
+            connect_cache.put(kind, account_id, value)
+        finally:
+            connect_cache.release_refresh(kind, account_id)
+
+    def _fetch_connect(
+        self, kind: str, account_id: str, profile: stripe_client.CallProfile = stripe_client.INTERACTIVE
+    ) -> dict:
+        self._configured_stripe()
+        if kind == connect_cache.STATUS:
+            try:
+                with _stripe_call("accounts", profile):
+                    account = stripe.Account.retrieve(account_id)
+            except stripe.StripeError as exc:
+                raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
+            return {
+                "connected": account.get("charges_enabled", False),
+                "charges_enabled": account.get("charges_enabled", False),
+                "payouts_enabled": account.get("payouts_enabled", False),
+                "account_id": account_id,
+            }
         try:
-            balance = stripe.Balance.retrieve(stripe_account=driver.payment_details)
-            payment_circuit_breaker.record_success()
+            with _stripe_call("balance", profile):
+                balance = stripe.Balance.retrieve(stripe_account=account_id)
         except stripe.StripeError as exc:
-            payment_circuit_breaker.record_failure()
             raise ValueError(f"Stripe error: {exc.user_message or str(exc)}") from exc
         available = sum(b["amount"] for b in balance["available"]) / 100
         pending = sum(b["amount"] for b in balance["pending"]) / 100
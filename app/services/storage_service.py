@@ -1,6 +1,16 @@
 import base64
+import hashlib
+import io
 import json
-from datetime import timedelta
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
 from uuid import uuid4
 
 from google.cloud import storage
@@ -8,6 +18,8 @@ from google.oauth2 import service_account
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 # Folders whose content is always publicly accessible (profile/vehicle photos)
 _PUBLIC_FOLDERS = {"avatars", "vehicles"}
 
@@ -15,24 +27,86 @@ _PUBLIC_FOLDERS = {"avatars", "vehicles"}
 _PRIVATE_FOLDERS = {"driver_licences", "selfies", "id_documents"}
 
 
+_PUBLIC_URL_PREFIX = "https://storage.googleapis.com/"
+
+# Resumable uploads send the stream in chunks of this size (must be a multiple of 256 KiB),
+# so memory stays bounded whatever the file size
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+_LOCAL_COPY_BUFFER = 1024 * 1024
+
+# Signing is local RSA work, so a small pool parallelises it across a page of URLs
+_SIGNING_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gcs-sign")
+
+
+@lru_cache(maxsize=4)
+def _gcs_client(credentials_json: str, project_id: str) -> storage.Client:
+    """Process-wide client per credential set — built once instead of per call."""
+    if credentials_json:
+        info = json.loads(base64.b64decode(credentials_json).decode("utf-8"))
+        return storage.Client.from_service_account_info(info, project=project_id or None)
+    return storage.Client(project=project_id or None)
+
+
+@lru_cache(maxsize=4)
+def _signing_credentials(credentials_json: str):
+    """Service account credentials (needed for signed URL generation), parsed once."""
+    if credentials_json:
+        info = json.loads(base64.b64decode(credentials_json).decode("utf-8"))
+        return service_account.Credentials.from_service_account_info(info)
+    return None
+
+
+def stream_size(fileobj: BinaryIO) -> int:
+    """Size of a seekable stream without reading it; leaves the position at the start."""
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def content_hash(fileobj: BinaryIO) -> str:
+    """SHA-256 hex digest of a seekable stream, read in chunks; leaves the position at the start."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(_LOCAL_COPY_BUFFER), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _expiry_window(expiry_minutes: int) -> int:
+    """Seconds a cached signed URL is reused for — a third of its lifetime, at least a minute."""
+    return max(60, expiry_minutes * 60 // 3)
+
+
+@lru_cache(maxsize=4096)
+def _cached_signed_url(gcs_path: str, expiry_minutes: int, window_index: int) -> str:
+    """Sign once per (path, expiry bucket).
+
+    Every URL in a bucket expires at bucket start + expiry, so a cached URL is
+    never valid for longer than requested and always has at least two thirds
+    of its lifetime left when served. Identical URLs also let browsers cache
+    the images between page loads.
+    """
+    settings = get_settings()
+    window_start = window_index * _expiry_window(expiry_minutes)
+    expires_at = datetime.fromtimestamp(window_start + expiry_minutes * 60, tz=timezone.utc)
+    bucket_name, _, blob_name = gcs_path[len("gs://"):].partition("/")
+    client = _gcs_client(settings.gcp_credentials_json, settings.gcp_project_id)
+    blob = client.bucket(bucket_name).blob(blob_name)
+    return blob.generate_signed_url(
+        expiration=expires_at,
+        method="GET",
+        credentials=_signing_credentials(settings.gcp_credentials_json),
+    )
+
+
 class StorageService:
     def __init__(self) -> None:
         self.settings = get_settings()
 
     def _client(self) -> storage.Client:
-        if self.settings.gcp_credentials_json:
-            raw = base64.b64decode(self.settings.gcp_credentials_json).decode("utf-8")
-            info = json.loads(raw)
-            return storage.Client.from_service_account_info(info, project=self.settings.gcp_project_id or None)
-        return storage.Client(project=self.settings.gcp_project_id or None)
-
-    def _credentials(self):
-        """Return service account credentials (needed for signed URL generation)."""
-        if self.settings.gcp_credentials_json:
-            raw = base64.b64decode(self.settings.gcp_credentials_json).decode("utf-8")
-            info = json.loads(raw)
-            return service_account.Credentials.from_service_account_info(info)
-        return None
+        return _gcs_client(self.settings.gcp_credentials_json, self.settings.gcp_project_id)
 
     def upload_bytes(
         self,
@@ -40,42 +114,92 @@ class StorageService:
         content_type: str,
         folder: str | None = None,
     ) -> str:
-        """Upload bytes and return a URL.
+        """Upload bytes and return a URL. See upload_stream()."""
+        return self.upload_stream(io.BytesIO(content), content_type, folder=folder)
+
+    def upload_stream(
+        self,
+        fileobj: BinaryIO,
+        content_type: str,
+        folder: str | None = None,
+    ) -> str:
+        """Upload a seekable stream (e.g. UploadFile.file) and return a URL.
 
         Public folders (avatars, vehicles) return a permanent public URL.
         Private folders (driver_licences, selfies, id_documents) return the
         GCS object path (gs://bucket/path) — call signed_url() to get a
         time-limited link when you actually need to display the file.
+
+        GCS uploads are resumable and read the stream chunk by chunk. With
+        STORAGE_BACKEND=local the file is copied under LOCAL_STORAGE_DIR
+        and a file:// URL is returned.
         """
-        if not self.settings.gcp_storage_bucket:
-            raise ValueError("GCP storage bucket missing")
-        client = self._client()
-        bucket = client.bucket(self.settings.gcp_storage_bucket)
         folder_name = folder.strip("/") if folder else ""
         blob_name = f"{folder_name}/{uuid4()}" if folder_name else str(uuid4())
-        blob = bucket.blob(blob_name)
-        blob.upload_from_string(content, content_type=content_type)
+        if self.settings.storage_backend == "local":
+            return self._upload_local(fileobj, blob_name)
+        if not self.settings.gcp_storage_bucket:
+            raise ValueError("GCP storage bucket missing")
+        bucket = self._client().bucket(self.settings.gcp_storage_bucket)
+        blob = bucket.blob(blob_name, chunk_size=_UPLOAD_CHUNK_SIZE)
+        blob.upload_from_file(fileobj, content_type=content_type, rewind=True)
 
         blob.make_public()
         return blob.public_url
 
+    def _upload_local(self, fileobj: BinaryIO, blob_name: str) -> str:
+        path = Path(self.settings.local_storage_dir) / blob_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fileobj.seek(0)
+        with path.open("wb") as out:
+            shutil.copyfileobj(fileobj, out, _LOCAL_COPY_BUFFER)
+        return path.as_uri()
+
+    def download_bytes(self, url: str) -> bytes:
+        """Fetch an object previously returned by upload_stream()/upload_bytes()."""
+        if url.startswith("file://"):
+            return Path(url[len("file://"):]).read_bytes()
+        for prefix in ("gs://", _PUBLIC_URL_PREFIX):
+            if url.startswith(prefix):
+                bucket_name, _, blob_name = url[len(prefix):].partition("/")
+                return self._client().bucket(bucket_name).blob(blob_name).download_as_bytes()
+        raise ValueError("Not a storage URL")
+
+    def delete(self, url: str) -> None:
+        """Remove an object previously returned by upload_stream()/upload_bytes()."""
+        if url.startswith("file://"):
+            Path(url[len("file://"):]).unlink(missing_ok=True)
+            return
+        for prefix in ("gs://", _PUBLIC_URL_PREFIX):
+            if url.startswith(prefix):
+                bucket_name, _, blob_name = url[len(prefix):].partition("/")
+                self._client().bucket(bucket_name).blob(blob_name).delete()
+                return
+        raise ValueError("Not a storage URL")
+
     def signed_url(self, gcs_path: str, expiry_minutes: int = 15) -> str:
         """Generate a time-limited signed URL for a private GCS object.
 
         Pass the gs://bucket/path string returned by upload_bytes() for
-        private folders. Returns a URL valid for `expiry_minutes` minutes.
+        private folders. Returns a URL valid for at most `expiry_minutes`
+        minutes; repeat calls within the same expiry bucket hit the cache.
         """
         if not gcs_path.startswith("gs://"):
             # Already a public URL — return as-is
             return gcs_path
-        without_scheme = gcs_path[len("gs://"):]
-        bucket_name, _, blob_name = without_scheme.partition("/")
-        credentials = self._credentials()
-        client = self._client()
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        return blob.generate_signed_url(
-            expiration=timedelta(minutes=expiry_minutes),
-            method="GET",
-            credentials=credentials,
-        )
+        window_index = int(time.time() // _expiry_window(expiry_minutes))
+        return _cached_signed_url(gcs_path, expiry_minutes, window_index)
+
+    def signed_urls(self, gcs_paths, expiry_minutes: int = 15) -> dict[str, str]:
+        """Sign many paths concurrently. Returns {path: url}; a path that fails
+        to sign maps to itself so one bad object never breaks a whole page."""
+
+        def _sign(path: str) -> str:
+            try:
+                return self.signed_url(path, expiry_minutes=expiry_minutes)
+            except Exception:
+                logger.warning("Failed to sign storage URL", extra={"path": path}, exc_info=True)
+                return path
+
+        paths = list(dict.fromkeys(p for p in gcs_paths if p))
+        return dict(zip(paths, _SIGNING_POOL.map(_sign, paths)))
@@ -0,0 +1,144 @@
+"""Process-wide Stripe HTTP client with per-operation timeouts.
+
+Every Stripe call in the process goes through one shared requests.Session, so
+keep-alive connections to Stripe are reused instead of being rebuilt per call.
+Each call runs under a profile: INTERACTIVE for request paths (short read
+timeout, one retry) and BACKGROUND for Celery work such as payouts (long read
+timeout, more retries). Timeouts are split into connect and read.
+
+Latency per endpoint is kept as a histogram in Redis so all workers add up:
+  rideway:stripe:latency → hash of "{endpoint}:le_{ms}" / "{endpoint}:count" / "{endpoint}:sum_ms" → count
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+
+import redis
+import requests
+import stripe
+from requests.adapters import HTTPAdapter
+
+from app.core.constants import (
+    STRIPE_BACKGROUND_MAX_RETRIES,
+    STRIPE_BACKGROUND_READ_TIMEOUT_SECONDS,
+    STRIPE_CONNECT_TIMEOUT_SECONDS,
+    STRIPE_HTTP_POOL_SIZE,
+    STRIPE_INTERACTIVE_MAX_RETRIES,
+    STRIPE_INTERACTIVE_READ_TIMEOUT_SECONDS,
+)
+from app.core.redis_client import REDIS_DB_PAYMENTS, redis_client
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_KEY = "rideway:stripe:latency"
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+@dataclass(frozen=True)
+class CallProfile:
+    connect_seconds: float
+    read_seconds: float
+    max_retries: int
+
+
+INTERACTIVE = CallProfile(
+    STRIPE_CONNECT_TIMEOUT_SECONDS, STRIPE_INTERACTIVE_READ_TIMEOUT_SECONDS, STRIPE_INTERACTIVE_MAX_RETRIES
+)
+BACKGROUND = CallProfile(
+    STRIPE_CONNECT_TIMEOUT_SECONDS, STRIPE_BACKGROUND_READ_TIMEOUT_SECONDS, STRIPE_BACKGROUND_MAX_RETRIES
+)
+
+_profile: ContextVar[CallProfile] = ContextVar("stripe_call_profile", default=INTERACTIVE)
+
+
+class _PooledRequestsClient(stripe.RequestsClient):
+    """RequestsClient whose timeout and retry budget come from the current call profile."""
+
+    @property
+    def _timeout(self) -> tuple[float, float]:
+        profile = _profile.get()
+        return (profile.connect_seconds, profile.read_seconds)
+
+    @_timeout.setter
+    def _timeout(self, value) -> None:
+        pass  # assigned by RequestsClient.__init__; the call profile decides instead
+
+    def request_with_retries(self, method, url, headers, post_data=None, max_network_retries=None, *, _usage=None):
+        return super().request_with_retries(
+            method, url, headers, post_data, _profile.get().max_retries, _usage=_usage
+        )
+
+
+@lru_cache
+def http_client() -> stripe.HTTPClient:
+    """The process's Stripe HTTP client; its session is shared by every thread."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=STRIPE_HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)  # local Stripe stand-in
+    return _PooledRequestsClient(session=session, proxy=stripe.proxy)
+
+
+def configure(secret_key: str) -> None:
+    stripe.api_key = secret_key
+    if stripe.default_http_client is not http_client():
+        stripe.default_http_client = http_client()
+
+
+def _bucket(elapsed_ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if elapsed_ms <= bound:
+            return f"le_{bound}"
+    return "le_inf"
+
+
+def observe(endpoint: str, elapsed_ms: float) -> None:
+    try:
+        pipe = redis_client(REDIS_DB_PAYMENTS).pipeline(transaction=False)
+        pipe.hincrby(_LATENCY_KEY, f"{endpoint}:{_bucket(elapsed_ms)}", 1)
+        pipe.hincrby(_LATENCY_KEY, f"{endpoint}:count", 1)
+        pipe.hincrby(_LATENCY_KEY, f"{endpoint}:sum_ms", int(round(elapsed_ms)))
+        pipe.execute()
+    except redis.RedisError:
+        logger.debug("Redis unavailable, Stripe latency for %s not recorded", endpoint)
+
+
+@contextmanager
+def call(endpoint: str, profile: CallProfile = INTERACTIVE) -> Iterator[None]:
+    """Run the block's Stripe request(s) under `profile` and time them as `endpoint`."""
+    token = _profile.set(profile)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _profile.reset(token)
+        observe(endpoint, (time.perf_counter() - started) * 1000)
+
+
+def latency_histograms() -> dict:
+    """Cumulative latency histogram per endpoint, Prometheus-style buckets."""
+    raw = redis_client(REDIS_DB_PAYMENTS).hgetall(_LATENCY_KEY)
+    histograms: dict[str, dict] = {}
+    for field, value in raw.items():
+        endpoint, _, name = field.rpartition(":")
+        entry = histograms.setdefault(endpoint, {"count": 0, "sum_ms": 0, "counts": {}})
+        if name in ("count", "sum_ms"):
+            entry[name] = int(value)
+        else:
+            entry["counts"][name] = int(value)
+
+    labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+    for entry in histograms.values():
+        counts = entry.pop("counts")
+        running = 0
+        buckets = {}
+        for label in labels:
+            running += counts.get(label, 0)
+            buckets[label] = running
+        entry["buckets"] = buckets
+    return histograms
@@ -5,18 +5,30 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session
 
-from app.core.constants import BookingMode, BookingStatus, TripStatus
-from app.models.booking import Booking
+from app.core.constants import BookingMode, TripStatus
+from app.core.database import run_after_commit
 from app.models.trip import Trip
 from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
 from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
 from app.utils.datetime import ensure_utc, now_utc
 from app.utils.pagination import normalize_pagination
 
 
 class TripService:
-    def __init__(self, trip_repo: TripRepository) -> None:
+    def __init__(
+        self,
+        trip_repo: TripRepository,
+        booking_repo: BookingRepository | None = None,
+        user_repo: UserRepository | None = None,
+        payment_service=None,
+    ) -> None:
         self.trip_repo = trip_repo
+        self.booking_repo = booking_repo or BookingRepository()
+        self.user_repo = user_repo or UserRepository()
+        # Optional — when set, trip completion dispatches one grouped payout task
+        self.payment_service = payment_service
 
     def get_trip(self, db: Session, trip_id: UUID) -> dict:
         trip = self.trip_repo.get_by_id(db, trip_id)
@@ -77,31 +89,16 @@ class TripService:
             raise ValueError(f"Trip cannot be completed from status: {trip.trip_status}")
         trip.trip_status = TripStatus.COMPLETED
         trip.completed_at = now_utc()
-        # Mark all confirmed bookings as completed
-        from sqlalchemy import select as _select
-        confirmed = list(
-            db.execute(
-                _select(Booking).where(
-                    Booking.trip_id == trip_id,
-                    Booking.status == BookingStatus.CONFIRMED,
-                )
-            ).scalars().all()
-        )
-        passenger_ids = {b.passenger_id for b in confirmed}
-        for booking in confirmed:
-            booking.status = BookingStatus.COMPLETED
-            db.add(booking)
-
-        from app.models.user import User as _User
-        from sqlalchemy import select as _sel2
-        affected_ids = list(passenger_ids | {trip.driver_id})
-        users = db.execute(_sel2(_User).where(_User.id.in_(affected_ids))).scalars().all()
-        for u in users:
-            u.trips_completed += 1
-            db.add(u)
-
-        db.flush()
+        # Mark all confirmed bookings as completed and bump every participant's
+        # trips_completed — two set-based statements regardless of passenger count
+        completed = self.booking_repo.complete_confirmed_for_trip(db, trip_id, trip.completed_at)
+        affected_ids = {row.passenger_id for row in completed} | {trip.driver_id}
+        self.user_repo.increment_trips_completed(db, affected_ids)
+
         updated = self.trip_repo.update(db, trip)
+        if completed and self.payment_service is not None:
+            # Queued only once the COMPLETED rows are committed, or the worker could find nothing to pay
+            run_after_commit(db, lambda: self.payment_service.trigger_trip_payouts_background(trip_id))
         return self._to_response(db, updated)
 
     def cancel_trip(self, db: Session, driver: User, trip_id: UUID) -> dict:
@@ -1,30 +1,50 @@
 """User service."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 import logging
 import re
 import secrets
+from typing import BinaryIO
 
 logger = logging.getLogger(__name__)
 from uuid import UUID
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.celery_app import celery_app
 from app.core.config import get_settings
-from app.core.constants import IdentityVerificationStatus
+from app.core.constants import (
+    LICENCE_OCR_BACKLOG_GRACE_SECONDS,
+    LICENCE_OCR_BACKLOG_LIMIT,
+    LICENCE_OCR_MAX_CONCURRENCY,
+    IdentityVerificationStatus,
+    LicenceOcrStatus,
+)
+from app.core.database import run_after_commit
+from app.models.stored_object import StoredObject
 from app.models.user import User
 from app.utils.uk_licence import validate_uk_licence
 from app.repositories.booking_repo import BookingRepository
+from app.repositories.stored_object_repo import StoredObjectRepository
 from app.repositories.user_repo import UserRepository
-from app.services.storage_service import StorageService
+from app.services.storage_service import StorageService, content_hash, stream_size
+from app.services.vision_service import VISION_BATCH_LIMIT
 from app.utils.datetime import ensure_utc, now_utc
 from app.utils.pagination import normalize_pagination
 
 
 class UserService:
-    def __init__(self, user_repo: UserRepository, booking_repo: BookingRepository) -> None:
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        booking_repo: BookingRepository,
+        stored_object_repo: StoredObjectRepository | None = None,
+    ) -> None:
         self.user_repo = user_repo
         self.booking_repo = booking_repo
+        self.stored_object_repo = stored_object_repo or StoredObjectRepository()
         self.storage_service = StorageService()
 
     def get_user(self, db: Session, user_id: UUID) -> User:
@@ -51,23 +71,46 @@ class UserService:
                 setattr(user, key, value)
         return self.user_repo.update(db, user)
 
-    def update_avatar(self, db: Session, user: User, content: bytes, content_type: str | None) -> User:
+    def update_avatar(self, db: Session, user: User, file: BinaryIO, content_type: str | None) -> User:
         if not content_type or not content_type.startswith("image/"):
             raise ValueError("Avatar must be an image")
-        if len(content) > 5 * 1024 * 1024:
+        if stream_size(file) > 5 * 1024 * 1024:
             raise ValueError("Avatar file too large")
-        photo_url = self.storage_service.upload_bytes(content, content_type, folder="avatars")
+        photo_url = self.storage_service.upload_stream(file, content_type, folder="avatars")
         user.profile_photo_url = photo_url
-        return self.user_repo.update(db, user)
+        user.profile_photo_variants = None
+        updated = self.user_repo.update(db, user)
+        self._queue_photo_variants(db, user, "avatar", photo_url)
+        return updated
 
-    def update_vehicle_photo(self, db: Session, user: User, content: bytes, content_type: str | None) -> User:
+    def update_vehicle_photo(self, db: Session, user: User, file: BinaryIO, content_type: str | None) -> User:
         if not content_type or not content_type.startswith("image/"):
             raise ValueError("Vehicle photo must be an image")
-        if len(content) > 5 * 1024 * 1024:
+        if stream_size(file) > 5 * 1024 * 1024:
             raise ValueError("Vehicle photo file too large")
-        photo_url = self.storage_service.upload_bytes(content, content_type, folder="vehicles")
+        photo_url = self.storage_service.upload_stream(file, content_type, folder="vehicles")
         user.vehicle_photo_url = photo_url
-        return self.user_repo.update(db, user)
+        user.vehicle_photo_variants = None
+        updated = self.user_repo.update(db, user)
+        self._queue_photo_variants(db, user, "vehicle", photo_url)
+        return updated
+
+    @staticmethod
+    def _queue_photo_variants(db: Session, user: User, kind: str, photo_url: str) -> None:
+        user_id = str(user.id)
+
+        def _send() -> None:
+            try:
+                celery_app.send_task(
+                    "app.tasks.media_tasks.generate_photo_variants",
+                    args=[user_id, kind, photo_url],
+                )
+            except Exception:
+                # Variants are an optimisation — clients fall back to the original URL
+                logger.warning("Could not queue photo variants", extra={"user_id": user_id, "kind": kind})
+
+        # Queued once the new URL is committed; a rolled-back upload queues nothing
+        run_after_commit(db, _send)
 
     def list_users(
         self,
@@ -233,20 +276,19 @@ class UserService:
         db: Session,
         user: User,
         licence_number: str,
-        content: bytes,
+        file: BinaryIO,
         content_type: str | None,
         email_service=None,
-        vision_service=None,
-        back_content: bytes | None = None,
+        back_file: BinaryIO | None = None,
         back_content_type: str | None = None,
     ) -> User:
         if not content_type or not content_type.startswith("image/"):
             raise ValueError("Driver licence front photo must be an image")
-        if len(content) > 10 * 1024 * 1024:
+        if stream_size(file) > 10 * 1024 * 1024:
             raise ValueError("File too large (max 10 MB)")
-        if back_content and (not back_content_type or not back_content_type.startswith("image/")):
+        if back_file and (not back_content_type or not back_content_type.startswith("image/")):
             raise ValueError("Driver licence back photo must be an image")
-        if back_content and len(back_content) > 10 * 1024 * 1024:
+        if back_file and stream_size(back_file) > 10 * 1024 * 1024:
             raise ValueError("Back photo too large (max 10 MB)")
         is_valid, reason = validate_uk_licence(
             licence_number,
@@ -255,27 +297,18 @@ class UserService:
         )
         if not is_valid:
             raise ValueError(f"Licence validation failed: {reason}")
-        if vision_service is not None:
-            try:
-                extracted = vision_service.extract_licence_number(content)
-                normalised = licence_number.replace(" ", "").upper()
-                if extracted and extracted != normalised:
-                    raise ValueError(
-                        f"Photo does not match submitted licence number "
-                        f"(detected {extracted}, submitted {normalised})"
-                    )
-            except ValueError:
-                raise
-            except Exception:
-                pass  # OCR unavailable — fall back to admin manual review
-        url = self.storage_service.upload_bytes(content, content_type, folder="driver_licences")
-        user.driver_license_url = url
-        if back_content and back_content_type:
-            back_url = self.storage_service.upload_bytes(back_content, back_content_type, folder="driver_licences")
-            user.driver_license_back_url = back_url
+        front = self._store_document(db, user, file, content_type, "driver_licences")
+        user.driver_license_url = front.url
+        if back_file and back_content_type:
+            back = self._store_document(db, user, back_file, back_content_type, "driver_licences")
+            user.driver_license_back_url = back.url
         user.driver_license_number = licence_number.replace(" ", "").upper()
         user.identity_verification_status = IdentityVerificationStatus.PENDING
+        user.licence_ocr_status = LicenceOcrStatus.PENDING
+        user.licence_ocr_checked_at = None
+        user.updated_at = now_utc()  # submission time — orders the verification queue
         updated = self.user_repo.update(db, user)
+        self._queue_licence_ocr(db, user, front)
         if email_service:
             settings = get_settings()
             full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
@@ -292,28 +325,185 @@ class UserService:
             )
         return updated
 
-    def submit_selfie(self, db: Session, user: User, content: bytes, content_type: str | None) -> User:
+    @staticmethod
+    def _queue_licence_ocr(db: Session, user: User, front: StoredObject) -> None:
+        user_id, stored_object_id = str(user.id), str(front.id)
+
+        def _send() -> None:
+            try:
+                celery_app.send_task(
+                    "app.tasks.verification_tasks.verify_licence_ocr",
+                    args=[user_id, stored_object_id],
+                )
+            except Exception:
+                # The licence stays PENDING for admin manual review
+                logger.warning("Could not queue licence OCR", extra={"user_id": user_id})
+
+        # Queued once the submission and its stored object are committed
+        run_after_commit(db, _send)
+
+    def apply_licence_ocr(
+        self,
+        db: Session,
+        user_id: UUID,
+        stored_object_id: UUID,
+        vision_service,
+        email_service=None,
+    ) -> LicenceOcrStatus | None:
+        """Compare the licence number read from the front photo with the one submitted.
+
+        OCR results are memoized on the stored object, so re-submitting the same
+        photo never calls Vision twice. Returns None when the user has since
+        uploaded a different photo.
+        """
+        user = self.user_repo.get_by_id(db, user_id)
+        stored = self.stored_object_repo.get_by_id(db, stored_object_id)
+        if user is None or stored is None or user.driver_license_url != stored.url:
+            return None
+        if stored.ocr_checked_at is None:
+            stored.ocr_licence_number = vision_service.extract_licence_number(
+                self.storage_service.download_bytes(stored.url)
+            )
+            stored.ocr_checked_at = now_utc()
+            self.stored_object_repo.update(db, stored)
+        return self.record_licence_ocr(db, user, stored.ocr_licence_number, email_service)
+
+    def record_licence_ocr(
+        self, db: Session, user: User, extracted: str | None, email_service=None,
+    ) -> LicenceOcrStatus:
+        """Store the OCR result for the user's current licence photo; a mismatch rejects a pending submission."""
+        stored = self.stored_object_repo.get_by_url(db, user.id, user.driver_license_url)
+        if stored is not None and stored.ocr_checked_at is None:
+            stored.ocr_licence_number = extracted
+            stored.ocr_checked_at = now_utc()
+            self.stored_object_repo.update(db, stored)
+        if not extracted:
+            status = LicenceOcrStatus.UNREADABLE
+        elif extracted == user.driver_license_number:
+            status = LicenceOcrStatus.MATCHED
+        else:
+            status = LicenceOcrStatus.MISMATCHED
+        user.licence_ocr_status = status
+        user.licence_ocr_checked_at = now_utc()
+        if status == LicenceOcrStatus.MISMATCHED and user.identity_verification_status == IdentityVerificationStatus.PENDING:
+            reason = (
+                f"Photo does not match submitted licence number "
+                f"(detected {extracted}, submitted {user.driver_license_number})"
+            )
+            user.identity_verified = False
+            user.identity_verification_status = IdentityVerificationStatus.REJECTED
+            if email_service:
+                email_service.send_verification_rejected_email(
+                    email=user.email,
+                    first_name=user.first_name or "there",
+                    reason=reason,
+                )
+        self.user_repo.update(db, user)
+        return status
+
+    def process_licence_ocr_backlog(
+        self, db: Session, vision_service, email_service=None, limit: int = LICENCE_OCR_BACKLOG_LIMIT,
+    ) -> dict:
+        """OCR pending licences that were never checked, in Vision batches.
+
+        Photos already OCR'd (same content hash) reuse the memoized result.
+        The rest are sent in groups of VISION_BATCH_LIMIT, at most
+        LICENCE_OCR_MAX_CONCURRENCY groups in flight, and each finished group
+        is committed so a failure only loses that group — it is picked up
+        again on the next run.
+        """
+        counts = {status.value: 0 for status in LicenceOcrStatus if status != LicenceOcrStatus.PENDING}
+        counts["failed"] = 0
+        to_ocr: list[User] = []
+        submitted_before = now_utc() - timedelta(seconds=LICENCE_OCR_BACKLOG_GRACE_SECONDS)
+        for user in self.user_repo.list_licence_ocr_backlog(db, submitted_before, limit):
+            stored = self.stored_object_repo.get_by_url(db, user.id, user.driver_license_url)
+            if stored is not None and stored.ocr_checked_at is not None:
+                counts[self.record_licence_ocr(db, user, stored.ocr_licence_number, email_service)] += 1
+            else:
+                to_ocr.append(user)
+        db.commit()
+
+        def _ocr_group(urls: list[str]) -> list[str | None]:
+            return vision_service.extract_licence_numbers(
+                [self.storage_service.download_bytes(url) for url in urls]
+            )
+
+        groups = [to_ocr[i:i + VISION_BATCH_LIMIT] for i in range(0, len(to_ocr), VISION_BATCH_LIMIT)]
+        with ThreadPoolExecutor(max_workers=LICENCE_OCR_MAX_CONCURRENCY, thread_name_prefix="licence-ocr") as pool:
+            futures = {pool.submit(_ocr_group, [u.driver_license_url for u in group]): group for group in groups}
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    results = future.result()
+                except Exception as exc:
+                    logger.error("Licence OCR batch failed: %s", exc, extra={"batch_size": len(group)})
+                    counts["failed"] += len(group)
+                    continue
+                for user, extracted in zip(group, results):
+                    counts[self.record_licence_ocr(db, user, extracted, email_service)] += 1
+                db.commit()
+        return counts
+
+    def submit_selfie(self, db: Session, user: User, file: BinaryIO, content_type: str | None) -> User:
         if not content_type or not content_type.startswith("image/"):
             raise ValueError("Selfie must be an image")
-        if len(content) > 10 * 1024 * 1024:
+        if stream_size(file) > 10 * 1024 * 1024:
             raise ValueError("Selfie file too large")
-        url = self.storage_service.upload_bytes(content, content_type, folder="selfies")
-        user.selfie_url = url
+        user.selfie_url = self._store_document(db, user, file, content_type, "selfies").url
         if user.identity_verification_status is None:
             user.identity_verification_status = IdentityVerificationStatus.PENDING
         return self.user_repo.update(db, user)
 
-    def submit_id_document(self, db: Session, user: User, content: bytes, content_type: str | None) -> User:
+    def submit_id_document(self, db: Session, user: User, file: BinaryIO, content_type: str | None) -> User:
         if not content_type or not content_type.startswith("image/"):
             raise ValueError("ID document must be an image")
-        if len(content) > 10 * 1024 * 1024:
+        if stream_size(file) > 10 * 1024 * 1024:
             raise ValueError("ID document file too large")
-        url = self.storage_service.upload_bytes(content, content_type, folder="id_documents")
-        user.id_document_url = url
+        user.id_document_url = self._store_document(db, user, file, content_type, "id_documents").url
         if user.identity_verification_status is None:
             user.identity_verification_status = IdentityVerificationStatus.PENDING
         return self.user_repo.update(db, user)
 
+    def _store_document(
+        self,
+        db: Session,
+        user: User,
+        file: BinaryIO,
+        content_type: str,
+        folder: str,
+        digest: str | None = None,
+    ) -> StoredObject:
+        """Upload `file` unless this user already stored identical content in `folder`."""
+        digest = digest or content_hash(file)
+        stored = self.stored_object_repo.get_by_hash(db, user.id, folder, digest)
+        if stored is not None:
+            return stored
+        url = self.storage_service.upload_stream(file, content_type, folder=folder)
+        try:
+            with db.begin_nested():
+                return self.stored_object_repo.create(db, StoredObject(
+                    owner_id=user.id,
+                    folder=folder,
+                    sha256=digest,
+                    url=url,
+                    content_type=content_type,
+                    size_bytes=stream_size(file),
+                ))
+        except IntegrityError:
+            # A concurrent upload of the same content won the unique key; keep its row, drop our blob
+            self._discard_upload(url)
+            stored = self.stored_object_repo.get_by_hash(db, user.id, folder, digest)
+            if stored is None:
+                raise
+            return stored
+
+    def _discard_upload(self, url: str) -> None:
+        try:
+            self.storage_service.delete(url)
+        except Exception:
+            logger.warning("Could not delete duplicate upload", extra={"url": url}, exc_info=True)
+
     def approve_identity(self, db: Session, actor: User, user_id: UUID, email_service=None) -> User:
         if not actor.is_admin:
             raise ValueError("Admin privileges required")
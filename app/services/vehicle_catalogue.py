@@ -0,0 +1,147 @@
+"""Vehicle make/model catalogue for the lookup dropdowns.
+
+A versioned snapshot is bundled with the app (app/data/vehicle_catalogue.json)
+so startup never needs the network. At load time the snapshot is indexed into
+sorted makes per kind and sorted models per make. A background thread
+refreshes it from vehiclesdb once a day, straight away if the loaded
+catalogue is missing models for any kind. Each refreshed index is written as
+JSON to VEHICLE_CATALOGUE_CACHE (in a directory only the app user can
+write), and later restarts load it instead of re-indexing the bundled JSON.
+
+Regenerate the bundled snapshot with `python scripts/build_vehicle_catalogue.py`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+VALID_KINDS = ("car", "van", "motorcycle", "moped", "truck", "bus")
+
+_VEHICLESDB = "https://raw.githubusercontent.com/vehiclesdb/vehiclesdb/main/catalog"
+BUNDLED_SNAPSHOT = Path(__file__).resolve().parent.parent / "data" / "vehicle_catalogue.json"
+_REFRESH_INITIAL_DELAY_SECONDS = 300
+_REFRESH_INTERVAL_SECONDS = 24 * 3600
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    version: str
+    makes: dict[str, list[dict]]              # kind → makes sorted by name
+    models: dict[str, dict[str, list[dict]]]  # kind → make_id → models sorted by name
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    @property
+    def complete(self) -> bool:
+        """Every kind has makes and models; the seed snapshot only covers cars fully."""
+        return all(self.makes.get(kind) and self.models.get(kind) for kind in VALID_KINDS)
+
+
+def build_catalogue(snapshot: dict) -> Catalogue:
+    """Index a raw snapshot ({"version", "kinds": {kind: {"makes", "models"}}})."""
+    makes: dict[str, list[dict]] = {}
+    models: dict[str, dict[str, list[dict]]] = {}
+    for kind, data in snapshot["kinds"].items():
+        makes[kind] = sorted(
+            ({"id": m["id"], "name": m["name"]} for m in data.get("makes", [])),
+            key=lambda m: m["name"].lower(),
+        )
+        by_make: dict[str, list[dict]] = {}
+        for m in data.get("models", []):
+            by_make.setdefault(m["make_id"], []).append({"id": m["id"], "name": m["name"]})
+        for entries in by_make.values():
+            entries.sort(key=lambda m: m["name"].lower())
+        models[kind] = by_make
+    return Catalogue(version=snapshot["version"], makes=makes, models=models)
+
+
+def _load() -> Catalogue:
+    cache = Path(get_settings().vehicle_catalogue_cache)
+    # A cache written before this release's bundled snapshot is older than it
+    if cache.exists() and cache.stat().st_mtime > BUNDLED_SNAPSHOT.stat().st_mtime:
+        try:
+            with cache.open(encoding="utf-8") as fh:
+                return Catalogue(**json.load(fh))
+        except Exception as exc:
+            logger.warning("Ignoring unreadable vehicle catalogue cache", exc_info=exc)
+    with BUNDLED_SNAPSHOT.open(encoding="utf-8") as fh:
+        return build_catalogue(json.load(fh))
+
+
+_lock = threading.Lock()
+_catalogue: Catalogue | None = None
+_refresher: threading.Thread | None = None
+
+
+def get_catalogue() -> Catalogue:
+    global _catalogue
+    if _catalogue is None:
+        with _lock:
+            if _catalogue is None:
+                _catalogue = _load()
+    return _catalogue
+
+
+def fetch_snapshot() -> dict:
+    """Download every kind from vehiclesdb; raises if any request fails."""
+    kinds = {}
+    for kind in VALID_KINDS:
+        kinds[kind] = {}
+        for name in ("makes", "models"):
+            with urllib.request.urlopen(f"{_VEHICLESDB}/{kind}/{name}.json", timeout=10) as resp:
+                kinds[kind][name] = json.loads(resp.read())
+    digest = hashlib.sha256(json.dumps(kinds, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"version": f"vehiclesdb-{digest[:16]}", "kinds": kinds}
+
+
+def refresh_catalogue() -> bool:
+    """Swap in the latest vehiclesdb catalogue. Returns True if it changed."""
+    global _catalogue
+    try:
+        catalogue = build_catalogue(fetch_snapshot())
+    except Exception as exc:
+        logger.warning("Vehicle catalogue refresh failed, keeping %s", get_catalogue().version, exc_info=exc)
+        return False
+    if catalogue.version == get_catalogue().version:
+        return False
+    cache = Path(get_settings().vehicle_catalogue_cache)
+    try:
+        cache.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(asdict(catalogue), fh, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, cache)
+    except OSError as exc:
+        logger.warning("Could not write vehicle catalogue cache", exc_info=exc)
+    _catalogue = catalogue
+    logger.info("Vehicle catalogue refreshed to %s", catalogue.version)
+    return True
+
+
+def _refresh_loop() -> None:
+    stop = threading.Event()
+    # A partial catalogue (the seed snapshot) would leave lookups empty, so refresh it now
+    if get_catalogue().complete:
+        stop.wait(_REFRESH_INITIAL_DELAY_SECONDS)
+    while True:
+        refresh_catalogue()
+        stop.wait(_REFRESH_INTERVAL_SECONDS)
+
+
+def start_background_refresh() -> None:
+    global _refresher
+    with _lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, name="vehicle-catalogue", daemon=True)
+            _refresher.start()
@@ -2,28 +2,69 @@
 
 import base64
 import json
+import logging
 import re
+import threading
+import time
+from functools import lru_cache
 
 from app.core.config import get_settings
+from app.core.constants import LICENCE_OCR_REQUESTS_PER_SECOND
 
 _DVLA_PATTERN = re.compile(r"[A-Z9]{5}\d{6}[A-Z]{2}\d[A-Z]{2}")
 
+# Vision accepts at most this many images per batch_annotate_images request
+VISION_BATCH_LIMIT = 16
+
+logger = logging.getLogger(__name__)
+
+
+class _Throttle:
+    """Spaces calls at least 1/rate seconds apart, across threads."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self._interval = 1.0 / rate_per_second
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_BATCH_THROTTLE = _Throttle(LICENCE_OCR_REQUESTS_PER_SECOND)
+
+
+def _licence_number(text: str) -> str | None:
+    normalised = text.upper().replace(" ", "").replace("\n", "")
+    match = _DVLA_PATTERN.search(normalised)
+    return match.group(0) if match else None
+
+
+@lru_cache(maxsize=4)
+def _annotator_client(creds_json: str):
+    """Process-wide Vision client per credential set — its gRPC channel is reused across calls."""
+    from google.cloud import vision as gv
+
+    if creds_json:
+        raw = base64.b64decode(creds_json).decode("utf-8")
+        info = json.loads(raw)
+        from google.oauth2 import service_account
+        credentials = service_account.Credentials.from_service_account_info(info)
+        return gv.ImageAnnotatorClient(credentials=credentials)
+    return gv.ImageAnnotatorClient()
+
 
 class VisionService:
     def __init__(self) -> None:
         self.settings = get_settings()
 
     def _client(self):
-        from google.cloud import vision as gv
-
-        creds_json = self.settings.gcp_credentials_json
-        if creds_json:
-            raw = base64.b64decode(creds_json).decode("utf-8")
-            info = json.loads(raw)
-            from google.oauth2 import service_account
-            credentials = service_account.Credentials.from_service_account_info(info)
-            return gv.ImageAnnotatorClient(credentials=credentials)
-        return gv.ImageAnnotatorClient()
+        return _annotator_client(self.settings.gcp_credentials_json)
 
     def extract_text(self, image_bytes: bytes) -> str:
         from google.cloud import vision as gv
@@ -32,13 +73,37 @@ class VisionService:
         image = gv.Image(content=image_bytes)
         response = client.text_detection(image=image)
         if response.error.message:
-            return ""
+            # Surface API failures so callers can retry instead of treating the image as unreadable
+            raise RuntimeError(f"Vision text detection failed: {response.error.message}")
         annotations = response.text_annotations
         return annotations[0].description if annotations else ""
 
     def extract_licence_number(self, image_bytes: bytes) -> str | None:
         """Return the first DVLA-format licence number found in the image, or None."""
-        text = self.extract_text(image_bytes)
-        normalised = text.upper().replace(" ", "").replace("\n", "")
-        match = _DVLA_PATTERN.search(normalised)
-        return match.group(0) if match else None
+        return _licence_number(self.extract_text(image_bytes))
+
+    def extract_licence_numbers(self, images: list[bytes]) -> list[str | None]:
+        """Batch variant of extract_licence_number — one Vision request for up to VISION_BATCH_LIMIT images.
+
+        An image Vision cannot process counts as unreadable (None); a failed
+        request raises so the whole batch can be retried.
+        """
+        if len(images) > VISION_BATCH_LIMIT:
+            raise ValueError(f"At most {VISION_BATCH_LIMIT} images per batch")
+        from google.cloud import vision as gv
+
+        _BATCH_THROTTLE.wait()
+        feature = gv.Feature(type_=gv.Feature.Type.TEXT_DETECTION)
+        response = self._client().batch_annotate_images(requests=[
+            gv.AnnotateImageRequest(image=gv.Image(content=content), features=[feature])
+            for content in images
+        ])
+        results: list[str | None] = []
+        for item in response.responses:
+            if item.error.message:
+                logger.warning("Vision could not read image: %s", item.error.message)
+                results.append(None)
+            else:
+                annotations = item.text_annotations
+                results.append(_licence_number(annotations[0].description) if annotations else None)
+        return results
@@ -0,0 +1,90 @@
+"""Redis stream buffering verified Stripe webhook events for batch processing.
+
+The webhook endpoint only appends to the stream; a Celery drain task consumes
+it in batches through a consumer group, one DB transaction per batch:
+  rideway:stripe:webhooks        → stream of {"event": <json>}, capped at _MAX_LENGTH
+  rideway:stripe:webhooks:drain  → set while a drain task is queued or running
+  rideway:stripe:webhooks:redeliveries → hash of entry id → times reclaimed
+
+Entries are acknowledged only after their batch commits, so a worker dying
+mid-batch leaves them pending; the next drain reclaims anything pending for
+longer than _CLAIM_IDLE_MS from its dead consumer. Each reclaim is counted so
+the drain can dead-letter an entry that keeps failing instead of retrying it
+for ever.
+"""
+
+import json
+import logging
+
+import redis
+
+from app.core.redis_client import REDIS_DB_PAYMENTS, redis_client
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "rideway:stripe:webhooks"
+GROUP = "webhook-processors"
+_DRAIN_KEY = "rideway:stripe:webhooks:drain"
+_REDELIVERIES_KEY = "rideway:stripe:webhooks:redeliveries"
+_DRAIN_TTL = 60  # a crashed drain task frees the flag; beat drains in the meantime
+_MAX_LENGTH = 100_000
+_CLAIM_IDLE_MS = 60_000
+
+
+def _ensure_group(r: redis.Redis) -> None:
+    try:
+        r.xgroup_create(STREAM_KEY, GROUP, id="0", mkstream=True)
+    except redis.ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def append(event: dict) -> bool:
+    """Add an event to the stream. Returns True if the caller should queue a drain."""
+    r = redis_client(REDIS_DB_PAYMENTS)
+    pipe = r.pipeline(transaction=False)
+    pipe.xadd(STREAM_KEY, {"event": json.dumps(event)}, maxlen=_MAX_LENGTH, approximate=True)
+    pipe.set(_DRAIN_KEY, "1", nx=True, ex=_DRAIN_TTL)
+    _, drain_needed = pipe.execute()
+    return bool(drain_needed)
+
+
+def _decode(entries: list, deliveries: list[int] | None = None) -> list[tuple[str, dict, int]]:
+    deliveries = deliveries or [1] * len(entries)
+    return [
+        (entry_id, json.loads(fields["event"]), delivered)
+        for (entry_id, fields), delivered in zip(entries, deliveries)
+        if fields
+    ]
+
+
+def read_batch(consumer: str, count: int) -> list[tuple[str, dict, int]]:
+    """Next batch for this consumer: stale pending entries first, then new ones.
+
+    Returns (entry_id, event, times_delivered) tuples.
+    """
+    r = redis_client(REDIS_DB_PAYMENTS)
+    _ensure_group(r)
+    _, claimed, *_ = r.xautoclaim(STREAM_KEY, GROUP, consumer, min_idle_time=_CLAIM_IDLE_MS, count=count)
+    if claimed:
+        logger.warning("Reclaimed %d stalled Stripe webhook events", len(claimed))
+        pipe = r.pipeline(transaction=False)
+        for entry_id, _ in claimed:
+            pipe.hincrby(_REDELIVERIES_KEY, entry_id, 1)
+        return _decode(claimed, [1 + redeliveries for redeliveries in pipe.execute()])
+    response = r.xreadgroup(GROUP, consumer, {STREAM_KEY: ">"}, count=count)
+    return _decode(response[0][1]) if response else []
+
+
+def ack(entry_ids: list[str]) -> None:
+    if not entry_ids:
+        return
+    pipe = redis_client(REDIS_DB_PAYMENTS).pipeline(transaction=False)
+    pipe.xack(STREAM_KEY, GROUP, *entry_ids)
+    pipe.xdel(STREAM_KEY, *entry_ids)
+    pipe.hdel(_REDELIVERIES_KEY, *entry_ids)
+    pipe.execute()
+
+
+def release_drain() -> None:
+    redis_client(REDIS_DB_PAYMENTS).delete(_DRAIN_KEY)
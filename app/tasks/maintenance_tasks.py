@@ -0,0 +1,81 @@
+"""Housekeeping tasks that keep hot tables small. Scheduled by Celery beat."""
+
+import logging
+
+import app.models  # noqa: F401 — registers all SQLAlchemy mappers before any query runs
+from app.core.celery_app import celery_app
+from app.repositories.device_repo import DeviceRepository
+from app.repositories.notification_repo import NotificationRepository
+from app.repositories.user_repo import UserRepository
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+_ARCHIVE_CHUNK = 1000
+
+
+@celery_app.task(name="app.tasks.maintenance_tasks.archive_old_notifications")
+def archive_old_notifications() -> None:
+    """Move notifications past the retention window into notifications_archive."""
+    from app.core.database import create_db_session
+
+    db = create_db_session()
+    try:
+        notification_service = NotificationService(DeviceRepository(), NotificationRepository(), UserRepository())
+        # Commit per chunk so the sweep never holds row locks for long
+        count = 0
+        while True:
+            archived = notification_service.archive_expired(db, batch_size=_ARCHIVE_CHUNK)
+            db.commit()
+            count += archived
+            if archived < _ARCHIVE_CHUNK:
+                break
+        if count:
+            logger.info("Archived %d notifications", count)
+    except Exception as exc:
+        db.rollback()
+        logger.error("Error archiving notifications: %s", exc)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.maintenance_tasks.refresh_admin_metrics")
+def refresh_admin_metrics() -> None:
+    """Recompute the admin dashboard snapshot so page loads never aggregate live."""
+    from app.core.database import create_db_session
+    from app.repositories.booking_repo import BookingRepository
+    from app.repositories.payment_repo import PaymentRepository
+    from app.repositories.trip_repo import TripRepository
+    from app.services.admin_service import AdminService
+
+    db = create_db_session()
+    try:
+        admin_service = AdminService(UserRepository(), TripRepository(), BookingRepository(), PaymentRepository())
+        admin_service.refresh_metric_snapshots(db)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.error("Error refreshing admin metrics: %s", exc)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.maintenance_tasks.refresh_daily_stats")
+def refresh_daily_stats(days_back: int = 1) -> None:
+    """Recompute the booking/revenue rollups for today and `days_back` earlier days."""
+    from app.core.database import create_db_session
+    from app.repositories.booking_repo import BookingRepository
+    from app.repositories.payment_repo import PaymentRepository
+    from app.repositories.trip_repo import TripRepository
+    from app.services.admin_service import AdminService
+
+    db = create_db_session()
+    try:
+        admin_service = AdminService(UserRepository(), TripRepository(), BookingRepository(), PaymentRepository())
+        admin_service.refresh_daily_stats(db, days_back=days_back)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.error("Error refreshing daily stats: %s", exc)
+    finally:
+        db.close()
@@ -0,0 +1,63 @@
+"""Image processing tasks — resized, EXIF-free variants of user photos."""
+
+import logging
+from uuid import UUID
+
+import app.models  # noqa: F401 — registers all SQLAlchemy mappers before any query runs
+from app.core.celery_app import celery_app
+from app.repositories.user_repo import UserRepository
+from app.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+# Photo kind → (URL attribute on User, storage folder for the variants)
+_KINDS = {
+    "avatar": ("profile_photo_url", "avatars"),
+    "vehicle": ("vehicle_photo_url", "vehicles"),
+}
+
+
+@celery_app.task(
+    name="app.tasks.media_tasks.generate_photo_variants",
+    bind=True,
+    max_retries=3,
+    acks_late=True,
+)
+def generate_photo_variants(self, user_id: str, kind: str, source_url: str) -> None:
+    """Build thumb/medium WebP + JPEG variants of a user photo and record their URLs.
+
+    The upload request queues this once it has committed; a photo that has
+    since been replaced is skipped.
+    """
+    from app.core.database import create_db_session
+    from app.utils.images import build_variants
+
+    url_attr, folder = _KINDS[kind]
+    user_repo = UserRepository()
+    db = create_db_session()
+    try:
+        user = user_repo.get_by_id(db, UUID(user_id))
+        if user is None:
+            return
+        if getattr(user, url_attr) != source_url:
+            logger.info("Photo replaced before variants were built", extra={"user_id": user_id, "kind": kind})
+            return
+        storage = StorageService()
+        variants = {
+            size: {
+                fmt: storage.upload_bytes(content, content_type, folder=folder)
+                for fmt, (content, content_type) in formats.items()
+            }
+            for size, formats in build_variants(storage.download_bytes(source_url)).items()
+        }
+        if user_repo.set_photo_variants(db, user.id, kind, source_url, variants):
+            db.commit()
+    except ValueError as exc:
+        # Unreadable image or an external URL (e.g. a Google profile picture) — keep the original only
+        db.rollback()
+        logger.warning("Skipping photo variants: %s", exc, extra={"user_id": user_id, "kind": kind})
+    except Exception as exc:
+        db.rollback()
+        raise self.retry(exc=exc, countdown=30)
+    finally:
+        db.close()
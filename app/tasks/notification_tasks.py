@@ -0,0 +1,28 @@
+"""Push and SMS delivery queued by batch notification writers."""
+
+import logging
+
+import app.models  # noqa: F401 — registers all SQLAlchemy mappers before any query runs
+from app.core.celery_app import celery_app
+from app.core.database import create_db_session
+from app.repositories.device_repo import DeviceRepository
+from app.repositories.notification_repo import NotificationRepository
+from app.repositories.user_repo import UserRepository
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.notification_tasks.deliver_external_notifications")
+def deliver_external_notifications(items: list[dict]) -> None:
+    """Send push and SMS for notifications whose in-app rows are already committed."""
+    db = create_db_session()
+    try:
+        notification_service = NotificationService(DeviceRepository(), NotificationRepository(), UserRepository())
+        notification_service.deliver_external_batch(db, items)
+        db.commit()  # stale device tokens pruned during delivery
+    except Exception as exc:
+        db.rollback()
+        logger.error("Error delivering %d notifications: %s", len(items), exc)
+    finally:
+        db.close()
@@ -1,4 +1,6 @@
 import logging
+import os
+import socket
 from uuid import UUID
 
 from celery import Task
@@ -9,10 +11,13 @@ from app.repositories.booking_repo import BookingRepository
 from app.repositories.payment_repo import PaymentRepository
 from app.repositories.trip_repo import TripRepository
 from app.repositories.user_repo import UserRepository
+from app.services import webhook_stream
 from app.services.payment_service import PaymentService
 
 logger = logging.getLogger(__name__)
 
+_EXPIRY_SWEEP_CHUNK = 500
+
 
 def _build_payment_service() -> PaymentService:
     return PaymentService(
@@ -73,10 +78,63 @@ def process_payout(task: Task, booking_id: str) -> None:
         raise task.retry(exc=exc, countdown=30 * (2 ** task.request.retries))
 
 
+@celery_app.task(
+    name="app.tasks.payment_tasks.process_trip_payouts",
+    bind=True,
+    max_retries=5,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def process_trip_payouts(task: Task, trip_id: str) -> None:
+    """One task per completed trip — replaces a process_payout task per booking."""
+    service = _build_payment_service()
+    try:
+        service.process_trip_payouts(trip_id)
+    except Exception as exc:
+        if task.request.retries >= task.max_retries:
+            _on_failure(task.name, task.request.id, [trip_id], exc)
+            return
+        raise task.retry(exc=exc, countdown=30 * (2 ** task.request.retries))
+
+
+@celery_app.task(name="app.tasks.payment_tasks.run_payout_batches")
+def run_payout_batches() -> None:
+    service = _build_payment_service()
+    counts = service.run_payout_batches()
+    if any(counts.values()):
+        logger.info("Payout batches run", extra=counts)
+
+
+@celery_app.task(name="app.tasks.payment_tasks.reconcile_payments")
+def reconcile_payments() -> None:
+    """Align payments with Stripe for intents created since the last checkpoint."""
+    service = _build_payment_service()
+    try:
+        counts = service.reconcile_payments()
+    except ValueError as exc:
+        logger.warning("Payment reconciliation skipped: %s", exc)
+        return
+    fixed = {status: n for status, n in counts.items() if status != "checked" and n}
+    if fixed:
+        logger.warning("Payments reconciled against Stripe", extra=counts)
+
+
+@celery_app.task(name="app.tasks.payment_tasks.refresh_connect_cache")
+def refresh_connect_cache(kind: str, account_id: str) -> None:
+    """Revalidate a stale cached Connect status/balance; the stale value keeps being served meanwhile."""
+    service = _build_payment_service()
+    try:
+        service.refresh_connect_cache(kind, account_id)
+    except ValueError as exc:
+        logger.warning("Connect %s refresh for %s failed: %s", kind, account_id, exc)
+
+
 @celery_app.task(name="app.tasks.payment_tasks.process_pending_intents")
 def process_pending_intents() -> None:
     service = _build_payment_service()
-    service.process_pending_intents()
+    claimed = service.process_pending_intents()
+    if claimed:
+        logger.info("Queued PaymentIntent creation for %d payment(s)", len(claimed))
 
 
 @celery_app.task(name="app.tasks.payment_tasks.dead_letter", queue="payments.dlq")
@@ -108,8 +166,14 @@ def cancel_expired_pending_payments() -> None:
             BookingRepository(), TripRepository(), UserRepository(),
             EmailService(), notification_service, payment_service,
         )
-        count = booking_service.cancel_expired_pending_payments(db)
-        db.commit()
+        # Commit per chunk so a large backlog never holds locks in one long transaction
+        count = 0
+        while True:
+            cancelled = booking_service.cancel_expired_pending_payments(db, limit=_EXPIRY_SWEEP_CHUNK)
+            db.commit()
+            count += cancelled
+            if cancelled < _EXPIRY_SWEEP_CHUNK:
+                break
         if count:
             logger.info("Cancelled %d expired PENDING_PAYMENT bookings", count)
     except Exception as exc:
@@ -119,6 +183,15 @@ def cancel_expired_pending_payments() -> None:
         db.close()
 
 
+@celery_app.task(name="app.tasks.payment_tasks.drain_stripe_webhooks")
+def drain_stripe_webhooks() -> None:
+    """Apply buffered Stripe webhooks in batches. Queued on demand by the endpoint and by beat as a safety net."""
+    service = _build_payment_service()
+    counts = service.drain_webhook_stream(f"{socket.gethostname()}:{os.getpid()}")
+    if any(counts.values()):
+        logger.info("Stripe webhooks drained", extra=counts)
+
+
 @celery_app.task(
     name="app.tasks.payment_tasks.process_stripe_webhook",
     bind=True,
@@ -128,7 +201,7 @@ def cancel_expired_pending_payments() -> None:
     queue="payments",
 )
 def process_stripe_webhook(task: Task, event: dict) -> None:
-    """Process a pre-verified Stripe event. Retries with exponential backoff on failure."""
+    """Process one pre-verified Stripe event — used to replay dead-lettered webhooks."""
     service = _build_payment_service()
     db = __import__("app.core.database", fromlist=["create_db_session"]).create_db_session()
     try:
@@ -211,4 +284,6 @@ def enqueue_payout(booking_id: UUID) -> None:
 
 
 def enqueue_stripe_webhook(event: dict) -> None:
-    process_stripe_webhook.delay(event)
+    """Buffer a verified event in the webhook stream; queue a drain unless one is already pending."""
+    if webhook_stream.append(event):
+        drain_stripe_webhooks.delay()
@@ -0,0 +1,71 @@
+"""Identity verification tasks — licence photo OCR off the request path."""
+
+import logging
+from uuid import UUID
+
+import app.models  # noqa: F401 — registers all SQLAlchemy mappers before any query runs
+from app.core.celery_app import celery_app
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.user_repo import UserRepository
+from app.services.user_service import UserService
+from app.services.vision_service import VisionService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="app.tasks.verification_tasks.verify_licence_ocr",
+    bind=True,
+    max_retries=3,
+    acks_late=True,
+)
+def verify_licence_ocr(self, user_id: str, stored_object_id: str) -> str | None:
+    """OCR the driver licence front photo and record whether it matches the submitted number.
+
+    The upload request queues this once it has committed. A photo replaced
+    since is skipped. When Vision stays unavailable the licence is left
+    PENDING for admin manual review.
+    """
+    from app.core.database import create_db_session
+    from app.services.email_service import EmailService
+
+    user_service = UserService(UserRepository(), BookingRepository())
+    db = create_db_session()
+    status = None
+    try:
+        status = user_service.apply_licence_ocr(
+            db, UUID(user_id), UUID(stored_object_id), VisionService(), EmailService(),
+        )
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.error("Licence OCR failed: %s", exc, extra={"user_id": user_id})
+        raise self.retry(exc=exc, countdown=30)
+    finally:
+        db.close()
+
+    if status is None:
+        logger.info("Licence photo replaced before OCR ran", extra={"user_id": user_id})
+        return None
+    return str(status)
+
+
+@celery_app.task(name="app.tasks.verification_tasks.ocr_licence_backlog")
+def ocr_licence_backlog() -> dict | None:
+    """Batch-OCR pending licences that never got a check (e.g. queued while Vision was down)."""
+    from app.core.database import create_db_session
+    from app.services.email_service import EmailService
+
+    user_service = UserService(UserRepository(), BookingRepository())
+    db = create_db_session()
+    try:
+        counts = user_service.process_licence_ocr_backlog(db, VisionService(), EmailService())
+        if any(counts.values()):
+            logger.info("Licence OCR backlog processed", extra=counts)
+        return counts
+    except Exception as exc:
+        db.rollback()
+        logger.error("Licence OCR backlog failed: %s", exc)
+        return None
+    finally:
+        db.close()
@@ -0,0 +1,47 @@
+"""Resized, metadata-free image variants for avatars and vehicle photos."""
+
+import io
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Longest edge in pixels for each variant
+VARIANT_SIZES = {"thumb": 128, "medium": 512}
+
+# (format, content type, encoder options)
+_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Refuse decompression bombs well before Pillow's own (much higher) limit
+_MAX_PIXELS = 40_000_000
+
+
+def build_variants(content: bytes) -> dict[str, dict[str, tuple[bytes, str]]]:
+    """Return {size: {format: (bytes, content_type)}} for every variant.
+
+    EXIF orientation is applied to the pixels and then all metadata is dropped,
+    so GPS and camera details in the original never reach the variants.
+    Images are only ever scaled down.
+    """
+    try:
+        source = Image.open(io.BytesIO(content))
+    except UnidentifiedImageError as exc:
+        raise ValueError("Unreadable image") from exc
+    with source:
+        if source.width * source.height > _MAX_PIXELS:
+            raise ValueError("Image too large to process")
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    variants: dict[str, dict[str, tuple[bytes, str]]] = {}
+    for name, edge in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        variants[name] = {}
+        for key, (fmt, content_type, options) in _FORMATS.items():
+            frame = resized.convert("RGB") if fmt == "JPEG" else resized
+            out = io.BytesIO()
+            frame.save(out, format=fmt, **options)
+            variants[name][key] = (out.getvalue(), content_type)
+    return variants
@@ -1,6 +1,9 @@
 """Pagination helpers."""
 
+import base64
 from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
 
 
 @dataclass(frozen=True)
@@ -9,6 +12,14 @@ class Pagination:
     offset: int
 
 
+@dataclass(frozen=True)
+class Cursor:
+    """Keyset position: the (created_at, id) of the last row on the previous page."""
+
+    created_at: datetime
+    id: UUID
+
+
 def normalize_pagination(limit: int | None, offset: int | None, max_limit: int = 100) -> Pagination:
     resolved_limit = 50 if limit is None else limit
     resolved_offset = 0 if offset is None else offset
@@ -17,3 +28,28 @@ def normalize_pagination(limit: int | None, offset: int | None, max_limit: int =
     if resolved_limit > max_limit:
         resolved_limit = max_limit
     return Pagination(limit=resolved_limit, offset=resolved_offset)
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> Cursor | None:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, _, row_id = raw.partition("|")
+        return Cursor(created_at=datetime.fromisoformat(created_at), id=UUID(row_id))
+    except ValueError as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def next_cursor(rows: list, limit: int) -> str | None:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,42 @@
+"""Regenerate the bundled vehicle catalogue snapshot from vehiclesdb.
+
+Run before a release, with network access:
+
+    python scripts/build_vehicle_catalogue.py
+
+Writes app/data/vehicle_catalogue.json. Refuses to write a snapshot in which
+any vehicle kind has no makes or no models, so a partial download can never
+replace the bundled catalogue.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.vehicle_catalogue import BUNDLED_SNAPSHOT, VALID_KINDS, fetch_snapshot  # noqa: E402
+
+
+def main() -> int:
+    snapshot = fetch_snapshot()
+    empty = [
+        f"{kind}/{name}"
+        for kind in VALID_KINDS
+        for name in ("makes", "models")
+        if not snapshot["kinds"].get(kind, {}).get(name)
+    ]
+    if empty:
+        print(f"Refusing to write a partial snapshot, empty: {', '.join(empty)}", file=sys.stderr)
+        return 1
+    with BUNDLED_SNAPSHOT.open("w", encoding="utf-8") as out:
+        json.dump(snapshot, out, ensure_ascii=False, separators=(",", ":"))
+    for kind in VALID_KINDS:
+        data = snapshot["kinds"][kind]
+        print(f"{kind}: {len(data['makes'])} makes, {len(data['models'])} models")
+    print(f"Wrote {BUNDLED_SNAPSHOT} ({snapshot['version']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
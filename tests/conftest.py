@@ -11,11 +11,14 @@ import app.models.vehicle       # noqa: F401
 import app.models.trip          # noqa: F401
 import app.models.booking       # noqa: F401
 import app.models.payment       # noqa: F401
+import app.models.payout        # noqa: F401
 import app.models.review        # noqa: F401
 import app.models.notification  # noqa: F401
 import app.models.message       # noqa: F401
 import app.models.device        # noqa: F401
 import app.models.ticket        # noqa: F401
+import app.models.metrics       # noqa: F401
+import app.models.stored_object # noqa: F401
 
 
 @pytest.fixture(scope="session")
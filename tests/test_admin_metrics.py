@@ -0,0 +1,193 @@
+"""Tests for the single-query admin metrics and the snapshot read path."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.core.constants import DAILY_STATS_RESTATE_DAYS, BookingStatus, PaymentStatus
+from app.core.security import hash_password
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.metrics_repo import MetricsRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.admin_service import AdminService
+
+
+def _make_service():
+    return AdminService(UserRepository(), TripRepository(), BookingRepository(), PaymentRepository())
+
+
+def _make_user(db, is_admin=False, created_at=None):
+    u = User(
+        email=f"user_{uuid4().hex[:6]}@test.com",
+        password_hash=hash_password("Password1!"),
+        is_active=True,
+        is_admin=is_admin,
+    )
+    if created_at is not None:
+        u.created_at = created_at
+    db.add(u)
+    db.flush()
+    return u
+
+
+def _make_trip(db, driver, created_at=None):
+    t = Trip(
+        driver_id=driver.id,
+        origin_city="London",
+        destination_city="Manchester",
+        departure_time=datetime.now(timezone.utc) + timedelta(hours=2),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+    )
+    if created_at is not None:
+        t.created_at = created_at
+    db.add(t)
+    db.flush()
+    return t
+
+
+def _seed(db):
+    old = datetime.now(timezone.utc) - timedelta(days=60)
+    driver = _make_user(db)
+    passengers = [_make_user(db), _make_user(db, created_at=old)]
+    trip = _make_trip(db, driver)
+    _make_trip(db, driver, created_at=old)
+    statuses = [BookingStatus.CONFIRMED, BookingStatus.COMPLETED, BookingStatus.COMPLETED, BookingStatus.CANCELLED]
+    for i, status in enumerate(statuses):
+        passenger = passengers[0] if status != BookingStatus.CANCELLED else passengers[1]
+        booking = Booking(trip_id=trip.id, passenger_id=passenger.id, seats=1, total_amount=20.0, status=status)
+        db.add(booking)
+        db.flush()
+        db.add(Payment(booking_id=booking.id, amount=20.0, platform_fee=2.0, payout_amount=18.0,
+                       status=PaymentStatus.SUCCEEDED if i < 3 else PaymentStatus.FAILED,
+                       stripe_payment_intent_id=f"pi_{i}"))
+    db.flush()
+
+
+def test_single_query_matches_per_table_counts(db_session):
+    _seed(db_session)
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+
+    counts = MetricsRepository().compute(db_session, since=since, trips_window_start=since)
+
+    assert counts["total_users"] == UserRepository().count_users(db_session, since=since)
+    assert counts["total_trips"] == TripRepository().count_trips(db_session, since=since)
+    assert counts["total_bookings"] == BookingRepository().count_all(db_session, since=since)
+    assert counts["confirmed_bookings"] == 1
+    assert counts["completed_bookings"] == 2
+    assert counts["total_revenue"] == PaymentRepository().sum_total_revenue(db_session, since=since)
+    assert counts["platform_fee_total"] == PaymentRepository().sum_platform_fees(db_session, since=since)
+    assert counts["repeat_users"] == BookingRepository().count_repeat_users(db_session)
+
+
+def test_all_period_includes_older_rows(db_session):
+    _seed(db_session)
+    metrics = _make_service().compute_metrics(db_session, "all")
+
+    assert metrics["total_users"] == 3
+    assert metrics["total_trips"] == 2
+    assert metrics["trips_created_last_7_days"] == 1
+    assert metrics["total_revenue"] == 60.0
+
+
+def test_get_metrics_reads_fresh_snapshot(db_session):
+    svc = _make_service()
+    admin = _make_user(db_session, is_admin=True)
+    svc.metrics_repo.save_snapshot(
+        db_session, "all", {**svc.compute_metrics(db_session, "all"), "total_users": 999}, datetime.now(timezone.utc)
+    )
+
+    assert svc.get_metrics(db_session, admin, "all")["total_users"] == 999
+
+
+def test_get_metrics_computes_live_when_snapshot_stale(db_session):
+    svc = _make_service()
+    admin = _make_user(db_session, is_admin=True)
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    svc.metrics_repo.save_snapshot(db_session, "7d", {"total_users": 999}, stale)
+
+    metrics = svc.get_metrics(db_session, admin, "7d")
+
+    assert metrics["total_users"] == 1
+    assert metrics["period"] == "7d"
+
+
+def test_refresh_writes_every_period(db_session):
+    svc = _make_service()
+    _seed(db_session)
+
+    svc.refresh_metric_snapshots(db_session)
+
+    for period in ("today", "7d", "30d", "all"):
+        assert svc.metrics_repo.get_snapshot(db_session, period) is not None
+
+
+def test_daily_rollups_feed_timeseries(db_session):
+    svc = _make_service()
+    _seed(db_session)
+
+    svc.refresh_daily_stats(db_session)
+    svc.refresh_daily_stats(db_session)  # idempotent — rows are overwritten, not added
+
+    today = str(datetime.now(timezone.utc).date())
+    bookings = svc.bookings_timeseries(db_session, days=7)
+    revenue = svc.revenue_timeseries(db_session, days=7)
+    assert {"date": today, "value": 4} in bookings
+    assert {"date": today, "value": 60.0} in revenue
+    assert len(bookings) == 2  # today and yesterday
+
+
+
+def test_daily_rollups_catch_up_from_last_rolled_up_day(db_session):
+    svc = _make_service()
+    today = datetime.now(timezone.utc).date()
+    svc.metrics_repo.refresh_daily_stats(db_session, today - timedelta(days=5))
+
+    svc.refresh_daily_stats(db_session)
+
+    days = [row["date"] for row in svc.bookings_timeseries(db_session, days=30)]
+    assert days == [str(today - timedelta(days=offset)) for offset in range(5, -1, -1)]
+
+
+def test_restate_window_reflects_refunds_of_older_payments(db_session):
+    svc = _make_service()
+    _seed(db_session)
+    payments = db_session.query(Payment).filter(Payment.status == PaymentStatus.SUCCEEDED).all()
+    for payment in payments:
+        payment.created_at = datetime.now(timezone.utc) - timedelta(days=10)
+    db_session.flush()
+    day = str((datetime.now(timezone.utc) - timedelta(days=10)).date())
+    svc.refresh_daily_stats(db_session, days_back=DAILY_STATS_RESTATE_DAYS)
+    payments[0].status = PaymentStatus.REFUNDED
+    db_session.flush()
+
+    svc.refresh_daily_stats(db_session)
+    assert {"date": day, "value": 60.0} in svc.revenue_timeseries(db_session, days=30)
+
+    svc.refresh_daily_stats(db_session, days_back=DAILY_STATS_RESTATE_DAYS)
+    assert {"date": day, "value": 40.0} in svc.revenue_timeseries(db_session, days=30)
+
+def test_activity_feed_pages_through_merged_events(db_session):
+    svc = _make_service()
+    _seed(db_session)  # 3 signups, 4 bookings, 3 succeeded payments
+
+    seen, cursor = [], None
+    while True:
+        events, cursor = svc.activity_feed(db_session, limit=4, cursor=cursor)
+        seen.extend(events)
+        if cursor is None:
+            break
+
+    assert len(seen) == 10
+    assert [e["timestamp"] for e in seen] == sorted((e["timestamp"] for e in seen), reverse=True)
+    assert {e["type"] for e in seen} == {"signup", "booking", "payment"}
+    assert any(e["detail"] == "Booking confirmed — £20.00" for e in seen)
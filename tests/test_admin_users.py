@@ -0,0 +1,69 @@
+"""Tests for server-side filtering and keyset paging of the admin user list."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from app.api import admin_web
+from app.core.constants import IdentityVerificationStatus
+from app.core.security import hash_password
+from app.models.user import User
+from app.repositories.user_repo import UserRepository
+from app.utils.pagination import decode_cursor, next_cursor
+
+
+def _make_users(db, count, **fields):
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    users = []
+    for i in range(count):
+        u = User(
+            email=f"user_{uuid4().hex[:6]}@test.com",
+            password_hash=hash_password("Password1!"),
+            is_active=True,
+            created_at=start + timedelta(minutes=i),
+            **fields,
+        )
+        db.add(u)
+        users.append(u)
+    db.flush()
+    return users
+
+
+def test_keyset_pages_in_both_directions(db_session):
+    repo = UserRepository()
+    users = _make_users(db_session, 5)
+
+    for sort, expected in (("newest", list(reversed(users))), ("oldest", users)):
+        seen, cursor = [], None
+        while True:
+            page = repo.list_users(db_session, limit=2, sort=sort, cursor=decode_cursor(cursor))
+            seen.extend(page)
+            cursor = next_cursor(page, 2)
+            if cursor is None:
+                break
+        assert [u.id for u in seen] == [u.id for u in expected]
+
+
+def test_pending_count_and_filtered_total(db_session):
+    repo = UserRepository()
+    _make_users(db_session, 3, identity_verification_status=IdentityVerificationStatus.PENDING)
+    _make_users(db_session, 2, first_name="Zed")
+
+    assert repo.count_pending_verifications(db_session) == 3
+    assert repo.count_matching(db_session, search="zed") == 2
+    assert repo.count_matching(db_session, verification_status="PENDING") == 3
+
+
+def test_users_page_renders_next_link(db_session):
+    _make_users(db_session, admin_web._USERS_PAGE_SIZE + 1)
+    request = MagicMock()
+    with patch.object(db_session, "close"), \
+         patch("app.api.admin_web.SessionLocal", return_value=db_session), \
+         patch.object(admin_web._templates, "TemplateResponse") as render:
+        admin_web.users_list(request, session="ok")
+
+    context = render.call_args.kwargs["context"]
+    assert len(context["users"]) == admin_web._USERS_PAGE_SIZE
+    assert context["total"] == admin_web._USERS_PAGE_SIZE + 1
+    assert context["next_url"].startswith("/admin/users?sort=newest&cursor=")
+    assert context["first_url"] is None
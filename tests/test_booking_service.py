@@ -99,6 +99,89 @@ def test_complete_booking_sends_emails(db_session):
     db_session.commit()
 
     service.update_status(db_session, driver, booking.id, BookingStatus.COMPLETED)
+    assert payment_service.payouts == []  # queued only once the completion commits
     db_session.commit()
 
     assert set(email_service.completed_emails) == {driver.email, passenger.email}
+    assert payment_service.payouts == [str(booking.id)]
+
+
+class StubBatchNotificationService:
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+
+    def create_notifications(self, db_session, items):
+        self.batches.append(items)
+        return []
+
+
+def test_cancel_expired_pending_payments_in_chunks(db_session):
+    user_repo = UserRepository()
+    trip_repo = TripRepository()
+    booking_repo = BookingRepository()
+    notification_service = StubBatchNotificationService()
+    service = BookingService(
+        booking_repo, trip_repo, user_repo, StubEmailService(), notification_service, StubPaymentService()
+    )
+
+    driver = user_repo.create(
+        db_session,
+        User(email="sweep-driver@example.com", password_hash=hash_password("pass1234")),
+    )
+    passenger = user_repo.create(
+        db_session,
+        User(email="sweep-passenger@example.com", password_hash=hash_password("pass1234")),
+    )
+    trip = trip_repo.create(
+        db_session,
+        Trip(
+            driver_id=driver.id,
+            origin_city="Leeds",
+            destination_city="York",
+            departure_time=now_utc() + timedelta(days=1),
+            available_seats=4,
+            price_per_seat=10,
+            vehicle_make="Ford",
+            vehicle_model="Focus",
+            vehicle_color="Red",
+        ),
+    )
+    expired = [
+        booking_repo.create(
+            db_session,
+            Booking(
+                trip_id=trip.id,
+                passenger_id=passenger.id,
+                seats=1,
+                status=BookingStatus.PENDING_PAYMENT,
+                total_amount=10,
+                payment_deadline=now_utc() - timedelta(minutes=5 + i),
+            ),
+        )
+        for i in range(3)
+    ]
+    still_open = booking_repo.create(
+        db_session,
+        Booking(
+            trip_id=trip.id,
+            passenger_id=passenger.id,
+            seats=1,
+            status=BookingStatus.PENDING_PAYMENT,
+            total_amount=10,
+            payment_deadline=now_utc() + timedelta(minutes=10),
+        ),
+    )
+    db_session.commit()
+
+    assert service.cancel_expired_pending_payments(db_session, limit=2) == 2
+    assert service.cancel_expired_pending_payments(db_session, limit=2) == 1
+    assert service.cancel_expired_pending_payments(db_session, limit=2) == 0
+    db_session.commit()
+
+    for booking in expired:
+        db_session.refresh(booking)
+        assert booking.status == BookingStatus.CANCELLED
+    db_session.refresh(still_open)
+    assert still_open.status == BookingStatus.PENDING_PAYMENT
+    # One passenger + one driver notification per cancelled booking, batched per chunk
+    assert [len(batch) for batch in notification_service.batches] == [4, 2]
@@ -0,0 +1,155 @@
+"""Tests for the Redis-backed circuit breaker shared across workers."""
+
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+import redis
+import stripe
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class UpstreamDown(Exception):
+    pass
+
+
+@pytest.fixture()
+def fake_redis():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.circuit_breaker.redis_client", return_value=r):
+        yield r
+
+
+def _breaker(**kwargs):
+    return CircuitBreaker("test", failure_exceptions=(UpstreamDown,), failure_threshold=3, **kwargs)
+
+
+def _fail(breaker, endpoint="charges"):
+    with pytest.raises(UpstreamDown):
+        with breaker.guard(endpoint):
+            raise UpstreamDown()
+
+
+def _expire_open(r):
+    r.delete("rideway:breaker:test:open")
+
+
+def test_failures_from_every_worker_open_the_breaker(fake_redis):
+    api_worker, celery_worker = _breaker(), _breaker()
+
+    _fail(api_worker)
+    _fail(celery_worker)
+    assert api_worker.allow("charges")
+    _fail(api_worker)
+
+    assert not celery_worker.allow("charges")
+    with pytest.raises(CircuitOpenError):
+        with api_worker.guard("charges"):
+            pass
+    assert api_worker.is_open()
+
+
+def test_success_resets_consecutive_failures(fake_redis):
+    breaker = _breaker()
+    _fail(breaker)
+    _fail(breaker)
+    with breaker.guard("charges"):
+        pass
+    _fail(breaker)
+
+    assert breaker.allow("charges")
+
+
+def test_half_open_lets_exactly_one_probe_through(fake_redis):
+    breaker = _breaker()
+    for _ in range(3):
+        _fail(breaker)
+    _expire_open(fake_redis)
+
+    assert not breaker.is_open()
+    assert breaker.allow("charges") is True
+    assert breaker.allow("charges") is False
+    assert _breaker().allow("refunds") is False
+
+
+def test_successful_probe_closes_breaker(fake_redis):
+    breaker = _breaker()
+    for _ in range(3):
+        _fail(breaker)
+    _expire_open(fake_redis)
+
+    with breaker.guard("charges"):
+        pass
+
+    assert breaker.snapshot()["state"] == "closed"
+    assert breaker.allow("charges") and breaker.allow("charges")
+
+
+def test_failed_probe_reopens_breaker(fake_redis):
+    breaker = _breaker()
+    for _ in range(3):
+        _fail(breaker)
+    _expire_open(fake_redis)
+
+    _fail(breaker)
+
+    assert breaker.is_open()
+    assert breaker.snapshot()["state"] == "open"
+
+
+def test_other_errors_count_as_upstream_answering(fake_redis):
+    breaker = _breaker()
+    for _ in range(5):
+        with pytest.raises(KeyError):
+            with breaker.guard("charges"):
+                raise KeyError("declined")
+
+    assert not breaker.is_open()
+
+
+def test_snapshot_reports_per_endpoint_counters(fake_redis):
+    breaker = _breaker()
+    with breaker.guard("refunds"):
+        pass
+    for _ in range(3):
+        _fail(breaker, "transfers")
+    assert not breaker.allow("refunds")
+
+    snapshot = breaker.snapshot()
+
+    assert snapshot["state"] == "open"
+    assert 0 < snapshot["open_seconds_remaining"] <= 60
+    assert snapshot["endpoints"]["refunds"] == {"successes": 1, "failures": 0, "rejected": 1, "probes": 0, "opened": 0}
+    assert snapshot["endpoints"]["transfers"]["failures"] == 3
+    assert snapshot["endpoints"]["transfers"]["opened"] == 1
+
+
+def test_fails_open_when_redis_unavailable():
+    broken = MagicMock()
+    broken.exists.side_effect = redis.ConnectionError("down")
+    broken.pipeline.side_effect = redis.ConnectionError("down")
+    breaker = _breaker()
+
+    with patch("app.services.circuit_breaker.redis_client", return_value=broken):
+        assert not breaker.is_open()
+        with breaker.guard("charges"):
+            pass
+        _fail(breaker)
+
+
+def test_card_errors_do_not_open_payment_breaker(fake_redis):
+    from app.services.payment_service import payment_circuit_breaker
+
+    declined = stripe.CardError("Your card was declined", None, "card_declined")
+    for _ in range(payment_circuit_breaker.failure_threshold):
+        with pytest.raises(stripe.CardError):
+            with payment_circuit_breaker.guard("payment_intents"):
+                raise declined
+    assert not payment_circuit_breaker.is_open()
+
+    for _ in range(payment_circuit_breaker.failure_threshold):
+        with pytest.raises(stripe.APIConnectionError):
+            with payment_circuit_breaker.guard("payment_intents"):
+                raise stripe.APIConnectionError("timed out")
+    assert payment_circuit_breaker.is_open()
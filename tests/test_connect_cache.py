@@ -0,0 +1,176 @@
+"""Tests for cached Stripe Connect status/balance lookups and their webhook invalidation."""
+
+import json
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import fakeredis
+import pytest
+import redis
+
+from app.core.security import hash_password
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.payment_service import PaymentService
+
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+@pytest.fixture()
+def fake_redis():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.connect_cache.redis_client", return_value=r), \
+         patch("app.services.payment_service.redis_client", return_value=r), \
+         patch("app.services.payment_service.get_settings") as mock_cfg:
+        mock_cfg.return_value.stripe_secret_key = "sk_test_fake"
+        yield r
+
+
+def _service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _driver(db, account_id="acct_cache1"):
+    driver = User(
+        email=f"driver_{uuid4().hex[:6]}@test.com",
+        password_hash=_PASSWORD_HASH,
+        is_active=True,
+        payment_details=account_id,
+    )
+    db.add(driver)
+    db.flush()
+    return driver
+
+
+def _account(charges=True, payouts=True):
+    return {"id": "acct_cache1", "charges_enabled": charges, "payouts_enabled": payouts}
+
+
+def _balance(available=1250, pending=300):
+    return {
+        "available": [{"amount": available, "currency": "gbp"}],
+        "pending": [{"amount": pending, "currency": "gbp"}],
+    }
+
+
+def _age_entry(r, kind, account_id="acct_cache1", seconds=3600):
+    key = f"rideway:connect:{kind}:{account_id}"
+    entry = json.loads(r.get(key))
+    entry["fetched_at"] -= seconds
+    r.set(key, json.dumps(entry))
+
+
+def _event(event_type, obj, account=None):
+    event = {"id": f"evt_{uuid4().hex}", "type": event_type, "data": {"object": obj}}
+    if account:
+        event["account"] = account
+    return event
+
+
+def test_status_is_served_from_cache_while_fresh(db_session, fake_redis):
+    service = _service()
+    driver = _driver(db_session)
+
+    with patch("stripe.Account.retrieve", return_value=_account()) as retrieve:
+        first = service.get_connect_status(db_session, driver.id)
+        second = service.get_connect_status(db_session, driver.id)
+
+    assert first == second
+    assert second["payouts_enabled"] is True
+    retrieve.assert_called_once_with("acct_cache1")
+
+
+def test_stale_balance_served_while_one_refresh_is_queued(db_session, fake_redis):
+    service = _service()
+    driver = _driver(db_session)
+    with patch("stripe.Balance.retrieve", return_value=_balance()):
+        service.get_connect_balance(db_session, driver.id)
+    _age_entry(fake_redis, "balance")
+
+    with patch("stripe.Balance.retrieve") as retrieve, \
+         patch("app.services.payment_service.celery_app.send_task") as send_task:
+        first = service.get_connect_balance(db_session, driver.id)
+        second = service.get_connect_balance(db_session, driver.id)
+
+    assert first == second == {"available": 12.5, "pending": 3.0, "currency": "gbp"}
+    retrieve.assert_not_called()
+    send_task.assert_called_once_with(
+        "app.tasks.payment_tasks.refresh_connect_cache", args=["balance", "acct_cache1"]
+    )
+
+
+def test_refresh_replaces_stale_entry_and_releases_lock(db_session, fake_redis):
+    service = _service()
+    driver = _driver(db_session)
+    with patch("stripe.Balance.retrieve", return_value=_balance()):
+        service.get_connect_balance(db_session, driver.id)
+    _age_entry(fake_redis, "balance")
+    with patch("app.services.payment_service.celery_app.send_task"):
+        service.get_connect_balance(db_session, driver.id)
+
+    with patch("stripe.Balance.retrieve", return_value=_balance(available=5000)):
+        service.refresh_connect_cache("balance", "acct_cache1")
+
+    assert not fake_redis.exists("rideway:connect:balance:acct_cache1:refresh")
+    with patch("stripe.Balance.retrieve") as retrieve:
+        assert service.get_connect_balance(db_session, driver.id)["available"] == 50.0
+    retrieve.assert_not_called()
+
+
+def test_account_updated_webhook_invalidates_status(db_session, fake_redis):
+    service = _service()
+    driver = _driver(db_session)
+    with patch("stripe.Account.retrieve", return_value=_account(payouts=False)):
+        service.get_connect_status(db_session, driver.id)
+
+    service.process_webhook_event(db_session, _event("account.updated", _account(), account="acct_cache1"))
+
+    with patch("stripe.Account.retrieve", return_value=_account(payouts=True)) as retrieve:
+        assert service.get_connect_status(db_session, driver.id)["payouts_enabled"] is True
+    retrieve.assert_called_once()
+
+
+@pytest.mark.parametrize("event_type", ["balance.available", "payout.paid", "payout.failed"])
+def test_balance_and_payout_webhooks_invalidate_balance(db_session, fake_redis, event_type):
+    service = _service()
+    driver = _driver(db_session)
+    with patch("stripe.Balance.retrieve", return_value=_balance()), \
+         patch("stripe.Account.retrieve", return_value=_account()):
+        service.get_connect_balance(db_session, driver.id)
+        service.get_connect_status(db_session, driver.id)
+
+    service.process_webhook_event(db_session, _event(event_type, {"object": "balance"}, account="acct_cache1"))
+
+    assert not fake_redis.exists("rideway:connect:balance:acct_cache1")
+    assert fake_redis.exists("rideway:connect:status:acct_cache1")
+
+
+def test_platform_events_leave_cache_alone(db_session, fake_redis):
+    service = _service()
+    driver = _driver(db_session)
+    with patch("stripe.Balance.retrieve", return_value=_balance()):
+        service.get_connect_balance(db_session, driver.id)
+
+    assert service.process_webhook_event(db_session, _event("balance.available", {"object": "balance"})) is None
+
+    assert fake_redis.exists("rideway:connect:balance:acct_cache1")
+
+
+def test_cache_miss_falls_through_to_stripe_when_redis_down(db_session):
+    service = _service()
+    driver = _driver(db_session)
+    broken = MagicMock()
+    broken.get.side_effect = redis.ConnectionError("down")
+    broken.set.side_effect = redis.ConnectionError("down")
+
+    with patch("app.services.connect_cache.redis_client", return_value=broken), \
+         patch("app.services.payment_service.get_settings") as mock_cfg, \
+         patch("stripe.Account.retrieve", return_value=_account()) as retrieve:
+        mock_cfg.return_value.stripe_secret_key = "sk_test_fake"
+        service.get_connect_status(db_session, driver.id)
+        service.get_connect_status(db_session, driver.id)
+
+    assert retrieve.call_count == 2
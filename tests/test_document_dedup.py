@@ -0,0 +1,83 @@
+"""Tests for content-hash deduplication of identity document uploads."""
+
+import io
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.security import hash_password
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.user_repo import UserRepository
+from app.services.storage_service import content_hash
+from app.services.user_service import UserService
+
+_LICENCE = "MORRI907055SM9IJ"
+
+
+def _make_user(db):
+    u = User(email=f"user_{uuid4().hex[:6]}@test.com", password_hash=hash_password("Password1!"))
+    db.add(u)
+    db.flush()
+    return u
+
+
+@pytest.fixture()
+def upload():
+    with patch(
+        "app.services.storage_service.StorageService.upload_stream",
+        side_effect=lambda *a, **kw: f"gs://bucket/{uuid4()}",
+    ) as mock:
+        yield mock
+
+
+def test_identical_selfie_uploaded_once(db_session, upload):
+    svc = UserService(UserRepository(), BookingRepository())
+    user = _make_user(db_session)
+
+    svc.submit_selfie(db_session, user, io.BytesIO(b"same-bytes"), "image/jpeg")
+    first_url = user.selfie_url
+    svc.submit_selfie(db_session, user, io.BytesIO(b"same-bytes"), "image/jpeg")
+
+    assert upload.call_count == 1
+    assert user.selfie_url == first_url
+
+
+def test_changed_content_uploads_again(db_session, upload):
+    svc = UserService(UserRepository(), BookingRepository())
+    user = _make_user(db_session)
+
+    svc.submit_id_document(db_session, user, io.BytesIO(b"v1"), "image/jpeg")
+    svc.submit_id_document(db_session, user, io.BytesIO(b"v2"), "image/jpeg")
+
+    assert upload.call_count == 2
+
+
+def test_identical_licence_photo_uploaded_once(db_session, upload):
+    svc = UserService(UserRepository(), BookingRepository())
+    user = _make_user(db_session)
+
+    with patch("app.services.user_service.celery_app.send_task"):
+        for _ in range(2):
+            svc.submit_driver_license(db_session, user, _LICENCE, io.BytesIO(b"licence-photo"), "image/jpeg")
+
+    assert upload.call_count == 1
+
+
+def test_racing_duplicate_reuses_existing_row_and_deletes_its_blob(db_session, upload):
+    svc = UserService(UserRepository(), BookingRepository())
+    user = _make_user(db_session)
+    svc.submit_selfie(db_session, user, io.BytesIO(b"same-bytes"), "image/jpeg")
+    winner_url = user.selfie_url
+    existing = svc.stored_object_repo.get_by_hash(db_session, user.id, "selfies", content_hash(io.BytesIO(b"same-bytes")))
+
+    # The first hash lookup misses, as it does for a request racing the winner's insert
+    with patch.object(svc.stored_object_repo, "get_by_hash", side_effect=[None, existing]), \
+         patch("app.services.storage_service.StorageService.delete") as delete:
+        svc.submit_selfie(db_session, user, io.BytesIO(b"same-bytes"), "image/jpeg")
+
+    assert upload.call_count == 2
+    assert user.selfie_url == winner_url
+    delete.assert_called_once()
+    assert delete.call_args.args[0] != winner_url
@@ -0,0 +1,162 @@
+"""Tests for the driver earnings ledger and its precomputed balances."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.core.constants import BookingStatus, LedgerEntryType, PaymentStatus
+from app.core.security import hash_password
+from app.models.booking import Booking
+from app.models.ledger import DriverLedgerEntry
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.payment_service import PaymentService
+from app.utils.pagination import next_cursor
+
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+@pytest.fixture(autouse=True)
+def stripe_settings():
+    with patch("app.services.payment_service.get_settings") as cfg:
+        cfg.return_value.stripe_secret_key = "sk_test_fake"
+        yield
+
+
+def _service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _make_user(db, payment_details=None):
+    user = User(email=f"user_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH, payment_details=payment_details)
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _make_payment(db, driver, payout_amount=18.0):
+    trip = Trip(
+        driver_id=driver.id,
+        origin_city="London",
+        destination_city="Leeds",
+        departure_time=datetime.now(timezone.utc) + timedelta(days=1),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+    )
+    db.add(trip)
+    db.flush()
+    booking = Booking(
+        trip_id=trip.id, passenger_id=_make_user(db).id, seats=1, total_amount=20.0,
+        status=BookingStatus.PENDING_PAYMENT,
+    )
+    db.add(booking)
+    db.flush()
+    payment = Payment(
+        booking_id=booking.id, amount=20.0, platform_fee=20.0 - payout_amount, payout_amount=payout_amount,
+        status=PaymentStatus.REQUIRES_PAYMENT_METHOD, stripe_payment_intent_id=f"pi_{uuid4().hex[:8]}",
+    )
+    db.add(payment)
+    db.flush()
+    return payment
+
+
+def _succeed(service, db, payment):
+    event = {
+        "id": f"evt_{uuid4().hex}",
+        "type": "payment_intent.succeeded",
+        "data": {"object": {"metadata": {"booking_id": str(payment.booking_id)}, "latest_charge": "ch_1"}},
+    }
+    service._apply_webhook_event(db, event, payment)
+
+
+def _entries(db, driver_id):
+    stmt = select(DriverLedgerEntry).where(DriverLedgerEntry.driver_id == driver_id)
+    return list(db.execute(stmt).scalars())
+
+
+def test_payment_success_appends_one_earning(db_session):
+    service = _service()
+    driver = _make_user(db_session)
+    payment = _make_payment(db_session, driver)
+
+    _succeed(service, db_session, payment)
+    _succeed(service, db_session, payment)  # replayed webhook
+
+    [entry] = _entries(db_session, driver.id)
+    assert entry.entry_type == LedgerEntryType.EARNING
+    assert float(entry.amount) == 18.0
+    assert float(entry.balance) == 18.0
+    earnings = service.get_driver_earnings(db_session, driver.id)
+    assert float(earnings.balance) == 18.0
+    assert float(earnings.total_earned) == 18.0
+
+
+def test_refund_reverses_the_earning(db_session):
+    service = _service()
+    driver = _make_user(db_session)
+    payment = _make_payment(db_session, driver)
+    _succeed(service, db_session, payment)
+
+    with patch("stripe.Refund.create"):
+        service.refund_for_cancellation(db_session, payment.booking_id)
+
+    refund = next(e for e in _entries(db_session, driver.id) if e.entry_type == LedgerEntryType.REFUND)
+    assert float(refund.amount) == -18.0
+    assert float(refund.balance) == 0.0
+    earnings = service.get_driver_earnings(db_session, driver.id)
+    assert float(earnings.total_refunded) == 18.0
+    assert float(earnings.balance) == 0.0
+
+
+def test_batched_transfer_is_one_ledger_entry(db_session):
+    service = _service()
+    driver = _make_user(db_session, payment_details="acct_drv")
+    for amount in (18.0, 9.0):
+        payment = _make_payment(db_session, driver, amount)
+        _succeed(service, db_session, payment)
+        db_session.get(Booking, payment.booking_id).status = BookingStatus.COMPLETED
+    transfer = MagicMock()
+    transfer.id = "tr_batch"
+
+    with patch("stripe.Transfer.create", return_value=transfer):
+        batch = service.payout_driver(db_session, driver.id)
+
+    transfers = [e for e in _entries(db_session, driver.id) if e.entry_type == LedgerEntryType.TRANSFER]
+    assert len(transfers) == 1
+    assert transfers[0].payout_batch_id == batch.id
+    assert float(transfers[0].amount) == -27.0
+    earnings = service.get_driver_earnings(db_session, driver.id)
+    assert float(earnings.balance) == 0.0
+    assert (float(earnings.total_earned), float(earnings.total_transferred)) == (27.0, 27.0)
+
+
+def test_ledger_is_keyset_paginated_newest_first(db_session):
+    service = _service()
+    driver = _make_user(db_session)
+    for amount in (1.0, 2.0, 3.0):
+        _succeed(service, db_session, _make_payment(db_session, driver, amount))
+
+    first = service.list_driver_ledger(db_session, driver.id, limit=2)
+    second = service.list_driver_ledger(db_session, driver.id, limit=2, cursor=next_cursor(first, 2))
+
+    assert [float(e.balance) for e in first + second] == [6.0, 3.0, 1.0]
+    assert next_cursor(second, 2) is None
+
+
+def test_driver_without_entries_has_zero_earnings(db_session):
+    earnings = _service().get_driver_earnings(db_session, uuid4())
+
+    assert float(earnings.balance) == 0.0
+    assert float(earnings.total_earned) == 0.0
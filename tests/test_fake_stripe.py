@@ -0,0 +1,120 @@
+"""Tests for the local Stripe stand-in, driven through the real stripe SDK."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import stripe
+
+from app.devtools.fake_stripe import FakeStripeConfig, make_server
+
+
+@pytest.fixture()
+def fake_stripe():
+    server = make_server(port=0, config=FakeStripeConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = stripe.api_base, stripe.api_key, stripe.max_network_retries
+    stripe.api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    stripe.api_key = "sk_test_fake"
+    stripe.max_network_retries = 0
+    try:
+        yield server.stripe
+    finally:
+        stripe.api_base, stripe.api_key, stripe.max_network_retries = saved
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture()
+def webhook_sink():
+    received = []
+
+    class Sink(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((body, self.headers["Stripe-Signature"]))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Sink)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/webhook", received
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.02)
+
+
+def test_payment_intent_lifecycle(fake_stripe):
+    intent = stripe.PaymentIntent.create(amount=2000, currency="gbp", metadata={"booking_id": "b1"})
+
+    assert intent.status == "requires_payment_method"
+    assert intent.metadata["booking_id"] == "b1"
+    assert intent.client_secret.startswith(intent.id)
+
+    fake_stripe.confirm_payment_intent(intent.id, {})
+    assert stripe.PaymentIntent.retrieve(intent.id).status == "succeeded"
+
+
+def test_idempotency_key_replays_response(fake_stripe):
+    first = stripe.PaymentIntent.create(amount=500, currency="gbp", idempotency_key="pi:1")
+    second = stripe.PaymentIntent.create(amount=500, currency="gbp", idempotency_key="pi:1")
+
+    assert first.id == second.id
+    assert len(fake_stripe.objects["payment_intent"]) == 1
+
+
+def test_transfer_credits_connected_balance(fake_stripe):
+    account = stripe.Account.create(type="custom", country="GB", email="d@example.com")
+    intent = stripe.PaymentIntent.create(amount=2000, currency="gbp")
+    fake_stripe.confirm_payment_intent(intent.id, {})
+
+    stripe.Transfer.create(amount=1800, currency="gbp", destination=account.id, transfer_group="payout_1")
+    stripe.Refund.create(payment_intent=intent.id, amount=200)
+
+    connected = stripe.Balance.retrieve(stripe_account=account.id)
+    assert connected["available"][0]["amount"] == 1800
+    assert stripe.Balance.retrieve()["available"][0]["amount"] == 0
+    with pytest.raises(stripe.InvalidRequestError):
+        stripe.Payout.create(amount=5000, currency="gbp", stripe_account=account.id)
+
+
+def test_injected_errors_surface_as_stripe_errors(fake_stripe):
+    fake_stripe.config.error_rate = 1.0
+
+    with pytest.raises(stripe.APIError):
+        stripe.PaymentIntent.create(amount=500, currency="gbp")
+
+
+def test_webhooks_are_signed_like_stripe(fake_stripe, webhook_sink):
+    url, received = webhook_sink
+    fake_stripe.config.webhook_url = url
+    intent = stripe.PaymentIntent.create(amount=700, currency="gbp", metadata={"booking_id": "b2"})
+
+    stripe.PaymentIntent.confirm(intent.id)
+    _wait_for(lambda: received)
+
+    payload, signature = received[0]
+    event = stripe.Webhook.construct_event(payload, signature, fake_stripe.config.webhook_secret)
+    assert event["type"] == "payment_intent.succeeded"
+    assert json.loads(payload)["data"]["object"]["metadata"]["booking_id"] == "b2"
+
+
+def test_list_paginates_with_starting_after(fake_stripe):
+    for amount in range(100, 105):
+        stripe.PaymentIntent.create(amount=amount, currency="gbp")
+
+    seen = [intent.id for intent in stripe.PaymentIntent.list(limit=2).auto_paging_iter()]
+
+    assert len(seen) == 5 and len(set(seen)) == 5
@@ -0,0 +1,127 @@
+"""Tests for Idempotency-Key replay of booking / payment-intent creation."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.routes import payments
+from app.core.dependencies import get_current_user, get_db, rate_limit_state
+from app.services.idempotency_service import IdempotentRequest
+
+
+@pytest.fixture()
+def fake_redis():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.idempotency_service.redis_client", return_value=r):
+        yield r
+
+
+def test_no_key_is_a_no_op(fake_redis):
+    guard = IdempotentRequest("bookings_create", uuid4(), None, {"trip_id": "t", "seats": 1})
+
+    assert guard.replay() is None
+    guard.store(201, {"data": {}})
+    assert fake_redis.keys("*") == []
+
+
+def test_first_request_executes_then_replays(fake_redis):
+    user_id = uuid4()
+    payload = {"trip_id": "t1", "seats": 2}
+    first = IdempotentRequest("bookings_create", user_id, "key-1", payload)
+    assert first.replay() is None
+    first.store(201, {"data": {"id": "b1"}})
+
+    second = IdempotentRequest("bookings_create", user_id, "key-1", payload)
+    response = second.replay()
+
+    assert response is not None
+    assert response.status_code == 201
+    assert json.loads(response.body) == {"data": {"id": "b1"}}
+    assert response.headers["Idempotent-Replayed"] == "true"
+
+
+def test_key_reused_with_different_payload_rejected(fake_redis):
+    user_id = uuid4()
+    first = IdempotentRequest("bookings_create", user_id, "key-2", {"trip_id": "t1", "seats": 1})
+    first.replay()
+    first.store(201, {"data": {"id": "b1"}})
+
+    second = IdempotentRequest("bookings_create", user_id, "key-2", {"trip_id": "t1", "seats": 3})
+    with pytest.raises(ValueError, match="different request"):
+        second.replay()
+
+
+def test_keys_are_scoped_per_user(fake_redis):
+    payload = {"booking_id": "b1"}
+    first = IdempotentRequest("payments_intent", uuid4(), "shared", payload)
+    first.replay()
+    first.store(200, {"data": {"id": "p1"}})
+
+    other_user = IdempotentRequest("payments_intent", uuid4(), "shared", payload)
+    assert other_user.replay() is None
+
+
+def test_in_flight_duplicate_times_out(fake_redis):
+    user_id = uuid4()
+    payload = {"booking_id": "b1"}
+    first = IdempotentRequest("payments_intent", user_id, "key-3", payload)
+    assert first.replay() is None
+
+    second = IdempotentRequest("payments_intent", user_id, "key-3", payload)
+    with patch("app.services.idempotency_service._WAIT_SECONDS", 0.2):
+        with pytest.raises(ValueError, match="in progress"):
+            second.replay()
+
+
+def test_release_allows_retry_after_failure(fake_redis):
+    user_id = uuid4()
+    payload = {"booking_id": "b1"}
+    first = IdempotentRequest("payments_intent", user_id, "key-4", payload)
+    first.replay()
+    first.release()
+
+    retry = IdempotentRequest("payments_intent", user_id, "key-4", payload)
+    assert retry.replay() is None
+    assert retry.acquired is True
+
+
+@pytest.fixture()
+def intent_client(fake_redis):
+    user = SimpleNamespace(id=uuid4())
+    app = FastAPI()
+    app.include_router(payments.router, prefix="/payments")
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    app.dependency_overrides[get_current_user] = lambda: user
+    rate_limit_state.clear()
+    yield TestClient(app), user
+    rate_limit_state.clear()
+
+
+def test_replays_are_not_rate_limited(intent_client, fake_redis):
+    client, user = intent_client
+    payload = {"booking_id": "b1"}
+    first = IdempotentRequest("payments_intent", user.id, "key-5", payload)
+    first.replay()
+    first.store(200, {"data": {"id": "p1"}})
+
+    for _ in range(8):
+        response = client.post("/payments/intent", json=payload, headers={"Idempotency-Key": "key-5"})
+        assert response.status_code == 200
+        assert response.json() == {"data": {"id": "p1"}}
+
+
+def test_new_requests_still_rate_limited_and_release_key(intent_client, fake_redis):
+    client, _ = intent_client
+    with patch.object(payments.payment_service, "create_payment_intent", side_effect=ValueError("Booking not found")):
+        for _ in range(5):
+            assert client.post("/payments/intent", json={"booking_id": "b1"}).status_code == 400
+        response = client.post("/payments/intent", json={"booking_id": "b1"}, headers={"Idempotency-Key": "key-6"})
+
+    assert response.status_code == 429
+    assert fake_redis.keys("*key-6*") == []
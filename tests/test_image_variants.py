@@ -0,0 +1,109 @@
+"""Tests for avatar / vehicle photo variant generation."""
+
+import io
+from dataclasses import replace
+from unittest.mock import patch
+from uuid import uuid4
+
+from PIL import Image
+
+from app.core.config import get_settings
+from app.core.security import hash_password
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.user_repo import UserRepository
+from app.services.storage_service import StorageService
+from app.services.user_service import UserService
+from app.tasks.media_tasks import generate_photo_variants
+from app.utils.images import build_variants
+
+
+def _jpeg_with_exif(width=2000, height=1000) -> bytes:
+    exif = Image.Exif()
+    exif[0x010F] = "TestCam"  # Make
+    exif[0x0112] = 6  # Orientation: rotate 90° CW
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(out, format="JPEG", exif=exif)
+    return out.getvalue()
+
+
+def test_variants_are_resized_rotated_and_stripped():
+    variants = build_variants(_jpeg_with_exif())
+
+    assert set(variants) == {"thumb", "medium"}
+    for size, edge in (("thumb", 128), ("medium", 512)):
+        for fmt, (content, content_type) in variants[size].items():
+            with Image.open(io.BytesIO(content)) as img:
+                assert img.format.lower() == fmt
+                assert content_type == f"image/{fmt}"
+                assert (img.width, img.height) == (edge // 2, edge)  # orientation applied
+                assert not img.getexif()
+
+
+def test_task_records_variant_urls(db_session, tmp_path):
+    settings = replace(get_settings(), storage_backend="local", local_storage_dir=str(tmp_path))
+    with patch("app.services.storage_service.get_settings", return_value=settings):
+        source_url = StorageService().upload_bytes(_jpeg_with_exif(), "image/jpeg", folder="avatars")
+        user = User(
+            email=f"user_{uuid4().hex[:6]}@test.com",
+            password_hash=hash_password("Password1!"),
+            profile_photo_url=source_url,
+        )
+        db_session.add(user)
+        db_session.commit()
+
+        with patch("app.core.database.create_db_session", return_value=db_session), \
+             patch.object(db_session, "close"):
+            generate_photo_variants.run(str(user.id), "avatar", source_url)
+
+    db_session.refresh(user)
+    assert set(user.profile_photo_variants) == {"thumb", "medium"}
+    assert user.profile_photo_variants["thumb"]["webp"].startswith("file://")
+
+
+def _make_user(db):
+    user = User(email=f"user_{uuid4().hex[:6]}@test.com", password_hash=hash_password("Password1!"))
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_variants_queued_only_after_upload_commits(db_session):
+    svc = UserService(UserRepository(), BookingRepository())
+    user = _make_user(db_session)
+
+    with patch("app.services.storage_service.StorageService.upload_stream", return_value="https://cdn/avatar.jpg"), \
+         patch("app.services.user_service.celery_app.send_task") as send_task:
+        svc.update_avatar(db_session, user, io.BytesIO(b"img"), "image/jpeg")
+        send_task.assert_not_called()
+        db_session.commit()
+
+    send_task.assert_called_once()
+    assert send_task.call_args.kwargs["args"] == [str(user.id), "avatar", "https://cdn/avatar.jpg"]
+
+
+def test_rolled_back_upload_queues_no_variants(db_session):
+    svc = UserService(UserRepository(), BookingRepository())
+    user = _make_user(db_session)
+
+    with patch("app.services.storage_service.StorageService.upload_stream", return_value="https://cdn/vehicle.jpg"), \
+         patch("app.services.user_service.celery_app.send_task") as send_task:
+        svc.update_vehicle_photo(db_session, user, io.BytesIO(b"img"), "image/jpeg")
+        db_session.rollback()
+
+    send_task.assert_not_called()
+
+
+def test_replaced_photo_is_skipped_without_retry(db_session):
+    user = _make_user(db_session)
+    user.profile_photo_url = "https://cdn/newer.jpg"
+    db_session.commit()
+
+    with patch("app.core.database.create_db_session", return_value=db_session), \
+         patch.object(db_session, "close"), \
+         patch.object(generate_photo_variants, "retry") as retry, \
+         patch("app.services.storage_service.StorageService.download_bytes") as download:
+        generate_photo_variants.run(str(user.id), "avatar", "https://cdn/older.jpg")
+
+    retry.assert_not_called()
+    download.assert_not_called()
@@ -0,0 +1,243 @@
+"""Tests for the background driver licence OCR check."""
+
+import io
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.routes import admin
+from app.core.constants import IdentityVerificationStatus, LicenceOcrStatus
+from app.core.dependencies import get_current_user, get_db
+from app.core.security import hash_password
+from app.models.stored_object import StoredObject
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.user_repo import UserRepository
+from app.services.user_service import UserService
+
+_LICENCE = "MORRI907055SM9IJ"
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+def _make_user(db):
+    u = User(email=f"user_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    db.add(u)
+    db.flush()
+    return u
+
+
+@pytest.fixture()
+def svc():
+    with patch(
+        "app.services.storage_service.StorageService.upload_stream",
+        side_effect=lambda *a, **kw: f"gs://bucket/{uuid4()}",
+    ), patch(
+        "app.services.storage_service.StorageService.download_bytes", return_value=b"licence-photo",
+    ):
+        yield UserService(UserRepository(), BookingRepository())
+
+
+def _submit(svc, db, user, licence=_LICENCE, content=b"licence-photo"):
+    """Submit a licence and return the stored object id the OCR task was queued with."""
+    with patch("app.services.user_service.celery_app.send_task") as send_task:
+        svc.submit_driver_license(db, user, licence, io.BytesIO(content), "image/jpeg")
+        db.commit()
+    return UUID(send_task.call_args.kwargs["args"][1])
+
+
+def _vision(extracted):
+    vision = MagicMock()
+    vision.extract_licence_number.return_value = extracted
+    return vision
+
+
+def test_upload_queues_ocr_after_commit_without_calling_vision(db_session, svc):
+    user = _make_user(db_session)
+
+    with patch("app.services.user_service.celery_app.send_task") as send_task:
+        svc.submit_driver_license(db_session, user, _LICENCE, io.BytesIO(b"licence-photo"), "image/jpeg")
+        send_task.assert_not_called()
+        db_session.commit()
+
+    send_task.assert_called_once()
+    assert send_task.call_args.args[0] == "app.tasks.verification_tasks.verify_licence_ocr"
+    assert send_task.call_args.kwargs["args"][0] == str(user.id)
+    assert user.licence_ocr_status == LicenceOcrStatus.PENDING
+    assert user.identity_verification_status == IdentityVerificationStatus.PENDING
+
+
+def test_rolled_back_upload_queues_no_ocr(db_session, svc):
+    user = _make_user(db_session)
+
+    with patch("app.services.user_service.celery_app.send_task") as send_task:
+        svc.submit_driver_license(db_session, user, _LICENCE, io.BytesIO(b"licence-photo"), "image/jpeg")
+        db_session.rollback()
+
+    send_task.assert_not_called()
+
+
+def test_matching_photo_marked_matched(db_session, svc):
+    user = _make_user(db_session)
+    stored_id = _submit(svc, db_session, user)
+
+    status = svc.apply_licence_ocr(db_session, user.id, stored_id, _vision(_LICENCE))
+
+    assert status == LicenceOcrStatus.MATCHED
+    assert user.licence_ocr_checked_at is not None
+    assert user.identity_verification_status == IdentityVerificationStatus.PENDING
+
+
+def test_mismatch_rejects_and_emails(db_session, svc):
+    user = _make_user(db_session)
+    stored_id = _submit(svc, db_session, user)
+    email = MagicMock()
+
+    status = svc.apply_licence_ocr(db_session, user.id, stored_id, _vision("SMITH907055SM9IJ"), email)
+
+    assert status == LicenceOcrStatus.MISMATCHED
+    assert user.identity_verification_status == IdentityVerificationStatus.REJECTED
+    assert "does not match" in email.send_verification_rejected_email.call_args.kwargs["reason"]
+
+
+def test_unreadable_photo_left_for_manual_review(db_session, svc):
+    user = _make_user(db_session)
+    stored_id = _submit(svc, db_session, user)
+
+    status = svc.apply_licence_ocr(db_session, user.id, stored_id, _vision(None))
+
+    assert status == LicenceOcrStatus.UNREADABLE
+    assert user.identity_verification_status == IdentityVerificationStatus.PENDING
+
+
+def test_ocr_result_cached_by_image_hash(db_session, svc):
+    user = _make_user(db_session)
+    vision = _vision(_LICENCE)
+    first = _submit(svc, db_session, user)
+    svc.apply_licence_ocr(db_session, user.id, first, vision)
+
+    # Same photo re-submitted with a different number: the memoized OCR still catches it
+    second = _submit(svc, db_session, user, licence="SMITH907055SM9IJ")
+    status = svc.apply_licence_ocr(db_session, user.id, second, vision)
+
+    assert second == first
+    assert vision.extract_licence_number.call_count == 1
+    assert status == LicenceOcrStatus.MISMATCHED
+
+
+def test_replaced_photo_is_skipped(db_session, svc):
+    user = _make_user(db_session)
+    stale = _submit(svc, db_session, user)
+    _submit(svc, db_session, user, content=b"new-photo")
+    vision = _vision(_LICENCE)
+
+    assert svc.apply_licence_ocr(db_session, user.id, stale, vision) is None
+    vision.extract_licence_number.assert_not_called()
+
+
+# ── backlog batch mode ─────────────────────────────────────────────────────
+
+def _make_pending_driver(db, licence=_LICENCE, submitted_hours_ago=2):
+    u = _make_user(db)
+    u.driver_license_url = f"gs://bucket/{uuid4()}"
+    u.driver_license_number = licence
+    u.identity_verification_status = IdentityVerificationStatus.PENDING
+    u.updated_at = datetime.now(timezone.utc) - timedelta(hours=submitted_hours_ago)
+    db.flush()
+    return u
+
+
+def _batch_vision(read):
+    """Vision mock whose batch call maps each image (the downloaded URL) through `read`."""
+    vision = MagicMock()
+    vision.extract_licence_numbers.side_effect = lambda images: [read(i.decode()) for i in images]
+    return vision
+
+
+@pytest.fixture()
+def backlog_svc():
+    with patch(
+        "app.services.storage_service.StorageService.download_bytes", side_effect=lambda url: url.encode(),
+    ):
+        yield UserService(UserRepository(), BookingRepository())
+
+
+def test_backlog_sent_to_vision_in_batches(db_session, backlog_svc):
+    users = [_make_pending_driver(db_session) for _ in range(20)]
+    mismatched = users[3]
+    vision = _batch_vision(lambda url: "SMITH907055SM9IJ" if url == mismatched.driver_license_url else _LICENCE)
+
+    counts = backlog_svc.process_licence_ocr_backlog(db_session, vision)
+
+    assert sorted(len(c.args[0]) for c in vision.extract_licence_numbers.call_args_list) == [4, 16]
+    assert counts["MATCHED"] == 19 and counts["MISMATCHED"] == 1
+    assert mismatched.identity_verification_status == IdentityVerificationStatus.REJECTED
+    assert all(u.licence_ocr_checked_at is not None for u in users)
+
+
+def test_backlog_reuses_memoized_ocr(db_session, backlog_svc):
+    user = _make_pending_driver(db_session)
+    db_session.add(StoredObject(
+        owner_id=user.id, folder="driver_licences", sha256="abc", url=user.driver_license_url,
+        content_type="image/jpeg", size_bytes=1, ocr_licence_number=_LICENCE,
+        ocr_checked_at=datetime.now(timezone.utc),
+    ))
+    db_session.flush()
+    vision = _batch_vision(lambda url: _LICENCE)
+
+    counts = backlog_svc.process_licence_ocr_backlog(db_session, vision)
+
+    vision.extract_licence_numbers.assert_not_called()
+    assert counts["MATCHED"] == 1
+    assert user.licence_ocr_status == LicenceOcrStatus.MATCHED
+
+
+def test_failed_batch_left_for_next_run(db_session, backlog_svc):
+    user = _make_pending_driver(db_session)
+    vision = MagicMock()
+    vision.extract_licence_numbers.side_effect = RuntimeError("Vision unavailable")
+
+    counts = backlog_svc.process_licence_ocr_backlog(db_session, vision)
+
+    assert counts["failed"] == 1
+    assert user.licence_ocr_checked_at is None
+    assert user.identity_verification_status == IdentityVerificationStatus.PENDING
+
+
+def test_recent_submission_left_to_its_own_task(db_session, backlog_svc):
+    _make_pending_driver(db_session, submitted_hours_ago=0)
+    vision = _batch_vision(lambda url: _LICENCE)
+
+    backlog_svc.process_licence_ocr_backlog(db_session, vision)
+
+    vision.extract_licence_numbers.assert_not_called()
+
+
+@pytest.fixture()
+def admin_client(db_session):
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/admin")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: User(is_admin=True)
+    return TestClient(app)
+
+
+def test_pending_queue_filters_by_ocr_status(db_session, admin_client):
+    user = _make_user(db_session)
+    user.identity_verification_status = IdentityVerificationStatus.PENDING
+    user.licence_ocr_status = LicenceOcrStatus.MISMATCHED
+    db_session.flush()
+
+    response = admin_client.get("/admin/users/pending-verification", params={"licence_ocr_status": "MISMATCHED"})
+
+    assert response.status_code == 200
+    assert [u["id"] for u in response.json()["data"]] == [str(user.id)]
+
+
+def test_unknown_ocr_status_is_rejected(admin_client):
+    response = admin_client.get("/admin/users/pending-verification", params={"licence_ocr_status": "BOGUS"})
+
+    assert response.status_code == 422
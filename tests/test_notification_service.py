@@ -0,0 +1,154 @@
+"""Tests for notification keyset listing, retention archiving and batch delivery."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.constants import NotificationType
+from app.core.security import hash_password
+from app.models.device import Device
+from app.models.notification import Notification, NotificationArchive
+from app.models.user import User
+from app.repositories.device_repo import DeviceRepository
+from app.repositories.notification_repo import NotificationRepository
+from app.repositories.user_repo import UserRepository
+from app.services.notification_service import NotificationService
+from app.utils.pagination import next_cursor
+
+
+def _make_service():
+    return NotificationService(DeviceRepository(), NotificationRepository(), UserRepository())
+
+
+def _make_user(db):
+    u = User(
+        email=f"user_{uuid4().hex[:6]}@test.com",
+        password_hash=hash_password("Password1!"),
+        is_active=True,
+    )
+    db.add(u)
+    db.flush()
+    return u
+
+
+def _make_notifications(db, user, count, start):
+    rows = [
+        Notification(
+            user_id=user.id,
+            notification_type=NotificationType.GENERAL,
+            title=f"n{i}",
+            body="body",
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    db.add_all(rows)
+    db.flush()
+    return rows
+
+
+def test_cursor_pages_cover_every_row_once(db_session):
+    svc = _make_service()
+    user = _make_user(db_session)
+    _make_notifications(db_session, user, 7, datetime.now(timezone.utc) - timedelta(days=1))
+
+    seen, cursor = [], None
+    while True:
+        page = svc.list_notifications(db_session, user, limit=3, cursor=cursor)
+        seen.extend(n.title for n in page)
+        cursor = next_cursor(page, 3)
+        if cursor is None:
+            break
+
+    assert seen == [f"n{i}" for i in reversed(range(7))]
+
+
+def test_invalid_cursor_raises(db_session):
+    svc = _make_service()
+    user = _make_user(db_session)
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        svc.list_notifications(db_session, user, limit=10, cursor="not-a-cursor")
+
+
+def test_archive_moves_only_expired_rows(db_session):
+    svc = _make_service()
+    user = _make_user(db_session)
+    now = datetime.now(timezone.utc)
+    _make_notifications(db_session, user, 3, now - timedelta(days=200))
+    _make_notifications(db_session, user, 2, now - timedelta(days=1))
+
+    archived = svc.archive_expired(db_session, batch_size=2)
+    archived += svc.archive_expired(db_session, batch_size=2)
+
+    assert archived == 3
+    assert db_session.scalar(select(func.count()).select_from(Notification)) == 2
+    rows = db_session.execute(select(NotificationArchive)).scalars().all()
+    assert len(rows) == 3
+    assert all(r.user_id == user.id and r.archived_at is not None for r in rows)
+
+
+
+def test_purge_removes_rows_by_archive_time(db_session):
+    svc = _make_service()
+    user = _make_user(db_session)
+    now = datetime.now(timezone.utc)
+    created = now - timedelta(days=500)
+    for title, archived_days_ago in (("old", 400), ("recent", 10)):
+        db_session.add(NotificationArchive(
+            id=uuid4(), user_id=user.id, notification_type=NotificationType.GENERAL, title=title, body="body",
+            created_at=created, archived_at=now - timedelta(days=archived_days_ago),
+        ))
+    db_session.flush()
+
+    svc.archive_expired(db_session)
+
+    titles = db_session.execute(select(NotificationArchive.title)).scalars().all()
+    assert titles == ["recent"]
+
+def test_batch_notifications_send_push_only_after_commit(db_session):
+    svc = _make_service()
+    user = _make_user(db_session)
+    items = [{
+        "user_id": user.id,
+        "notification_type": NotificationType.BOOKING_CANCELLED,
+        "title": "Booking cancelled",
+        "body": "Seat released",
+        "data": {"booking_id": "b1"},
+    }]
+
+    with patch("app.services.notification_service.celery_app.send_task") as send_task, \
+         patch.object(svc, "_send_push") as send_push:
+        created = svc.create_notifications(db_session, items)
+        send_task.assert_not_called()
+        db_session.commit()
+
+    send_push.assert_not_called()
+    assert len(created) == 1
+    name = send_task.call_args.args[0]
+    [payload] = send_task.call_args.kwargs["args"][0]
+    assert name == "app.tasks.notification_tasks.deliver_external_notifications"
+    assert payload["user_id"] == str(user.id)
+    assert payload["data"] == {"type": "BOOKING_CANCELLED", "booking_id": "b1"}
+
+
+def test_queued_delivery_pushes_to_each_device(db_session):
+    svc = _make_service()
+    user = _make_user(db_session)
+    db_session.add(Device(user_id=user.id, device_token="tok-1", platform="ios"))
+    db_session.flush()
+    payload = {
+        "user_id": str(user.id),
+        "notification_type": "BOOKING_CANCELLED",
+        "title": "Booking cancelled",
+        "body": "Seat released",
+        "data": {"type": "BOOKING_CANCELLED"},
+    }
+
+    with patch.object(svc, "_send_push", return_value=True) as send_push:
+        svc.deliver_external_batch(db_session, [payload])
+
+    send_push.assert_called_once_with("tok-1", "Booking cancelled", "Seat released", {"type": "BOOKING_CANCELLED"})
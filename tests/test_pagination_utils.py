@@ -17,3 +17,24 @@ def test_normalize_pagination_caps_limit():
 def test_normalize_pagination_rejects_negative():
     with pytest.raises(ValueError):
         normalize_pagination(0, -1)
+
+
+def test_cursor_round_trip():
+    from datetime import datetime, timezone
+    from uuid import uuid4
+
+    from app.utils.pagination import decode_cursor, encode_cursor
+
+    created_at = datetime(2026, 8, 1, 12, 30, tzinfo=timezone.utc)
+    row_id = uuid4()
+    cursor = decode_cursor(encode_cursor(created_at, row_id))
+    assert cursor.created_at == created_at
+    assert cursor.id == row_id
+
+
+def test_decode_cursor_rejects_garbage():
+    from app.utils.pagination import decode_cursor
+
+    assert decode_cursor(None) is None
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
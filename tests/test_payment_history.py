@@ -0,0 +1,110 @@
+"""Tests for keyset-paginated passenger payment history."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.constants import BookingStatus, PaymentStatus
+from app.core.security import hash_password
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.payment_service import PaymentService
+from app.utils.pagination import next_cursor
+
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+def _service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _make_user(db):
+    user = User(email=f"user_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _make_booking(db, passenger):
+    trip = Trip(
+        driver_id=_make_user(db).id,
+        origin_city="London",
+        destination_city="Leeds",
+        departure_time=datetime.now(timezone.utc) + timedelta(days=1),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+    )
+    db.add(trip)
+    db.flush()
+    booking = Booking(
+        trip_id=trip.id, passenger_id=passenger.id, seats=1, total_amount=20.0, status=BookingStatus.PENDING_PAYMENT,
+    )
+    db.add(booking)
+    db.flush()
+    return booking
+
+
+def _make_payment(db, passenger, days_ago=0, status=PaymentStatus.SUCCEEDED):
+    booking = _make_booking(db, passenger)
+    payment = Payment(
+        booking_id=booking.id, payer_id=passenger.id, amount=20.0, platform_fee=2.0, payout_amount=18.0,
+        status=status, created_at=datetime.now(timezone.utc) - timedelta(days=days_ago, minutes=1),
+    )
+    db.add(payment)
+    db.flush()
+    return payment
+
+
+def test_new_payment_records_its_payer(db_session):
+    passenger = _make_user(db_session)
+    booking = _make_booking(db_session, passenger)
+    intent = MagicMock(id="pi_payer", client_secret="pi_payer_secret")
+
+    with patch("app.services.payment_service.get_settings") as cfg, \
+         patch("stripe.PaymentIntent.create", return_value=intent):
+        cfg.return_value.stripe_secret_key = "sk_test_fake"
+        payment = _service().create_payment_intent(db_session, booking.id, passenger.id)
+
+    assert payment.payer_id == passenger.id
+
+
+def test_history_pages_follow_the_cursor(db_session):
+    passenger = _make_user(db_session)
+    payments = [_make_payment(db_session, passenger, days_ago=days) for days in (1, 2, 3, 4, 5)]
+    service = _service()
+
+    first = service.list_payment_history(db_session, passenger.id, "30d", limit=2)
+    second = service.list_payment_history(db_session, passenger.id, "30d", limit=2, cursor=next_cursor(first, 2))
+    third = service.list_payment_history(db_session, passenger.id, "30d", limit=2, cursor=next_cursor(second, 2))
+
+    assert [p.id for p in first + second + third] == [p.id for p in payments]
+    assert next_cursor(third, 2) is None
+
+
+def test_history_only_lists_the_payers_succeeded_payments_in_period(db_session):
+    passenger = _make_user(db_session)
+    kept = _make_payment(db_session, passenger, days_ago=3)
+    _make_payment(db_session, passenger, days_ago=3, status=PaymentStatus.FAILED)
+    _make_payment(db_session, passenger, days_ago=40)
+    _make_payment(db_session, _make_user(db_session), days_ago=3)
+
+    history = _service().list_payment_history(db_session, passenger.id, "30d")
+
+    assert [p.id for p in history] == [kept.id]
+
+
+def test_invalid_cursor_is_rejected(db_session):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _service().list_payment_history(db_session, uuid4(), "30d", cursor="not-a-cursor")
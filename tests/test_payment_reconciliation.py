@@ -0,0 +1,197 @@
+"""Tests for the scheduled reconciliation of payments against Stripe PaymentIntents."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import fakeredis
+import pytest
+import stripe
+
+from app.core.constants import PAYMENT_RECONCILE_OPEN_LOOKBACK_HOURS, BookingStatus, PaymentStatus
+from app.core.security import hash_password
+from app.devtools.fake_stripe import FakeStripeConfig, make_server
+from app.models.booking import Booking
+from app.models.ledger import DriverLedgerEntry
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.payment_service import PaymentService, payment_circuit_breaker
+
+_PASSWORD_HASH = hash_password("Password1!")
+_CHECKPOINT_KEY = "rideway:stripe:reconcile:checkpoint"
+
+
+@pytest.fixture()
+def fake_redis(db_session):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.payment_service.redis_client", return_value=r), \
+         patch("app.services.circuit_breaker.redis_client", return_value=r), \
+         patch("app.services.stripe_client.redis_client", return_value=r), \
+         patch("app.services.payment_service.create_db_session", return_value=db_session), \
+         patch("app.services.payment_service.get_settings") as mock_cfg:
+        mock_cfg.return_value.stripe_secret_key = "sk_test_fake"
+        yield r
+
+
+@pytest.fixture()
+def fake_stripe(fake_redis):
+    server = make_server(port=0, config=FakeStripeConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = stripe.api_base, stripe.api_key, stripe.default_http_client
+    stripe.api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield server.stripe
+    finally:
+        stripe.api_base, stripe.api_key, stripe.default_http_client = saved
+        server.shutdown()
+        server.server_close()
+
+
+def _service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _make_payment(db, fake_stripe, status=PaymentStatus.REQUIRES_PAYMENT_METHOD):
+    driver = User(email=f"d_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    passenger = User(email=f"p_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    db.add_all([driver, passenger])
+    db.flush()
+    trip = Trip(
+        driver_id=driver.id,
+        origin_city="London",
+        destination_city="Leeds",
+        departure_time=datetime.now(timezone.utc) + timedelta(days=1),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+    )
+    db.add(trip)
+    db.flush()
+    booking = Booking(
+        trip_id=trip.id, passenger_id=passenger.id, seats=1, total_amount=20.0, status=BookingStatus.PENDING_PAYMENT,
+    )
+    db.add(booking)
+    db.flush()
+    intent = fake_stripe.create_payment_intent({"amount": 2000, "metadata": {"booking_id": str(booking.id)}})
+    payment = Payment(
+        booking_id=booking.id, amount=20.0, platform_fee=2.0, payout_amount=18.0,
+        status=status, stripe_payment_intent_id=intent["id"],
+    )
+    db.add(payment)
+    db.commit()
+    return payment.id, intent
+
+
+def _age(intent, seconds):
+    intent["created"] -= seconds
+
+
+def test_missed_webhooks_are_reconciled(db_session, fake_stripe):
+    paid_id, paid = _make_payment(db_session, fake_stripe)
+    canceled_id, canceled = _make_payment(db_session, fake_stripe)
+    processing_id, processing = _make_payment(db_session, fake_stripe)
+    fake_stripe.confirm_payment_intent(paid["id"], {})
+    fake_stripe.cancel_payment_intent(canceled["id"])
+    processing["status"] = "processing"
+
+    counts = _service().reconcile_payments()
+
+    assert counts == {"checked": 3, "succeeded": 1, "processing": 1, "failed": 1}
+    payment = db_session.get(Payment, paid_id)
+    assert payment.status == PaymentStatus.SUCCEEDED
+    assert payment.stripe_charge_id == paid["latest_charge"]
+    assert db_session.get(Booking, payment.booking_id).status == BookingStatus.CONFIRMED
+    assert db_session.get(Payment, canceled_id).status == PaymentStatus.FAILED
+    assert db_session.get(Payment, processing_id).status == PaymentStatus.PROCESSING
+
+
+def test_payment_on_expired_booking_is_refunded_not_earned(db_session, fake_stripe):
+    payment_id, intent = _make_payment(db_session, fake_stripe)
+    booking_id = db_session.get(Payment, payment_id).booking_id
+    db_session.get(Booking, booking_id).status = BookingStatus.CANCELLED  # the expiry sweep got there first
+    db_session.commit()
+    fake_stripe.confirm_payment_intent(intent["id"], {})
+
+    _service().reconcile_payments()
+
+    assert db_session.get(Payment, payment_id).status == PaymentStatus.REFUNDED
+    assert db_session.get(Booking, booking_id).status == BookingStatus.CANCELLED
+    assert [r["payment_intent"] for r in fake_stripe.objects["refund"].values()] == [intent["id"]]
+    assert db_session.query(DriverLedgerEntry).count() == 0
+
+
+def test_each_page_is_matched_with_one_in_query(db_session, fake_stripe):
+    for _ in range(5):
+        _, intent = _make_payment(db_session, fake_stripe)
+        fake_stripe.cancel_payment_intent(intent["id"])
+    service = _service()
+    repo = service.payment_repo
+
+    with patch("app.services.payment_service.PAYMENT_RECONCILE_PAGE_SIZE", 2), \
+         patch.object(repo, "list_by_intent_ids", wraps=repo.list_by_intent_ids) as lookup:
+        counts = service.reconcile_payments()
+
+    assert counts["checked"] == 5
+    assert counts["failed"] == 5
+    assert lookup.call_count == 3
+
+
+def test_statuses_already_ahead_of_stripe_are_kept(db_session, fake_stripe):
+    refunded_id, refunded = _make_payment(db_session, fake_stripe, status=PaymentStatus.REFUNDED)
+    failed_id, failed = _make_payment(db_session, fake_stripe, status=PaymentStatus.FAILED)
+    fake_stripe.confirm_payment_intent(refunded["id"], {})
+    failed["status"] = "processing"
+
+    counts = _service().reconcile_payments()
+
+    assert counts == {"checked": 2, "succeeded": 0, "processing": 0, "failed": 0}
+    assert db_session.get(Payment, refunded_id).status == PaymentStatus.REFUNDED
+    assert db_session.get(Payment, failed_id).status == PaymentStatus.FAILED
+
+
+def test_checkpoint_skips_settled_intents_on_next_run(db_session, fake_stripe, fake_redis):
+    _, old = _make_payment(db_session, fake_stripe)
+    fake_stripe.cancel_payment_intent(old["id"])
+    _age(old, 3600)
+    service = _service()
+    assert service.reconcile_payments()["checked"] == 1
+
+    _make_payment(db_session, fake_stripe)
+    counts = service.reconcile_payments()
+
+    assert counts["checked"] == 1
+    assert int(fake_redis.get(_CHECKPOINT_KEY)) <= time.time() - 60
+
+
+def test_checkpoint_waits_for_open_intents_within_lookback(db_session, fake_stripe, fake_redis):
+    _, open_intent = _make_payment(db_session, fake_stripe)
+    _, abandoned = _make_payment(db_session, fake_stripe)
+    _age(open_intent, 3600)
+    _age(abandoned, (PAYMENT_RECONCILE_OPEN_LOOKBACK_HOURS + 1) * 3600)
+    fake_redis.set(_CHECKPOINT_KEY, abandoned["created"])
+
+    _service().reconcile_payments()
+
+    checkpoint = int(fake_redis.get(_CHECKPOINT_KEY))
+    assert checkpoint > abandoned["created"]
+    assert checkpoint <= open_intent["created"]
+
+
+def test_open_breaker_leaves_checkpoint_untouched(db_session, fake_stripe, fake_redis):
+    fake_redis.set(_CHECKPOINT_KEY, 1_700_000_000)
+
+    with patch.object(payment_circuit_breaker, "is_open", return_value=True):
+        with pytest.raises(ValueError, match="temporarily unavailable"):
+            _service().reconcile_payments()
+
+    assert fake_redis.get(_CHECKPOINT_KEY) == "1700000000"
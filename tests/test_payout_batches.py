@@ -0,0 +1,198 @@
+"""Tests for batched driver payouts — one Stripe transfer per driver."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import stripe
+from sqlalchemy import select
+
+from app.core.constants import BookingStatus, PayoutBatchStatus
+from app.core.security import hash_password
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.payout import PayoutBatch
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.payout_repo import PayoutRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.payment_service import PaymentService
+
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+def _make_service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _make_user(db, payment_details=None):
+    u = User(email=f"user_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH, payment_details=payment_details)
+    db.add(u)
+    db.flush()
+    return u
+
+
+def _make_paid_booking(db, driver, payout_amount=18.0, status=BookingStatus.COMPLETED):
+    trip = Trip(
+        driver_id=driver.id,
+        origin_city="London",
+        destination_city="Manchester",
+        departure_time=datetime.now(timezone.utc) - timedelta(hours=2),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+        trip_status="COMPLETED",
+    )
+    db.add(trip)
+    db.flush()
+    booking = Booking(
+        trip_id=trip.id, passenger_id=_make_user(db).id, seats=1, total_amount=20.0, status=status,
+    )
+    db.add(booking)
+    db.flush()
+    payment = Payment(
+        booking_id=booking.id, amount=20.0, platform_fee=20.0 - payout_amount, payout_amount=payout_amount,
+        status="SUCCEEDED", stripe_payment_intent_id=f"pi_{uuid4().hex[:8]}",
+    )
+    db.add(payment)
+    db.flush()
+    return payment
+
+
+@pytest.fixture(autouse=True)
+def stripe_settings():
+    with patch("app.services.payment_service.get_settings") as cfg:
+        cfg.return_value.stripe_secret_key = "sk_test_fake"
+        yield
+
+
+def _transfer(transfer_id="tr_batch"):
+    transfer = MagicMock()
+    transfer.id = transfer_id
+    return transfer
+
+
+def test_driver_paid_in_one_grouped_transfer(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+    payments = [_make_paid_booking(db_session, driver, amount) for amount in (18.0, 9.0, 4.5)]
+
+    with patch("stripe.Transfer.create", return_value=_transfer()) as create:
+        batch = _make_service().payout_driver(db_session, driver.id)
+
+    create.assert_called_once()
+    kwargs = create.call_args.kwargs
+    assert kwargs["amount"] == 3150
+    assert kwargs["destination"] == "acct_drv"
+    assert kwargs["transfer_group"] == batch.transfer_group
+    assert kwargs["idempotency_key"] == f"payout_batch:{batch.id}"
+    assert batch.status == PayoutBatchStatus.PAID
+    assert batch.payment_count == 3
+    for payment in payments:
+        db_session.refresh(payment)
+        assert payment.payout_batch_id == batch.id
+        assert payment.stripe_transfer_id == "tr_batch"
+
+
+def test_nothing_to_pay_creates_no_batch(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+
+    with patch("stripe.Transfer.create") as create:
+        assert _make_service().payout_driver(db_session, driver.id) is None
+
+    create.assert_not_called()
+    assert db_session.execute(select(PayoutBatch)).first() is None
+
+
+def test_rejected_transfer_releases_payments(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+    payment = _make_paid_booking(db_session, driver)
+
+    with patch("stripe.Transfer.create", side_effect=stripe.InvalidRequestError("No such destination", None)):
+        with pytest.raises(ValueError, match="Payout failed"):
+            _make_service().payout_driver(db_session, driver.id)
+
+    batch = db_session.execute(select(PayoutBatch)).scalar_one()
+    db_session.refresh(payment)
+    assert batch.status == PayoutBatchStatus.FAILED
+    assert payment.payout_batch_id is None
+    assert PayoutRepository().list_drivers_with_unpaid(db_session, 10) == [driver.id]
+
+
+def test_interrupted_batch_retried_with_same_key(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+    payment = _make_paid_booking(db_session, driver)
+    svc = _make_service()
+
+    with patch("stripe.Transfer.create", side_effect=stripe.APIConnectionError("timeout")):
+        with pytest.raises(ValueError):
+            svc.payout_driver(db_session, driver.id)
+    batch = db_session.execute(select(PayoutBatch)).scalar_one()
+    assert batch.status == PayoutBatchStatus.PENDING
+    assert PayoutRepository().list_drivers_with_unpaid(db_session, 10) == []
+
+    batch.created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.flush()
+    with patch("stripe.Transfer.create", return_value=_transfer("tr_retry")) as create:
+        assert svc.retry_stale_payout_batches(db_session) == 1
+
+    assert create.call_args.kwargs["idempotency_key"] == f"payout_batch:{batch.id}"
+    db_session.refresh(payment)
+    assert payment.stripe_transfer_id == "tr_retry"
+
+
+def test_scheduled_run_pays_each_driver_once(db_session):
+    drivers = [_make_user(db_session, payment_details=f"acct_{i}") for i in range(2)]
+    for driver in drivers:
+        for _ in range(3):
+            _make_paid_booking(db_session, driver)
+    _make_paid_booking(db_session, _make_user(db_session))  # no connected account — skipped
+
+    with patch("app.services.payment_service.create_db_session", return_value=db_session), \
+         patch("stripe.Transfer.create", side_effect=lambda **kw: _transfer(f"tr_{kw['destination']}")) as create:
+        counts = _make_service().run_payout_batches()
+
+    assert counts["paid"] == 2
+    assert sorted(c.kwargs["destination"] for c in create.call_args_list) == ["acct_0", "acct_1"]
+
+
+def test_only_completed_bookings_are_paid_out(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+    completed = _make_paid_booking(db_session, driver, 18.0)
+    upcoming = _make_paid_booking(db_session, driver, 9.0, status=BookingStatus.CONFIRMED)
+
+    with patch("stripe.Transfer.create", return_value=_transfer()) as create:
+        batch = _make_service().payout_driver(db_session, driver.id)
+
+    assert create.call_args.kwargs["amount"] == 1800
+    db_session.refresh(completed)
+    db_session.refresh(upcoming)
+    assert completed.payout_batch_id == batch.id
+    assert upcoming.payout_batch_id is None
+
+
+def test_upcoming_bookings_do_not_queue_a_driver_for_payout(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+    _make_paid_booking(db_session, driver, status=BookingStatus.CONFIRMED)
+
+    assert PayoutRepository().list_drivers_with_unpaid(db_session, 10) == []
+
+
+def test_paid_out_payment_cannot_be_refunded(db_session):
+    driver = _make_user(db_session, payment_details="acct_drv")
+    payment = _make_paid_booking(db_session, driver)
+    svc = _make_service()
+    with patch("stripe.Transfer.create", return_value=_transfer()):
+        svc.payout_driver(db_session, driver.id)
+
+    with patch("stripe.Refund.create") as refund:
+        with pytest.raises(ValueError, match="already been paid out"):
+            svc.refund_for_cancellation(db_session, payment.booking_id)
+
+    refund.assert_not_called()
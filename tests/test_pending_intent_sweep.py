@@ -0,0 +1,115 @@
+"""Tests for the recovery sweep that fans out PaymentIntent creation as tasks."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.constants import BookingStatus, PaymentStatus
+from app.core.security import hash_password
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services.payment_service import PaymentService, payment_circuit_breaker
+
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+@pytest.fixture()
+def sweep(db_session):
+    with patch("app.services.payment_service.create_db_session", return_value=db_session), \
+         patch.object(payment_circuit_breaker, "is_open", return_value=False), \
+         patch("app.services.payment_service.celery_app.send_task") as send_task:
+        yield send_task
+
+
+def _service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _make_payment(db, intent_id=None, created_minutes_ago=0):
+    driver = User(email=f"d_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    passenger = User(email=f"p_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    db.add_all([driver, passenger])
+    db.flush()
+    trip = Trip(
+        driver_id=driver.id,
+        origin_city="London",
+        destination_city="Leeds",
+        departure_time=datetime.now(timezone.utc) + timedelta(days=1),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+    )
+    db.add(trip)
+    db.flush()
+    booking = Booking(
+        trip_id=trip.id, passenger_id=passenger.id, seats=1, total_amount=20.0, status=BookingStatus.PENDING_PAYMENT,
+    )
+    db.add(booking)
+    db.flush()
+    payment = Payment(
+        booking_id=booking.id, amount=20.0, platform_fee=2.0, payout_amount=18.0,
+        status=PaymentStatus.REQUIRES_PAYMENT_METHOD, stripe_payment_intent_id=intent_id,
+        created_at=datetime.now(timezone.utc) - timedelta(minutes=created_minutes_ago),
+    )
+    db.add(payment)
+    db.commit()
+    return payment.id
+
+
+def _queued(send_task):
+    return [call.kwargs["args"][0] for call in send_task.call_args_list]
+
+
+def test_sweep_claims_pending_payments_and_queues_one_task_each(db_session, sweep):
+    pending = [_make_payment(db_session) for _ in range(3)]
+    _make_payment(db_session, intent_id="pi_done")
+
+    claimed = _service().process_pending_intents()
+
+    assert sorted(claimed) == sorted(pending)
+    assert sorted(_queued(sweep)) == sorted(str(payment_id) for payment_id in pending)
+    assert sweep.call_args.args[0] == "app.tasks.payment_tasks.process_payment_intent"
+    assert all(db_session.get(Payment, payment_id).intent_claimed_at is not None for payment_id in pending)
+
+
+def test_in_flight_claims_are_not_swept_again_until_stale(db_session, sweep):
+    payment_id = _make_payment(db_session)
+    service = _service()
+    service.process_pending_intents()
+
+    assert service.process_pending_intents() == []
+
+    payment = db_session.get(Payment, payment_id)
+    payment.intent_claimed_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    db_session.commit()
+    assert service.process_pending_intents() == [payment_id]
+
+
+def test_sweep_takes_oldest_payments_first_up_to_limit(db_session, sweep):
+    newest = _make_payment(db_session, created_minutes_ago=1)
+    oldest = _make_payment(db_session, created_minutes_ago=30)
+    middle = _make_payment(db_session, created_minutes_ago=10)
+
+    assert sorted(_service().process_pending_intents(limit=2)) == sorted([oldest, middle])
+    assert db_session.get(Payment, newest).intent_claimed_at is None
+
+
+def test_sweep_waits_while_breaker_is_open(db_session, sweep):
+    payment_id = _make_payment(db_session)
+
+    with patch.object(payment_circuit_breaker, "is_open", return_value=True):
+        assert _service().process_pending_intents() == []
+
+    sweep.assert_not_called()
+    assert db_session.get(Payment, payment_id).intent_claimed_at is None
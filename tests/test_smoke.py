@@ -81,6 +81,10 @@ _other_patches = [
         "app.services.storage_service.StorageService.upload_bytes",
         return_value="https://storage.googleapis.com/bucket/fake-object",
     ),
+    patch(
+        "app.services.storage_service.StorageService.upload_stream",
+        return_value="https://storage.googleapis.com/bucket/fake-object",
+    ),
     patch(
         "app.services.storage_service.StorageService.signed_url",
         return_value="https://storage.googleapis.com/bucket/fake-object?signed=1",
@@ -0,0 +1,79 @@
+"""Tests for signed URL caching and concurrent signing."""
+
+import io
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import storage_service
+from app.services.storage_service import StorageService, stream_size
+
+
+@pytest.fixture()
+def fake_client():
+    storage_service._cached_signed_url.cache_clear()
+    client = MagicMock()
+    client.bucket.return_value.blob.side_effect = lambda name, **kw: MagicMock(
+        generate_signed_url=MagicMock(side_effect=lambda **kw: f"https://signed/{name}?exp={kw['expiration'].isoformat()}")
+    )
+    with patch("app.services.storage_service._gcs_client", return_value=client), \
+         patch("app.services.storage_service._signing_credentials", return_value=None):
+        yield client
+    storage_service._cached_signed_url.cache_clear()
+
+
+def test_public_url_returned_unchanged(fake_client):
+    assert StorageService().signed_url("https://cdn/x.jpg") == "https://cdn/x.jpg"
+    fake_client.bucket.assert_not_called()
+
+
+def test_signed_once_per_expiry_bucket(fake_client):
+    svc = StorageService()
+    with patch("app.services.storage_service.time.time", return_value=1_000_000.0):
+        first = svc.signed_url("gs://b/selfies/a")
+        second = svc.signed_url("gs://b/selfies/a")
+    with patch("app.services.storage_service.time.time", return_value=1_000_000.0 + 300):
+        third = svc.signed_url("gs://b/selfies/a")
+
+    assert first == second
+    assert third != first
+    assert fake_client.bucket.call_count == 2
+
+
+def test_signed_urls_signs_distinct_paths_and_tolerates_failures(fake_client):
+    def fake_sign(path, expiry_minutes):
+        if path.endswith("bad"):
+            raise RuntimeError("boom")
+        return f"signed:{path}"
+
+    svc = StorageService()
+    with patch.object(StorageService, "signed_url", side_effect=fake_sign):
+        result = svc.signed_urls(["gs://b/x", None, "gs://b/x", "gs://b/bad"])
+
+    assert result == {"gs://b/x": "signed:gs://b/x", "gs://b/bad": "gs://b/bad"}
+
+
+def test_local_backend_streams_to_disk(tmp_path):
+    svc = StorageService()
+    svc.settings = replace(svc.settings, storage_backend="local", local_storage_dir=str(tmp_path))
+    payload = io.BytesIO(b"x" * (3 * 1024 * 1024 + 7))
+
+    url = svc.upload_stream(payload, "image/jpeg", folder="/selfies/")
+
+    assert url.startswith("file://")
+    stored = Path(url[len("file://"):])
+    assert stored.parent == tmp_path / "selfies"
+    assert stored.stat().st_size == stream_size(payload)
+
+
+def test_gcs_upload_is_resumable_from_stream(fake_client):
+    svc = StorageService()
+    svc.settings = replace(svc.settings, storage_backend="gcs", gcp_storage_bucket="bucket")
+    payload = io.BytesIO(b"abc")
+
+    svc.upload_stream(payload, "image/png", folder="avatars")
+
+    _, kwargs = fake_client.bucket.return_value.blob.call_args
+    assert kwargs["chunk_size"] == storage_service._UPLOAD_CHUNK_SIZE
@@ -0,0 +1,105 @@
+"""Tests for the shared Stripe HTTP client, call profiles and latency histograms."""
+
+import threading
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+import stripe
+
+from app.devtools.fake_stripe import FakeStripeConfig, make_server
+from app.services import stripe_client
+from app.services.stripe_client import BACKGROUND, INTERACTIVE, CallProfile
+
+
+@pytest.fixture()
+def fake_redis():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.stripe_client.redis_client", return_value=r):
+        yield r
+
+
+@pytest.fixture()
+def fake_stripe():
+    server = make_server(port=0, config=FakeStripeConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = stripe.api_base, stripe.api_key, stripe.default_http_client
+    stripe.api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    stripe_client.configure("sk_test_fake")
+    try:
+        yield server.stripe
+    finally:
+        stripe.api_base, stripe.api_key, stripe.default_http_client = saved
+        server.shutdown()
+        server.server_close()
+
+
+def test_configure_reuses_one_client_per_process():
+    saved = stripe.api_key, stripe.default_http_client
+    try:
+        stripe_client.configure("sk_test_one")
+        first = stripe.default_http_client
+        stripe_client.configure("sk_test_two")
+
+        assert stripe.default_http_client is first is stripe_client.http_client()
+        assert stripe.api_key == "sk_test_two"
+    finally:
+        stripe.api_key, stripe.default_http_client = saved
+
+
+def test_timeout_and_retries_follow_call_profile(fake_redis):
+    client = stripe_client.http_client()
+
+    assert client._timeout == (INTERACTIVE.connect_seconds, INTERACTIVE.read_seconds)
+    with stripe_client.call("transfers", BACKGROUND):
+        assert client._timeout == (BACKGROUND.connect_seconds, BACKGROUND.read_seconds)
+        with patch.object(stripe.RequestsClient, "request_with_retries") as parent:
+            client.request_with_retries("post", "https://api.stripe.com/v1/transfers", {}, None, 2)
+        assert parent.call_args.args[4] == BACKGROUND.max_retries
+    assert client._timeout == (INTERACTIVE.connect_seconds, INTERACTIVE.read_seconds)
+    assert BACKGROUND.read_seconds > INTERACTIVE.read_seconds
+
+
+def test_calls_reuse_keep_alive_connection(fake_stripe, fake_redis):
+    for _ in range(5):
+        with stripe_client.call("payment_intents"):
+            stripe.PaymentIntent.create(amount=1000, currency="gbp")
+
+    port = int(stripe.api_base.rsplit(":", 1)[1])
+    pools = stripe_client.http_client()._session.adapters["http://"].poolmanager.pools
+    assert [pools[key].num_connections for key in pools.keys() if key.key_port == port] == [1]
+
+
+def test_read_timeout_bounds_a_hung_call(fake_stripe, fake_redis):
+    fake_stripe.config.latency_ms = 500
+    hurried = CallProfile(connect_seconds=1, read_seconds=0.1, max_retries=0)
+
+    with pytest.raises(stripe.APIConnectionError):
+        with stripe_client.call("payment_intents", hurried):
+            stripe.PaymentIntent.create(amount=1000, currency="gbp")
+
+
+def test_latency_histogram_is_cumulative(fake_redis):
+    for elapsed in (30, 80, 400, 120_000):
+        stripe_client.observe("refunds", elapsed)
+    stripe_client.observe("balance", 10)
+
+    histograms = stripe_client.latency_histograms()
+
+    refunds = histograms["refunds"]
+    assert refunds["count"] == 4
+    assert refunds["sum_ms"] == 120_510
+    assert refunds["buckets"]["le_50"] == 1
+    assert refunds["buckets"]["le_100"] == 2
+    assert refunds["buckets"]["le_500"] == 3
+    assert refunds["buckets"]["le_60000"] == 3
+    assert refunds["buckets"]["le_inf"] == 4
+    assert histograms["balance"]["buckets"]["le_50"] == 1
+
+
+def test_call_records_latency_even_when_stripe_fails(fake_redis):
+    with pytest.raises(stripe.APIConnectionError):
+        with stripe_client.call("transfers", BACKGROUND):
+            raise stripe.APIConnectionError("reset")
+
+    assert stripe_client.latency_histograms()["transfers"]["count"] == 1
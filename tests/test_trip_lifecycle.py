@@ -192,6 +192,49 @@ class TestCompleteTrip:
             svc.complete_trip(db_session, other, trip.id)
 
 
+    def test_increments_trips_completed_for_all_participants(self, db_session):
+        svc = _make_trip_service()
+        driver = _make_user(db_session)
+        passengers = [_make_user(db_session) for _ in range(2)]
+        trip = _make_trip(db_session, driver, status="STARTED")
+        for passenger in passengers:
+            _make_booking(db_session, trip, passenger, BookingStatus.CONFIRMED)
+
+        svc.complete_trip(db_session, driver, trip.id)
+
+        for user in [driver, *passengers]:
+            db_session.refresh(user)
+            assert user.trips_completed == 1
+
+    def test_dispatches_one_grouped_payout_task(self, db_session):
+        payment_service = MagicMock()
+        svc = TripService(TripRepository(), payment_service=payment_service)
+        driver = _make_user(db_session)
+        trip = _make_trip(db_session, driver, status="STARTED")
+        for _ in range(3):
+            _make_booking(db_session, trip, _make_user(db_session), BookingStatus.CONFIRMED)
+
+        svc.complete_trip(db_session, driver, trip.id)
+        payment_service.trigger_trip_payouts_background.assert_not_called()
+        db_session.commit()
+
+        payment_service.trigger_trip_payouts_background.assert_called_once_with(trip.id)
+
+    def test_payout_task_not_queued_when_completion_rolls_back(self, db_session):
+        payment_service = MagicMock()
+        svc = TripService(TripRepository(), payment_service=payment_service)
+        driver = _make_user(db_session)
+        trip = _make_trip(db_session, driver, status="STARTED")
+        _make_booking(db_session, trip, _make_user(db_session), BookingStatus.CONFIRMED)
+        db_session.commit()
+
+        svc.complete_trip(db_session, driver, trip.id)
+        db_session.rollback()
+        db_session.commit()
+
+        payment_service.trigger_trip_payouts_background.assert_not_called()
+
+
 # ── request_payout ──────────────────────────────────────────────────────────
 
 class TestRequestPayout:
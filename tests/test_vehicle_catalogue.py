@@ -0,0 +1,117 @@
+"""Tests for the bundled, indexed vehicle catalogue and the lookup routes."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.routes import vehicle_lookup
+from app.services import vehicle_catalogue
+
+_SNAPSHOT = {
+    "version": "test-1",
+    "kinds": {
+        "car": {
+            "makes": [{"id": "volkswagen", "name": "Volkswagen"}, {"id": "audi", "name": "Audi"}],
+            "models": [
+                {"id": "polo", "name": "Polo", "make_id": "volkswagen"},
+                {"id": "a3", "name": "A3", "make_id": "audi"},
+                {"id": "golf", "name": "Golf", "make_id": "volkswagen"},
+            ],
+        },
+    },
+}
+
+
+@pytest.fixture()
+def catalogue():
+    catalogue = vehicle_catalogue.build_catalogue(_SNAPSHOT)
+    with patch.object(vehicle_catalogue, "_catalogue", catalogue):
+        yield catalogue
+
+
+@pytest.fixture()
+def client(catalogue):
+    app = FastAPI()
+    app.include_router(vehicle_lookup.router, prefix="/vehicles")
+    return TestClient(app)
+
+
+def test_models_indexed_by_make_and_sorted():
+    catalogue = vehicle_catalogue.build_catalogue(_SNAPSHOT)
+
+    assert [m["name"] for m in catalogue.makes["car"]] == ["Audi", "Volkswagen"]
+    assert [m["id"] for m in catalogue.models["car"]["volkswagen"]] == ["golf", "polo"]
+
+
+def test_bundled_snapshot_loads_without_network(tmp_path):
+    with patch.object(vehicle_catalogue, "get_settings") as cfg, \
+         patch("urllib.request.urlopen", side_effect=OSError("offline")) as urlopen:
+        cfg.return_value.vehicle_catalogue_cache = str(tmp_path / "missing.json")
+        catalogue = vehicle_catalogue._load()
+
+    urlopen.assert_not_called()
+    assert catalogue.version.startswith("bundled-")
+    assert set(catalogue.makes) == set(vehicle_catalogue.VALID_KINDS)
+    assert catalogue.models["car"]["volkswagen"]
+
+
+def test_refresh_writes_json_cache_and_swaps(tmp_path, catalogue):
+    cache = tmp_path / "private" / "catalogue.json"
+    fresh = {**_SNAPSHOT, "version": "test-2"}
+    with patch.object(vehicle_catalogue, "get_settings") as cfg, \
+         patch.object(vehicle_catalogue, "fetch_snapshot", return_value=fresh):
+        cfg.return_value.vehicle_catalogue_cache = str(cache)
+        assert vehicle_catalogue.refresh_catalogue() is True
+        assert vehicle_catalogue.get_catalogue().version == "test-2"
+        assert json.loads(cache.read_text())["version"] == "test-2"
+        assert vehicle_catalogue._load() == vehicle_catalogue.build_catalogue(fresh)
+    assert cache.parent.stat().st_mode & 0o777 == 0o700
+
+
+def test_partial_catalogue_refreshes_without_waiting():
+    partial = vehicle_catalogue.build_catalogue(_SNAPSHOT)  # cars only
+    complete = vehicle_catalogue.build_catalogue({
+        "version": "test-full",
+        "kinds": {kind: _SNAPSHOT["kinds"]["car"] for kind in vehicle_catalogue.VALID_KINDS},
+    })
+    assert not partial.complete
+    assert complete.complete
+
+    with patch.object(vehicle_catalogue, "_catalogue", partial), \
+         patch.object(vehicle_catalogue, "refresh_catalogue", side_effect=StopIteration) as refresh, \
+         patch("threading.Event.wait") as wait:
+        with pytest.raises(StopIteration):
+            vehicle_catalogue._refresh_loop()
+
+    refresh.assert_called_once()
+    wait.assert_not_called()
+
+
+def test_failed_refresh_keeps_current(catalogue):
+    with patch.object(vehicle_catalogue, "fetch_snapshot", side_effect=OSError("offline")):
+        assert vehicle_catalogue.refresh_catalogue() is False
+    assert vehicle_catalogue.get_catalogue() is catalogue
+
+
+def test_models_route_sets_validators(client, catalogue):
+    response = client.get("/vehicles/models", params={"make": "Volkswagen"})
+
+    assert response.status_code == 200
+    assert [m["id"] for m in response.json()["data"]] == ["golf", "polo"]
+    assert response.headers["ETag"] == catalogue.etag
+    assert "max-age" in response.headers["Cache-Control"]
+
+
+def test_matching_etag_returns_304(client, catalogue):
+    response = client.get("/vehicles/makes", headers={"If-None-Match": catalogue.etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == catalogue.etag
+
+
+def test_invalid_kind_rejected(client):
+    assert client.get("/vehicles/makes", params={"type": "spaceship"}).status_code == 400
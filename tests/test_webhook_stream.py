@@ -0,0 +1,200 @@
+"""Tests for buffered Stripe webhook ingestion and batch processing."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from app.core.constants import STRIPE_WEBHOOK_MAX_DELIVERIES, BookingStatus, PaymentStatus
+from app.core.security import hash_password
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.trip import Trip
+from app.models.user import User
+from app.repositories.booking_repo import BookingRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.trip_repo import TripRepository
+from app.repositories.user_repo import UserRepository
+from app.services import webhook_stream
+from app.services.payment_service import PaymentService
+from app.tasks.payment_tasks import enqueue_stripe_webhook
+
+_PASSWORD_HASH = hash_password("Password1!")
+
+
+@pytest.fixture()
+def fake_redis(db_session):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.services.webhook_stream.redis_client", return_value=r), \
+         patch("app.services.payment_service.redis_client", return_value=r), \
+         patch("app.services.connect_cache.redis_client", return_value=r), \
+         patch("app.services.payment_service.create_db_session", return_value=db_session), \
+         patch("app.services.payment_service.celery_app.send_task") as send_task:
+        r.send_task = send_task
+        yield r
+
+
+def _service():
+    return PaymentService(PaymentRepository(), BookingRepository(), TripRepository(), UserRepository())
+
+
+def _make_payment(db):
+    driver = User(email=f"d_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    passenger = User(email=f"p_{uuid4().hex[:6]}@test.com", password_hash=_PASSWORD_HASH)
+    db.add_all([driver, passenger])
+    db.flush()
+    trip = Trip(
+        driver_id=driver.id,
+        origin_city="London",
+        destination_city="Leeds",
+        departure_time=datetime.now(timezone.utc) + timedelta(days=1),
+        available_seats=3,
+        price_per_seat=20.0,
+        toll_fee=0,
+        vehicle_make="Toyota",
+        vehicle_model="Prius",
+        vehicle_color="Silver",
+    )
+    db.add(trip)
+    db.flush()
+    booking = Booking(
+        trip_id=trip.id, passenger_id=passenger.id, seats=1, total_amount=20.0, status=BookingStatus.PENDING_PAYMENT,
+    )
+    db.add(booking)
+    db.flush()
+    payment = Payment(
+        booking_id=booking.id, amount=20.0, platform_fee=2.0, payout_amount=18.0,
+        status=PaymentStatus.REQUIRES_PAYMENT_METHOD, stripe_payment_intent_id=f"pi_{uuid4().hex[:8]}",
+    )
+    db.add(payment)
+    db.commit()
+    return payment.id, booking.id
+
+
+def _status(db, payment_id):
+    return db.get(Payment, payment_id).status
+
+
+def _event(event_type, booking_id, event_id=None):
+    return {
+        "id": event_id or f"evt_{uuid4().hex}",
+        "type": event_type,
+        "data": {"object": {"object": "payment_intent", "metadata": {"booking_id": str(booking_id)}}},
+    }
+
+
+def test_enqueue_appends_to_stream_and_queues_one_drain(fake_redis):
+    with patch("app.tasks.payment_tasks.drain_stripe_webhooks.delay") as delay:
+        for _ in range(3):
+            enqueue_stripe_webhook(_event("payment_intent.processing", uuid4()))
+
+    assert fake_redis.xlen(webhook_stream.STREAM_KEY) == 3
+    delay.assert_called_once_with()
+
+
+def test_drain_applies_events_in_batches_with_one_in_query_each(db_session, fake_redis):
+    payments = [_make_payment(db_session) for _ in range(3)]
+    for _, booking_id in payments:
+        webhook_stream.append(_event("payment_intent.payment_failed", booking_id))
+    service = _service()
+    repo = service.payment_repo
+
+    with patch.object(repo, "list_by_booking_ids", wraps=repo.list_by_booking_ids) as lookup, \
+         patch.object(repo, "get_by_booking") as single_lookup:
+        counts = service.drain_webhook_stream("worker-1", batch_size=2)
+
+    assert counts == {"processed": 3, "dead_lettered": 0}
+    assert lookup.call_count == 2
+    single_lookup.assert_not_called()
+    assert [_status(db_session, payment_id) for payment_id, _ in payments] == [PaymentStatus.FAILED] * 3
+    assert fake_redis.xlen(webhook_stream.STREAM_KEY) == 0
+    assert not fake_redis.exists("rideway:stripe:webhooks:drain")
+
+
+def test_replayed_event_applied_once(db_session, fake_redis):
+    payment_id, booking_id = _make_payment(db_session)
+    event = _event("payment_intent.processing", booking_id, event_id="evt_replayed")
+    webhook_stream.append(event)
+    webhook_stream.append(event)
+
+    counts = _service().drain_webhook_stream("worker-1")
+
+    assert counts["processed"] == 1
+    assert _status(db_session, payment_id) == PaymentStatus.PROCESSING
+
+
+def test_bad_event_is_dead_lettered_without_blocking_batch(db_session, fake_redis):
+    payment_id, booking_id = _make_payment(db_session)
+    orphan = _event("payment_intent.processing", uuid4(), event_id="evt_orphan")
+    webhook_stream.append(_event("payment_intent.processing", booking_id))
+    webhook_stream.append(orphan)
+
+    counts = _service().drain_webhook_stream("worker-1")
+
+    assert counts == {"processed": 1, "dead_lettered": 1}
+    assert _status(db_session, payment_id) == PaymentStatus.PROCESSING
+    fake_redis.send_task.assert_called_once()
+    assert fake_redis.send_task.call_args.args[0] == "app.tasks.payment_tasks.dead_letter"
+    assert fake_redis.send_task.call_args.kwargs["args"][2] == [orphan]
+    # dedup claim released so the DLQ replay is not ignored as a duplicate
+    assert not fake_redis.exists("rideway:stripe_event:evt_orphan")
+    assert fake_redis.xlen(webhook_stream.STREAM_KEY) == 0
+
+
+def test_entries_left_by_a_dead_worker_are_reclaimed(db_session, fake_redis):
+    payment_id, booking_id = _make_payment(db_session)
+    webhook_stream.append(_event("payment_intent.processing", booking_id))
+    assert webhook_stream.read_batch("crashed-worker", 10)
+
+    with patch("app.services.webhook_stream._CLAIM_IDLE_MS", 0):
+        counts = _service().drain_webhook_stream("worker-2")
+
+    assert counts["processed"] == 1
+    assert _status(db_session, payment_id) == PaymentStatus.PROCESSING
+    assert fake_redis.xpending(webhook_stream.STREAM_KEY, webhook_stream.GROUP)["pending"] == 0
+
+
+def test_event_failing_on_every_delivery_is_dead_lettered_at_the_limit(db_session, fake_redis):
+    payment_id, booking_id = _make_payment(db_session)
+    poison = _event("payment_intent.processing", booking_id, event_id="evt_poison")
+    webhook_stream.append(poison)
+    webhook_stream.append(_event("payment_intent.processing", booking_id))
+    service = _service()
+    real_batch = service.process_webhook_batch
+
+    def crash_on_poison(db, events):
+        if any(event["id"] == "evt_poison" for event in events):
+            raise AttributeError("malformed event")
+        return real_batch(db, events)
+
+    with patch.object(service, "process_webhook_batch", side_effect=crash_on_poison), \
+         patch("app.services.webhook_stream._CLAIM_IDLE_MS", 0):
+        for _ in range(STRIPE_WEBHOOK_MAX_DELIVERIES - 1):
+            with pytest.raises(AttributeError):
+                service.drain_webhook_stream("worker-1")
+        counts = service.drain_webhook_stream("worker-1")
+
+    assert counts == {"processed": 1, "dead_lettered": 1}
+    assert fake_redis.send_task.call_args.kwargs["args"][2] == [poison]
+    assert _status(db_session, payment_id) == PaymentStatus.PROCESSING
+    assert fake_redis.xlen(webhook_stream.STREAM_KEY) == 0
+    assert not fake_redis.exists("rideway:stripe:webhooks:redeliveries")
+
+
+def test_entry_reclaimed_past_the_limit_is_dead_lettered_unprocessed(db_session, fake_redis):
+    _, booking_id = _make_payment(db_session)
+    webhook_stream.append(_event("payment_intent.processing", booking_id))
+    webhook_stream.read_batch("crashed-worker", 10)
+    service = _service()
+
+    with patch("app.services.webhook_stream._CLAIM_IDLE_MS", 0), \
+         patch.object(service, "process_webhook_batch", wraps=service.process_webhook_batch) as apply:
+        for _ in range(STRIPE_WEBHOOK_MAX_DELIVERIES - 1):
+            webhook_stream.read_batch("crashed-worker", 10)
+        counts = service.drain_webhook_stream("worker-2")
+
+    assert counts == {"processed": 0, "dead_lettered": 1}
+    apply.assert_not_called()
+    assert fake_redis.xpending(webhook_stream.STREAM_KEY, webhook_stream.GROUP)["pending"] == 0